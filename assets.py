@@ -1,9 +1,13 @@
 import pygame
 import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pygame.locals import *
 
 image_folder = 'images'
 sounds_folder = 'sounds'
+manifest_file = 'assets.json'
 
 if not pygame.font:
     print('Warning, fonts disabled!')
@@ -11,6 +15,16 @@ if not pygame.mixer:
     print('Warning, sound disabled!')
 
 _imageCache = {}
+_soundCache = {}
+
+# started by preload(), and consulted by load_image() and load_sound() for assets it is still decoding
+preloader = None
+""":type: Preloader"""
+
+
+class NoneSound:
+    def play(self):
+        pass
 
 
 def load_image(name, color_key=None):
@@ -24,27 +38,12 @@ def load_image(name, color_key=None):
     path = os.path.join(image_folder, name)
 
     if path not in _imageCache:
-        try:
-            image = pygame.image.load(path)
-        except pygame.error as message:
-            print('Cannot load image: ', path)
-            raise SystemExit(message)
-
-        if name.endswith('.png'):
-            image = image.convert_alpha()
-        else:
-            image = image.convert()
-
-        if color_key is not None:
-            if color_key is -1:
-                color_key = image.get_at((0, 0))
-            image.set_colorkey(color_key, RLEACCEL)
+        if preloader is not None and preloader.pending(path):
+            return preloader.get_image(name)
 
-        _imageCache[path] = image
-    else:
-        image = _imageCache[path]
+        _imageCache[path] = _prepare_image(path, _load(_decode_image, path, 'image'), color_key)
 
-    return image
+    return _imageCache[path]
 
 
 def load_sound(name):
@@ -54,18 +53,194 @@ def load_sound(name):
     :return: Sound instance
     :raise SystemExit: When sound cannot be loaded
     """
-
-    class NoneSound:
-        def play(self):
-            pass
-
-    if not pygame.mixer or not pygame.mixer.get_init():
+    if not _init_mixer():
         return NoneSound()
 
     path = os.path.join(sounds_folder, name)
+
+    if path not in _soundCache:
+        if preloader is not None and preloader.pending(path):
+            return preloader.get_sound(name)
+
+        _soundCache[path] = _load(pygame.mixer.Sound, path, 'sound')
+
+    return _soundCache[path]
+
+
+class Preloader:
+    """
+    Decodes image and sound files on a small thread pool. Decoded images still need the display to be converted to
+    its pixel format, so that is done on the main thread, either a few at a time by update() or when an image is
+    needed by get_image(). Only get_image() and get_sound() wait for decoding, and only for the asset they return.
+    """
+    WORKERS = 2
+    # seconds each update() may spend converting decoded images
+    UPDATE_BUDGET = 0.002
+
+    def __init__(self, workers: int=WORKERS):
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='assets')
+        # path -> (future, color key)
+        self._images = {}
+        # path -> future
+        self._sounds = {}
+
+    def __len__(self):
+        return len(self._images) + len(self._sounds)
+
+    def preload_image(self, name, color_key=None):
+        path = os.path.join(image_folder, name)
+        if path not in _imageCache and path not in self._images:
+            self._images[path] = (self._executor.submit(_decode_image, path), color_key)
+
+    def preload_sound(self, name):
+        # the mixer must be open before sounds can be decoded, which must happen on the main thread
+        if not _init_mixer():
+            return
+        path = os.path.join(sounds_folder, name)
+        if path not in _soundCache and path not in self._sounds:
+            self._sounds[path] = self._executor.submit(pygame.mixer.Sound, path)
+
+    def pending(self, path: str) -> bool:
+        """
+        :return: Whether an image or sound path is being preloaded and has not been published yet
+        """
+        return path in self._images or path in self._sounds
+
+    def get_image(self, name):
+        """
+        Get a preloaded image, waiting for it to be decoded if necessary.
+        :raise SystemExit: When the image cannot be loaded
+        """
+        path = os.path.join(image_folder, name)
+        if path in self._images:
+            self._publish_image(path)
+        return _imageCache[path]
+
+    def get_sound(self, name):
+        """
+        Get a preloaded sound, waiting for it to be decoded if necessary.
+        :raise SystemExit: When the sound cannot be loaded
+        """
+        path = os.path.join(sounds_folder, name)
+        if path in self._sounds:
+            self._publish_sound(path)
+        return _soundCache[path]
+
+    def update(self, budget: float=UPDATE_BUDGET):
+        """
+        Publish the assets that have finished decoding, without waiting for any others. Call once per frame.
+        :param budget: Seconds to spend converting images; at least one is converted if any are decoded
+        """
+        for path in [path for path, future in self._sounds.items() if future.done()]:
+            self._publish_sound(path)
+
+        end = time.perf_counter() + budget
+        for path in [path for path, (future, color_key) in self._images.items() if future.done()]:
+            self._publish_image(path)
+            if time.perf_counter() >= end:
+                break
+
+    def wait(self):
+        """
+        Wait for every asset to be decoded, and publish them.
+        """
+        for path in list(self._images):
+            self._publish_image(path)
+        for path in list(self._sounds):
+            self._publish_sound(path)
+
+    def shutdown(self):
+        """
+        Stop decoding assets that have not been started, and wait for the workers to finish.
+        """
+        for future, color_key in self._images.values():
+            future.cancel()
+        for future in self._sounds.values():
+            future.cancel()
+        self._images.clear()
+        self._sounds.clear()
+        self._executor.shutdown()
+
+    def _publish_image(self, path: str):
+        future, color_key = self._images.pop(path)
+        _imageCache[path] = _prepare_image(path, _load(lambda p: future.result(), path, 'image'), color_key)
+
+    def _publish_sound(self, path: str):
+        future = self._sounds.pop(path)
+        _soundCache[path] = _load(lambda p: future.result(), path, 'sound')
+
+
+def read_manifest(file_path: str=None) -> dict:
+    """
+    Read an asset manifest: a JSON object with an "images" list, whose items are file names or [file name, color
+    key] pairs, and a "sounds" list of file names.
+    :param file_path: Manifest file (assets.manifest_file by default)
+    :return: The manifest, which is empty if the file does not exist
+    """
+    file_path = file_path or manifest_file
+    if not os.path.isfile(file_path):
+        return {'images': [], 'sounds': []}
+
+    with open(file_path, 'r') as file:
+        manifest = json.load(file)
+    return {'images': manifest.get('images', []), 'sounds': manifest.get('sounds', [])}
+
+
+def preload(manifest: dict, workers: int=None) -> Preloader:
+    """
+    Start decoding the assets in a manifest in the background, for load_image() and load_sound() to pick up.
+    """
+    global preloader
+    if preloader is not None:
+        preloader.shutdown()
+    preloader = Preloader(workers or Preloader.WORKERS)
+    for image in manifest['images']:
+        if isinstance(image, str):
+            preloader.preload_image(image)
+        else:
+            preloader.preload_image(*image)
+    for sound in manifest['sounds']:
+        preloader.preload_sound(sound)
+    return preloader
+
+
+def _init_mixer() -> bool:
+    """
+    Open the mixer, if it is available and not open yet. It is slow to open, so it is only opened for the first sound.
+    :return: Whether the mixer is open
+    """
+    if not pygame.mixer:
+        return False
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            return False
+    return True
+
+
+def _decode_image(path: str) -> pygame.Surface:
+    # pygame releases the GIL while decoding, so this runs in parallel on the preloader's threads
+    return pygame.image.load(path)
+
+
+def _load(load, path: str, kind: str):
     try:
-        sound = pygame.mixer.Sound(path)
-    except pygame.error as message:
-        print('Cannot load sound: ', path)
+        return load(path)
+    except (pygame.error, FileNotFoundError) as message:
+        print('Cannot load {}: '.format(kind), path)
         raise SystemExit(message)
-    return sound
+
+
+def _prepare_image(path: str, image: pygame.Surface, color_key) -> pygame.Surface:
+    if path.endswith('.png'):
+        image = image.convert_alpha()
+    else:
+        image = image.convert()
+
+    if color_key is not None:
+        if color_key == -1:
+            color_key = image.get_at((0, 0))
+        image.set_colorkey(color_key, RLEACCEL)
+
+    return image
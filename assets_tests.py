@@ -0,0 +1,91 @@
+import unittest
+from unittest import TestCase
+import json
+import os
+import tempfile
+import assets
+from assets import *
+
+
+class Preloader_tests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+        pygame.display.set_mode((320, 240))
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.imageFolder = assets.image_folder
+        assets.image_folder = self.folder.name
+        assets._imageCache.clear()
+
+        for name, color in [('red.png', (255, 0, 0)), ('blue.bmp', (0, 0, 255))]:
+            image = pygame.Surface((4, 3))
+            image.fill(color)
+            pygame.image.save(image, os.path.join(self.folder.name, name))
+
+        self.preloader = Preloader(2)
+
+    def tearDown(self):
+        self.preloader.shutdown()
+        assets.image_folder = self.imageFolder
+        assets._imageCache.clear()
+
+    def test_get_image_waitsAndPublishesConverted(self):
+        self.preloader.preload_image('red.png')
+
+        image = self.preloader.get_image('red.png')
+
+        self.assertEqual(image.get_size(), (4, 3))
+        self.assertEqual(image.get_at((0, 0)), (255, 0, 0, 255))
+        self.assertTrue(image.get_flags() & SRCALPHA)
+        self.assertIs(assets._imageCache[os.path.join(self.folder.name, 'red.png')], image)
+        self.assertEqual(len(self.preloader), 0)
+
+    def test_get_image_colorKey(self):
+        self.preloader.preload_image('blue.bmp', -1)
+
+        image = self.preloader.get_image('blue.bmp')
+
+        self.assertEqual(image.get_colorkey(), (0, 0, 255, 255))
+
+    def test_wait_publishesAll(self):
+        self.preloader.preload_image('red.png')
+        self.preloader.preload_image('blue.bmp')
+
+        self.preloader.wait()
+
+        self.assertEqual(len(self.preloader), 0)
+        self.assertEqual(len(assets._imageCache), 2)
+
+    def test_load_image_usesPreloaded(self):
+        assets.preloader = self.preloader
+        self.addCleanup(setattr, assets, 'preloader', None)
+        self.preloader.preload_image('red.png')
+
+        image = load_image('red.png')
+
+        self.assertIs(self.preloader.get_image('red.png'), image)
+        self.assertFalse(self.preloader.pending(os.path.join(self.folder.name, 'red.png')))
+
+    def test_get_image_missing_exits(self):
+        self.preloader.preload_image('missing.png')
+
+        with self.assertRaises(SystemExit):
+            self.preloader.get_image('missing.png')
+
+    def test_read_manifest(self):
+        path = os.path.join(self.folder.name, 'assets.json')
+        with open(path, 'w') as file:
+            json.dump({'images': ['red.png', ['blue.bmp', -1]]}, file)
+
+        self.assertEqual(read_manifest(path), {'images': ['red.png', ['blue.bmp', -1]], 'sounds': []})
+
+    def test_read_manifest_missingFile_empty(self):
+        self.assertEqual(read_manifest(os.path.join(self.folder.name, 'none.json')), {'images': [], 'sounds': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
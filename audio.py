@@ -0,0 +1,91 @@
+import pygame
+import assets
+import os
+
+
+class Audio:
+    """
+    Plays the sounds of game events on a fixed pool of mixer channels. Sounds are loaded once, when the audio is
+    created, and posting an event does not allocate, so it can be done from the physics step.
+
+    When every channel is busy, an event takes over the channel playing the lowest priority sound that started
+    earliest, unless all of them are playing sounds of a higher priority than its own. Repeats of an event within
+    REPEAT_WINDOW seconds of the last time it played are dropped, so a fast rally does not stack copies of a sound.
+    Without a mixer or sound files, events are silently ignored.
+    """
+    CHANNELS = 8
+    REPEAT_WINDOW = 0.05
+
+    def __init__(self, sounds: {int: (str, int)}, channels: int=CHANNELS, repeatWindow: float=REPEAT_WINDOW):
+        """
+        :param sounds: Sound file name (in assets.sounds_folder) and priority of each event number
+        :param channels: Number of mixer channels to play on
+        :param repeatWindow: Seconds after an event plays in which it is not played again
+        """
+        self.repeatWindow = repeatWindow
+        self.time = 0
+
+        # indexed by event number
+        size = max(sounds) + 1 if sounds else 0
+        self.sounds = [assets.NoneSound()] * size
+        self.priorities = [0] * size
+        self.lastPlayed = [-repeatWindow] * size
+
+        for event, (name, priority) in sounds.items():
+            self.priorities[event] = priority
+            # the mixer is only opened if there are sounds to play
+            if os.path.isfile(os.path.join(assets.sounds_folder, name)):
+                self.sounds[event] = assets.load_sound(name)
+
+        self.enabled = any(not isinstance(sound, assets.NoneSound) for sound in self.sounds)
+
+        # indexed by channel; the channels' methods are bound once, as binding them when playing would allocate
+        self._busy = []
+        self._play = []
+        self.channelPriorities = []
+        self.channelStarts = []
+        if self.enabled:
+            pygame.mixer.set_num_channels(channels)
+            for i in range(channels):
+                channel = pygame.mixer.Channel(i)
+                self._busy.append(channel.get_busy)
+                self._play.append(channel.play)
+            self.channelPriorities = [0] * channels
+            self.channelStarts = [0.0] * channels
+
+    def update(self, delta: float):
+        self.time += delta
+
+    def post(self, event: int):
+        """
+        Play the sound of an event, if it has not just been played and there is a channel for it.
+        """
+        if not self.enabled or self.time - self.lastPlayed[event] < self.repeatWindow:
+            return
+
+        priority = self.priorities[event]
+        channel = self._channelFor(priority)
+        if channel < 0:
+            return
+
+        self._play[channel](self.sounds[event])
+        self.channelPriorities[channel] = priority
+        self.channelStarts[channel] = self.time
+        self.lastPlayed[event] = self.time
+
+    def _channelFor(self, priority: int) -> int:
+        """
+        :return: A free channel, or else the channel to steal for a sound of the priority, or -1 if there is none
+        """
+        priorities = self.channelPriorities
+        starts = self.channelStarts
+        steal = -1
+        i = 0
+        while i < len(priorities):
+            if not self._busy[i]():
+                return i
+            if priorities[i] <= priority and (steal < 0 or priorities[i] < priorities[steal]
+                                              or priorities[i] == priorities[steal] and starts[i] < starts[steal]):
+                steal = i
+            i += 1
+        return steal
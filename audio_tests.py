@@ -0,0 +1,118 @@
+import unittest
+from unittest import TestCase
+import os
+import tempfile
+import wave
+import assets
+from testutil import traceAllocations
+from audio import *
+
+WALL = 0
+PADDLE = 1
+SCORE = 2
+
+
+class Audio_tests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.soundsFolder = assets.sounds_folder
+        assets.sounds_folder = self.folder.name
+        assets._soundCache.clear()
+
+        # a second of silence, long enough to keep a channel busy for the test
+        for name in ['wall.wav', 'paddle.wav', 'score.wav']:
+            with wave.open(os.path.join(self.folder.name, name), 'wb') as file:
+                file.setnchannels(1)
+                file.setsampwidth(2)
+                file.setframerate(22050)
+                file.writeframes(bytes(22050 * 2))
+
+    def tearDown(self):
+        assets.sounds_folder = self.soundsFolder
+        assets._soundCache.clear()
+        pygame.mixer.quit()
+
+    def createAudio(self, channels: int=2) -> Audio:
+        return Audio({WALL: ('wall.wav', 1), PADDLE: ('paddle.wav', 2), SCORE: ('score.wav', 3)}, channels)
+
+    def test_post_playsOnFreeChannel(self):
+        audio = self.createAudio()
+
+        audio.post(WALL)
+
+        self.assertTrue(pygame.mixer.Channel(0).get_busy())
+        self.assertFalse(pygame.mixer.Channel(1).get_busy())
+
+    def test_post_repeatWithinWindow_dropped(self):
+        audio = self.createAudio()
+
+        audio.post(WALL)
+        audio.update(audio.REPEAT_WINDOW / 2)
+        audio.post(WALL)
+
+        self.assertFalse(pygame.mixer.Channel(1).get_busy())
+
+        audio.update(audio.REPEAT_WINDOW)
+        audio.post(WALL)
+
+        self.assertTrue(pygame.mixer.Channel(1).get_busy())
+
+    def test_post_channelsBusy_stealsLowestPriority(self):
+        audio = self.createAudio()
+        audio.post(PADDLE)
+        audio.post(WALL)
+
+        audio.post(SCORE)
+
+        self.assertEqual(audio.channelPriorities, [2, 3])
+
+    def test_post_channelsBusy_stealsOldestOfSamePriority(self):
+        audio = self.createAudio()
+        audio.post(WALL)
+        audio.update(audio.REPEAT_WINDOW)
+        audio.post(WALL)
+        audio.update(audio.REPEAT_WINDOW)
+
+        audio.post(WALL)
+
+        self.assertEqual(audio.channelStarts, [audio.REPEAT_WINDOW * 2, audio.REPEAT_WINDOW])
+
+    def test_post_channelsBusyWithHigherPriority_dropped(self):
+        audio = self.createAudio()
+        audio.post(PADDLE)
+        audio.post(SCORE)
+
+        audio.post(WALL)
+
+        self.assertEqual(audio.channelPriorities, [2, 3])
+        self.assertEqual(audio.lastPlayed[WALL], -audio.REPEAT_WINDOW)
+
+    def test_post_noAllocations(self):
+        audio = self.createAudio(4)
+
+        def post():
+            audio.update(audio.REPEAT_WINDOW)
+            audio.post(WALL)
+            audio.post(PADDLE)
+
+        net, peak = traceAllocations(post, 100)
+        self.assertEqual(net, 0)
+        self.assertEqual(peak, 0)
+
+    def test_noSoundFiles_disabled(self):
+        assets.sounds_folder = os.path.join(self.folder.name, 'none')
+
+        audio = self.createAudio()
+        audio.post(WALL)
+
+        self.assertFalse(audio.enabled)
+        self.assertFalse(pygame.mixer.get_init())
+
+
+if __name__ == '__main__':
+    unittest.main()
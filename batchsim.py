@@ -0,0 +1,250 @@
+import math
+from random import Random
+import numpy as np
+import collision
+from sprites import Table, ScoreBoard, Paddle, Ball
+
+
+class BatchSimulation:
+    """
+    Steps many bot-vs-bot matches in lockstep, keeping the state of every match in NumPy arrays (one row per match).
+    The physics mirrors Ball, Paddle and BotController, including the time of impact contacts, using the batch variants
+    of the collision functions that Ball uses. Serves and paddle hits are rare, so each is played by a Ball standing in
+    for its match, and every match is the same as Simulation plays it from the same seed.
+
+    A match step costs about a tenth of Simulation's (0.6 to 1.1 us against 8 us, with 1000 to 10000 matches), rather
+    than the hundredth or less that lockstep arrays can reach: each step makes about a hundred NumPy calls on small
+    arrays, and the serves and paddle hits go through Ball one at a time to stay identical to Simulation.
+    """
+    STEP = 1/120
+    SERVE_DELAY = 3
+    BOT_THRESHOLD = 0.01
+
+    def __init__(self, matches: int, seed: int=None, step: float=STEP, seeds: [int]=None):
+        """
+        :param seed: Seed from which the seeds of the matches are drawn (random if None)
+        :param seeds: Seed of each match's serves, as Simulation.runMatch takes them (drawn from seed if None)
+        """
+        self.matches = matches
+        self.step = step
+        if seeds is None:
+            rand = Random(seed)
+            seeds = [rand.getrandbits(32) for i in range(matches)]
+        self.seeds = list(seeds)
+        self.rands = [Random() for i in range(matches)]
+        # serves are timed in whole steps, as Game.after times them
+        self.serveSteps = max(0, math.ceil(self.SERVE_DELAY / step - 1e-6))
+
+        self.tableSize = np.array([1.5, 1.0])
+        self.innerSize = self.tableSize - Table.WALL_SIZE*2
+        self.radius = 0.01
+        self.paddleX = np.array([-0.6, 0.6])
+        self.paddleHalfSize = np.array([0.024, 0.145]) / 2
+
+        self.pos = np.zeros((matches, 2))
+        self.vel = np.zeros((matches, 2))
+        self.speedupHits = np.zeros(matches, dtype=np.int32)
+        self.collisionTimeout = np.zeros(matches)
+        # the center of each paddle, with paddleY a view of their heights
+        self.paddlePos = np.zeros((matches, 2, 2))
+        self.paddlePos[:, :, 0] = self.paddleX
+        self.paddleY = self.paddlePos[:, :, 1]
+        self.paddleDir = np.zeros((matches, 2))
+        self.scores = np.zeros((matches, 2), dtype=np.int32)
+        self.winner = np.full(matches, -1, dtype=np.int32)
+        self.serveTimer = np.zeros(matches, dtype=np.int32)
+        self.serveDir = np.zeros(matches, dtype=np.int32)
+        # over the whole match, where Ball.rallyHits starts again at each serve
+        self.paddleHits = np.zeros(matches, dtype=np.int64)
+        self.steps = np.zeros(matches, dtype=np.int64)
+
+        # plays the serves and paddle hits of one match at a time
+        table = Table()
+        self._ball = Ball(table, [], None)
+        self._paddle = Paddle(table, 1)
+
+        self.reset()
+
+    def reset(self):
+        """
+        Start a new match in every row, as Game.start does.
+        """
+        self.pos[:] = (-2, 0)
+        self.vel[:] = 0
+        self.speedupHits[:] = 0
+        self.collisionTimeout[:] = 0
+        self.paddleY[:] = 0
+        self.paddleDir[:] = 0
+        self.scores[:] = 0
+        self.winner[:] = -1
+        self.serveTimer[:] = self.serveSteps
+        self.serveDir[:] = 0
+        self.paddleHits[:] = 0
+        self.steps[:] = 0
+        for rand, seed in zip(self.rands, self.seeds):
+            rand.seed(seed)
+
+    @property
+    def finished(self) -> np.ndarray:
+        return self.winner >= 0
+
+    @property
+    def gameTime(self) -> np.ndarray:
+        return self.steps * self.step
+
+    def run(self, maxGameTime: float=60*60):
+        """
+        Step all matches until every one has a winner or maxGameTime has elapsed.
+        """
+        steps = int(maxGameTime / self.step)
+        for i in range(steps):
+            if self.finished.all():
+                break
+            self.update(self.step)
+
+    def update(self, delta: float):
+        playing = ~self.finished
+        self.steps[playing] += 1
+
+        self._updateServes(playing)
+        self._updateBots(playing)
+        self._updateBall(delta, playing)
+        self._updatePaddles(delta, playing)
+
+    def _updateServes(self, playing: np.ndarray):
+        waiting = playing & (self.serveTimer > 0)
+        self.serveTimer[waiting] -= 1
+        ball = self._ball
+        for row in np.flatnonzero(waiting & (self.serveTimer == 0)).tolist():
+            ball.rand = self.rands[row]
+            ball.serve(int(self.serveDir[row]))
+            self.pos[row] = ball.pos
+            self.vel[row] = ball.vel
+
+    def _updateBots(self, playing: np.ndarray):
+        diff = self.pos[:, 1:2] - self.paddleY
+        direction = np.where(diff > self.BOT_THRESHOLD, 1.0, np.where(diff < -self.BOT_THRESHOLD, -1.0, 0.0))
+        self.paddleDir[playing] = direction[playing]
+
+    def _updatePaddles(self, delta: float, playing: np.ndarray):
+        maxYDist = self.innerSize[1]/2 - self.paddleHalfSize[1]
+        moved = self.paddleY + Paddle.SPEED*delta*self.paddleDir
+        self.paddleY[playing] = np.clip(moved[playing], -maxYDist, maxYDist)
+
+    def _updateBall(self, delta: float, playing: np.ndarray):
+        timedOut = self.collisionTimeout > 0
+        self.collisionTimeout[timedOut] -= delta
+
+        # a paddle may have moved into the ball since the last update
+        self._paddleOverlap(playing)
+
+        maxYDist = self.innerSize[1]/2 - self.radius
+        maxXDist = self.tableSize[0]/2 + self.radius
+        remaining = np.full(self.matches, delta)
+        active = playing & ((self.vel[:, 0] != 0) | (self.vel[:, 1] != 0))
+
+        # advance each ball straight to its next contact and respond to it, as Ball.update does
+        limits = np.array([maxYDist, maxXDist])
+        for i in range(Ball.MAX_CONTACTS):
+            if not active.any():
+                break
+            rows = np.flatnonzero(active)
+            pos = self.pos[rows]
+            vel = self.vel[rows]
+
+            # contact times in priority order: wall, score, paddles; each pair of contacts is found in a single call,
+            # which is most of the cost of a step
+            times = np.empty((len(rows), 4))
+            times[:, :2] = collision.sweep_limit_batch(pos[:, ::-1], vel[:, ::-1], limits)
+            paddleTimes = collision.sweep_rect_rect_batch(pos.repeat(2, axis=0), self.radius, vel.repeat(2, axis=0),
+                                                          self.paddlePos[rows].reshape(-1, 2), self.paddleHalfSize)
+            canHitPaddle = self.collisionTimeout[rows] <= 0
+            times[:, 2:] = np.where(canHitPaddle[:, None], paddleTimes.reshape(-1, 2), np.inf)
+
+            contact = np.argmin(times, axis=1)
+            time = times[np.arange(len(rows)), contact]
+            rowsRemaining = remaining[rows]
+            hit = time <= rowsRemaining
+            time = np.where(hit, time, rowsRemaining)
+            self.pos[rows] = pos + vel*time[:, None]
+            remaining[rows] = rowsRemaining - time
+
+            wall = rows[hit & (contact == 0)]
+            self.pos[wall, 1] = np.copysign(maxYDist, self.pos[wall, 1])
+            self.vel[wall, 1] *= -1
+            self.collisionTimeout[wall] = 0
+
+            scored = rows[hit & (contact == 1)]
+            if len(scored):
+                self._score(scored, np.where(self.pos[scored, 0] > 0, 0, 1))
+
+            bounced = hit & (contact >= 2)
+            if bounced.any():
+                self._bounce(rows[bounced], self.paddlePos[rows[bounced], contact[bounced] - 2])
+
+            active[rows] = hit & (contact != 1)
+
+    def _paddleOverlap(self, playing: np.ndarray):
+        rows = np.flatnonzero(playing & (self.collisionTimeout <= 0))
+        projection, hit = collision.rect_rect_batch(self.pos[rows].repeat(2, axis=0), self.radius,
+                                                    self.paddlePos[rows].reshape(-1, 2), self.paddleHalfSize)
+        hit = hit.reshape(-1, 2)
+        overlapping = np.flatnonzero(hit[:, 0] | hit[:, 1])
+        if len(overlapping) == 0:
+            return
+
+        # only the first paddle overlapping the ball, as Ball._paddleOverlap checks them in order
+        paddle = np.where(hit[overlapping, 0], 0, 1)
+        rows = rows[overlapping]
+        self.pos[rows] += projection.reshape(-1, 2, 2)[overlapping, paddle]
+        self._bounce(rows, self.paddlePos[rows, paddle])
+
+    def _bounce(self, rows: np.ndarray, paddlePos: np.ndarray):
+        # NumPy's powers and arctangents can differ from the math module's in the last bit, which would be enough for
+        # a match to play out differently
+        ball = self._ball
+        paddle = self._paddle
+        for row, pos, vel, paddleRow in zip(rows.tolist(), self.pos[rows].tolist(), self.vel[rows].tolist(),
+                                             paddlePos.tolist()):
+            ball.pos.update(pos)
+            ball.vel.update(vel)
+            ball.speedupHits = int(self.speedupHits[row])
+            paddle.pos.update(paddleRow)
+            ball._bounce(paddle)
+            self.vel[row] = ball.vel
+            self.speedupHits[row] = ball.speedupHits
+
+        self.collisionTimeout[rows] = Ball.COLLISION_TIMEOUT
+        self.paddleHits[rows] += 1
+
+    def _score(self, rows: np.ndarray, player: np.ndarray):
+        self.vel[rows] = 0
+        self.scores[rows, player] += 1
+
+        won = self.scores[rows, player] >= ScoreBoard.SCORE_LIMIT
+        self.winner[rows[won]] = player[won]
+
+        serving = rows[~won]
+        self.serveTimer[serving] = self.serveSteps
+        self.serveDir[serving] = np.where(player[~won] == 0, 1, -1)
+
+
+def main():
+    import sys
+    import time
+
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    sim = BatchSimulation(matches)
+
+    start = time.perf_counter()
+    sim.run()
+    elapsed = time.perf_counter() - start
+
+    wins = np.bincount(sim.winner[sim.finished], minlength=2)
+    print('{} matches in {:.2f}s ({:.1f} matches/s)'.format(matches, elapsed, matches / elapsed))
+    print('wins: left {}, right {}, unfinished {}'.format(wins[0], wins[1], matches - wins.sum()))
+    print('mean game time {:.1f}s, mean paddle hits {:.1f}'.format(sim.gameTime.mean(), sim.paddleHits.mean()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest import TestCase
+from batchsim import *
+from simulation import Simulation
+
+
+class BatchSimulation_tests(TestCase):
+    def test_run_sameSeeds_matchesSimulation(self):
+        # the second match scores a point and serves again by the end
+        seeds = [0, 159, 148]
+        batch = BatchSimulation(len(seeds), seeds=seeds)
+        batch.run(maxGameTime=50)
+
+        sim = Simulation()
+        for i, seed in enumerate(seeds):
+            with self.subTest(seed=seed):
+                result = sim.runMatch(seed=seed, maxGameTime=50)
+                ball = sim.game.ball
+
+                self.assertEqual(batch.scores[i].tolist(), result.scores)
+                self.assertEqual(batch.steps[i], result.steps)
+                self.assertEqual(batch.paddleHits[i], sum(result.rallies) + ball.rallyHits)
+                self.assertEqual(batch.pos[i].tolist(), list(ball.pos))
+                self.assertEqual(batch.vel[i].tolist(), list(ball.vel))
+                self.assertEqual(batch.paddleY[i].tolist(), [paddle.pos.y for paddle in sim.game.paddles])
+
+        self.assertGreater(batch.paddleHits.min(), 0)
+        self.assertEqual(batch.scores[1].sum(), 1)
+        self.assertTrue(batch.vel[1].any())
+
+    def test_reset_replaysSameMatches(self):
+        batch = BatchSimulation(10, seed=2)
+        batch.run(maxGameTime=10)
+        scores, pos = batch.scores.copy(), batch.pos.copy()
+
+        batch.reset()
+        batch.run(maxGameTime=10)
+
+        self.assertEqual(batch.scores.tolist(), scores.tolist())
+        self.assertEqual(batch.pos.tolist(), pos.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,294 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+
+class Benchmark:
+    def __init__(self, name: str, setup):
+        """
+        :param name: Name of the benchmark in results files
+        :param setup: Function returning the function to time, which is called with no arguments
+        """
+        self.name = name
+        self.setup = setup
+
+
+class Result:
+    def __init__(self, median: float, minimum: float, mad: float, rounds: int, number: int):
+        """
+        All times are in seconds per call.
+        :param mad: Median absolute deviation of the rounds, as a measure of noise
+        """
+        self.median = median
+        self.min = minimum
+        self.mad = mad
+        self.rounds = rounds
+        self.number = number
+
+    def toDict(self) -> dict:
+        return {'median': self.median, 'min': self.min, 'mad': self.mad, 'rounds': self.rounds, 'number': self.number}
+
+    @staticmethod
+    def fromDict(d: dict):
+        """
+        :rtype: Result
+        """
+        return Result(d['median'], d['min'], d['mad'], d['rounds'], d['number'])
+
+
+def measure(func, rounds: int, minRoundTime: float) -> Result:
+    """
+    Time a function over several rounds, calling it enough times per round to fill minRoundTime.
+    """
+    func()
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for i in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minRoundTime:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(minRoundTime / elapsed * 1.2))
+
+    times = [elapsed / number]
+    for r in range(rounds - 1):
+        start = time.perf_counter()
+        for i in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+
+    median = statistics.median(times)
+    mad = statistics.median(abs(t - median) for t in times)
+    return Result(median, min(times), mad, rounds, number)
+
+
+# -- microbenchmarks
+
+def _rectRect():
+    from pygame.math import Vector2
+    import collision
+    r1c, r1s = Vector2(30, 18), (1, 4)
+    r2c, r2s = Vector2(30, 20), (10, 5)
+    return lambda: collision.rect_rect(r1c, r1s, r2c, r2s)
+
+
+def _ellipticNormal():
+    from pygame.math import Vector2
+    import collision
+    pos, obsPos = Vector2(0.61, 0.05), Vector2(0.6, 0)
+    return lambda: collision.ellipticNormal(pos, obsPos, 5)
+
+
+def _viewport(method: str):
+    def setup():
+        from pygame import Rect
+        from sprites import Viewport
+        viewport = Viewport(Rect(0, 0, 1920, 1080), (1.5, 1))
+        func = getattr(viewport, method)
+        value = (0.3, -0.2)
+        return lambda: func(value)
+    return setup
+
+
+def _viewportBatch():
+    import numpy as np
+    from pygame import Rect
+    from sprites import Viewport
+    viewport = Viewport(Rect(0, 0, 1920, 1080), (1.5, 1))
+    points = np.random.default_rng(0).uniform(-0.5, 0.5, (1000, 2))
+    return lambda: viewport.getScreenPositions(points)
+
+
+def _ballUpdate(speed: float):
+    def setup():
+        from pygame.math import Vector2
+        from pong import Game
+        from config import Config
+        game = Game(Config(''), headless=True)
+        game.start(0, seed=0)
+        ball = game.ball
+        step = game.step
+        start = Vector2()
+
+        def run():
+            ball.pos.update(start)
+            ball.vel.from_polar((speed, 30))
+            ball.collisionTimeout = 0
+            ball.update(step)
+        return run
+    return setup
+
+
+# -- macrobenchmarks
+
+def _game(size: (int, int), dirtyRects: bool=False, balls: int=1):
+    from pong import Game, defaultSettings
+    from config import Config
+
+    config = Config('')
+    config.settings = defaultSettings()
+    config['replayFolder'] = None
+    config['resolution'] = size
+    config['dirtyRects'] = dirtyRects
+    game = Game(config)
+    game.start(0, seed=0, balls=balls)
+    # get the ball moving
+    for i in range(int(4 / game.step)):
+        game.update(game.step)
+    game.draw()
+    return game
+
+
+def _gameUpdate(size: (int, int)):
+    def setup():
+        game = _game(size)
+
+        def run():
+            if game.scoreBoard.winner is not None:
+                game.start(0, seed=0)
+            game.update(game.step)
+        return run
+    return setup
+
+
+def _gameDraw(size: (int, int), dirtyRects: bool, balls: int=1):
+    def setup():
+        game = _game(size, dirtyRects, balls)
+
+        # each call steps the physics once so that the sprites move between draws, as in a real frame
+        def run():
+            if game.scoreBoard.winner is not None:
+                game.start(0, seed=0, balls=balls)
+            game.update(game.step)
+            game.advance(0)
+            game.draw()
+        return run
+    return setup
+
+
+RESOLUTIONS = [(800, 600), (1920, 1080), (3840, 2160)]
+BALL_SPEEDS = [0.85, 2, 5, 10, 20]
+MULTIBALL_COUNTS = [12, 300]
+
+
+def benchmarks() -> [Benchmark]:
+    result = [
+        Benchmark('collision.rect_rect', _rectRect),
+        Benchmark('collision.ellipticNormal', _ellipticNormal),
+        Benchmark('Viewport.getScreenPos', _viewport('getScreenPos')),
+        Benchmark('Viewport.getScreenSize', _viewport('getScreenSize')),
+    ]
+    try:
+        import numpy
+        result.append(Benchmark('Viewport.getScreenPositions[1000]', _viewportBatch))
+    except ImportError:
+        pass
+    for speed in BALL_SPEEDS:
+        result.append(Benchmark('Ball.update[speed={}]'.format(speed), _ballUpdate(speed)))
+    for size in RESOLUTIONS:
+        res = '{}x{}'.format(*size)
+        result.append(Benchmark('Game.update[{}]'.format(res), _gameUpdate(size)))
+        result.append(Benchmark('Game.draw[{},full]'.format(res), _gameDraw(size, False)))
+        result.append(Benchmark('Game.draw[{},dirty]'.format(res), _gameDraw(size, True)))
+    for balls in MULTIBALL_COUNTS:
+        result.append(Benchmark('Game.draw[800x600,full,balls={}]'.format(balls), _gameDraw((800, 600), False, balls)))
+    return result
+
+
+def compare(baseline: {str: Result}, results: {str: Result}, threshold: float, noiseFactor: float) -> [str]:
+    """
+    Compare results against a baseline. A benchmark regresses when its median is slower than the baseline by more
+    than the threshold fraction and by more than noiseFactor times the larger median absolute deviation of the two.
+    :return: Names of the benchmarks that regressed
+    """
+    if not results:
+        print('no benchmarks matched')
+        return []
+
+    regressions = []
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print('{}  {:>10}  (new)'.format(name.ljust(width), _formatTime(result.median)))
+            continue
+
+        diff = result.median - base.median
+        noise = noiseFactor * max(base.mad, result.mad)
+        if diff > threshold*base.median and diff > noise:
+            status = 'SLOWER'
+            regressions.append(name)
+        elif -diff > threshold*base.median and -diff > noise:
+            status = 'faster'
+        else:
+            status = 'ok'
+        print('{}  {:>10} -> {:>10}  {:+7.1%}  {}'.format(name.ljust(width), _formatTime(base.median),
+                                                          _formatTime(result.median), diff / base.median, status))
+    return regressions
+
+
+def _formatTime(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.3f}{}'.format(seconds / scale, unit)
+    return '{:.1f}ns'.format(seconds / 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the collision, physics, viewport and rendering hot paths.')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file to write results to')
+    parser.add_argument('--baseline', help='JSON results file to compare against; exits with 1 on regression')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='fraction slower than the baseline that counts as a regression (default: %(default)s)')
+    parser.add_argument('--noise', type=float, default=3,
+                        help='multiple of the median absolute deviation a regression must exceed (default: %(default)s)')
+    parser.add_argument('--rounds', type=int, default=15, help='timing rounds per benchmark (default: %(default)s)')
+    parser.add_argument('--round-time', type=float, default=0.05,
+                        help='minimum seconds per round (default: %(default)s)')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    args = parser.parse_args()
+
+    # render without a window, so results do not depend on the desktop
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    pygame.init()
+
+    results = {}
+    for benchmark in benchmarks():
+        if args.filter and args.filter not in benchmark.name:
+            continue
+        result = measure(benchmark.setup(), args.rounds, args.round_time)
+        results[benchmark.name] = result
+        print('{:40} {:>10}  (+/- {})'.format(benchmark.name, _formatTime(result.median), _formatTime(result.mad)))
+
+    with open(args.output, 'w') as file:
+        json.dump({
+            'meta': {
+                'python': platform.python_version(),
+                'pygame': pygame.version.ver,
+                'platform': platform.platform(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': {name: result.toDict() for name, result in results.items()},
+        }, file, indent=2)
+
+    pygame.quit()
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = {name: Result.fromDict(d) for name, d in json.load(file)['results'].items()}
+        print()
+        regressions = compare(baseline, results, args.threshold, args.noise)
+        if regressions:
+            print('\n{} regression(s): {}'.format(len(regressions), ', '.join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest import TestCase
+import contextlib
+import io
+from benchmarks import *
+
+
+class compare_tests(TestCase):
+    def compare(self, baseline: {str: Result}, results: {str: Result}) -> ([str], str):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            regressions = compare(baseline, results, 0.1, 3)
+        return regressions, output.getvalue()
+
+    @staticmethod
+    def result(median: float, mad: float) -> Result:
+        return Result(median, median - mad, mad, 15, 1000)
+
+    def test_slower_beyondNoise_regression(self):
+        regressions, output = self.compare({'a': self.result(1e-6, 1e-8)}, {'a': self.result(1.3e-6, 2e-8)})
+
+        self.assertEqual(regressions, ['a'])
+        self.assertIn('SLOWER', output)
+
+    def test_slower_withinNoise_ok(self):
+        # 30% slower, but the rounds spread by more than a tenth of the time
+        regressions, output = self.compare({'a': self.result(1e-6, 1.2e-7)}, {'a': self.result(1.3e-6, 1.5e-7)})
+
+        self.assertEqual(regressions, [])
+        self.assertIn('ok', output)
+
+    def test_slower_belowThreshold_ok(self):
+        regressions, output = self.compare({'a': self.result(1e-6, 1e-9)}, {'a': self.result(1.05e-6, 1e-9)})
+
+        self.assertEqual(regressions, [])
+        self.assertIn('ok', output)
+
+    def test_faster_notRegression(self):
+        regressions, output = self.compare({'a': self.result(1e-6, 1e-8)}, {'a': self.result(0.5e-6, 1e-8)})
+
+        self.assertEqual(regressions, [])
+        self.assertIn('faster', output)
+
+    def test_notInBaseline_new(self):
+        regressions, output = self.compare({'a': self.result(1e-6, 1e-8)},
+                                           {'a': self.result(1e-6, 1e-8), 'b': self.result(2e-6, 1e-8)})
+
+        self.assertEqual(regressions, [])
+        self.assertIn('(new)', output.splitlines()[1])
+
+    def test_noResults(self):
+        regressions, output = self.compare({'a': self.result(1e-6, 1e-8)}, {})
+
+        self.assertEqual(regressions, [])
+        self.assertEqual(output, 'no benchmarks matched\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
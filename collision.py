@@ -16,19 +16,102 @@ def rect_rect(r1c, r1s, r2c, r2s):
     :return: Projection vector for the first shape if the shapes are colliding, False otherwise
     :rtype: bool
     """
-    projection = []
-    for diff, size in ((d1 - d2, s1 + s2) for d1, d2, s1, s2 in zip(r1c, r2c, r1s, r2s)):
-        intrusion = size - abs(diff)
-        if intrusion <= 0:
-            return False
-        else:
-            projection.append(math.copysign(intrusion, diff))
-
-    if abs(projection[0]) > abs(projection[1]):
-        projection[0] = 0
+    projection = Vector2()
+    if rect_rect_ip(r1c, r1s, r2c, r2s, projection):
+        return projection
+    return False
+
+
+def rect_rect_ip(r1c, r1s, r2c, r2s, out) -> bool:
+    """
+    In-place variant of rect_rect, which allocates no objects.
+    :param out: Vector to set to the projection vector for the first shape if the shapes are colliding (left unchanged
+    otherwise)
+    :type out: Vector2
+    :return: Whether the shapes are colliding
+    """
+    diffX = r1c[0] - r2c[0]
+    intrusionX = r1s[0] + r2s[0] - abs(diffX)
+    if intrusionX <= 0:
+        return False
+    diffY = r1c[1] - r2c[1]
+    intrusionY = r1s[1] + r2s[1] - abs(diffY)
+    if intrusionY <= 0:
+        return False
+
+    if intrusionX > intrusionY:
+        out.update(0, math.copysign(intrusionY, diffY))
     else:
-        projection[1] = 0
-    return Vector2(projection)
+        out.update(math.copysign(intrusionX, diffX), 0)
+    return True
+
+
+def sweep_rect_rect(r1c, r1s, vel, r2c, r2s, maxTime: float):
+    """
+    Get the time of impact of a moving rectangle with a stationary rectangle, using the same touching semantics as
+    rect_rect (rectangles that only touch are not colliding).
+    :param r1c: Moving rectangle's center point
+    :type r1c: Vector2
+    :param r1s: Moving rectangle's half-size
+    :type r1s: (float, float)
+    :param vel: Moving rectangle's velocity
+    :type vel: Vector2
+    :param r2c: Stationary rectangle's center point
+    :type r2c: Vector2
+    :param r2s: Stationary rectangle's half-size
+    :type r2s: (float, float)
+    :param maxTime: Length of the time interval to check
+    :return: Time at which the rectangles first touch if it is within [0, maxTime], None otherwise (including when
+    they are already intersecting, which should be resolved with rect_rect)
+    :rtype: float
+    """
+    x = _sweepAxis(r1c[0] - r2c[0], r1s[0] + r2s[0], vel[0])
+    if x is None:
+        return None
+    y = _sweepAxis(r1c[1] - r2c[1], r1s[1] + r2s[1], vel[1])
+    if y is None:
+        return None
+
+    # conditionals rather than min and max, which allocate their argument tuples
+    enter = y[0] if y[0] > x[0] else x[0]
+    exit = y[1] if y[1] < x[1] else x[1]
+    if enter < exit and 0 <= enter <= maxTime:
+        return enter
+    return None
+
+
+def _sweepAxis(diff: float, size: float, vel: float) -> (float, float):
+    """
+    Get the interval of time during which two intervals on an axis overlap, or None if they never do.
+    """
+    if vel == 0:
+        if abs(diff) >= size:
+            return None
+        return -math.inf, math.inf
+
+    t1 = (-size - diff) / vel
+    t2 = (size - diff) / vel
+    if t1 > t2:
+        return t2, t1
+    return t1, t2
+
+
+def sweep_limit(pos: float, vel: float, limit: float) -> float:
+    """
+    Get the time at which a point moving along one axis reaches a limit distance from the origin.
+    :param pos: Position on the axis
+    :param vel: Velocity on the axis
+    :param limit: Distance from the origin, in either direction
+    :return: Time at which pos reaches -limit or +limit in the direction of travel (0 if it is already there or
+    beyond), or math.inf if it is not moving
+    """
+    if vel > 0:
+        time = (limit - pos) / vel
+    elif vel < 0:
+        time = (-limit - pos) / vel
+    else:
+        return math.inf
+    return time if time >= 0 else 0
 
 
 def ellipticNormal(pos, obsPos, exponent):
@@ -43,17 +126,33 @@ def ellipticNormal(pos, obsPos, exponent):
     :type exponent: float
     :rtype: Vector2
     """
-    diff = pos-obsPos
-    absDiff = Vector2(abs(diff.x), abs(diff.y))
+    normal = Vector2()
+    return ellipticNormal_ip(pos, obsPos, exponent, normal)
+
+
+def ellipticNormal_ip(pos, obsPos, exponent, out):
+    """
+    In-place variant of ellipticNormal, which allocates no vectors.
+    :param out: Vector to set to the normal
+    :type out: Vector2
+    :return: out
+    :rtype: Vector2
+    """
+    diffX = pos[0] - obsPos[0]
+    diffY = pos[1] - obsPos[1]
 
-    angle = Vector2().angle_to(absDiff)
+    # interpolating a table of normals indexed by |y| / (|x| + |y|) skips as_polar and the power, but was only about
+    # 25% faster (950 against 1260 ns a call), too little to be worth an approximation
+    out.update(abs(diffX), abs(diffY))
+    angle = out.as_polar()[1]
     ellipAngle = (angle/90)**exponent * 90
 
-    if diff.x < 0:
+    if diffX < 0:
         ellipAngle = 180 - ellipAngle
-    if diff.y < 0:
+    if diffY < 0:
         ellipAngle *= -1
-    return vectorFromPolar((1, ellipAngle))
+    out.from_polar((1, ellipAngle))
+    return out
 
 
 def vectorFromPolar(polar):
@@ -66,3 +165,145 @@ def vectorFromPolar(polar):
     v = Vector2()
     v.from_polar(polar)
     return v
+
+
+def rect_rect_batch(r1c, r1s, r2c, r2s):
+    """
+    Vectorized rect_rect, for many pairs of rectangles at once (requires NumPy). The arguments are array-likes of
+    shape (n, 2), or (2,) for a shape shared by every pair.
+    :return: Array of shape (n, 2) of projection vectors for the first shapes (zero where they are not colliding), and
+    boolean array of shape (n,) of whether each pair is colliding
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    import numpy as np
+    diff = np.asarray(r1c, dtype=float) - np.asarray(r2c, dtype=float)
+    intrusion = np.add(r1s, r2s, dtype=float) - np.abs(diff)
+    diff, intrusion = np.broadcast_arrays(np.atleast_2d(diff), intrusion)
+    # the two columns combined rather than reduced along their axis, which is many times slower for an axis of two
+    hit = (intrusion[:, 0] > 0) & (intrusion[:, 1] > 0)
+
+    # projected on the axis of least intrusion, preferring x on ties, as rect_rect does
+    alongX = intrusion[:, 0] <= intrusion[:, 1]
+    projection = np.copysign(intrusion, diff)
+    projection[alongX, 1] = 0
+    projection[~alongX, 0] = 0
+    projection[~hit] = 0
+    return projection, hit
+
+
+def sweep_rect_rect_batch(r1c, r1s, vel, r2c, r2s, maxTime: float=math.inf):
+    """
+    Vectorized sweep_rect_rect, for many pairs of rectangles at once (requires NumPy). The arguments are array-likes of
+    shape (n, 2), or (2,) for a shape shared by every pair.
+    :return: Array of shape (n,) of times of impact, with math.inf where sweep_rect_rect returns None
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    diff = np.asarray(r1c, dtype=float) - np.asarray(r2c, dtype=float)
+    size = np.add(r1s, r2s, dtype=float)
+    vel = np.asarray(vel, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (-size - diff) / vel
+        t2 = (size - diff) / vel
+    # stationary axes overlap always or never, as in _sweepAxis
+    stationary = vel == 0
+    overlapping = np.abs(diff) < size
+    enter = np.where(stationary, np.where(overlapping, -np.inf, np.inf), np.minimum(t1, t2))
+    exit = np.where(stationary, np.where(overlapping, np.inf, -np.inf), np.maximum(t1, t2))
+    enter, exit = np.atleast_2d(enter, exit)
+    enter = np.maximum(enter[:, 0], enter[:, 1])
+    exit = np.minimum(exit[:, 0], exit[:, 1])
+    return np.where((enter < exit) & (enter >= 0) & (enter <= maxTime), enter, np.inf)
+
+
+def sweep_limit_batch(pos, vel, limit: float):
+    """
+    Vectorized sweep_limit, for many points at once (requires NumPy).
+    :param pos: Array-like of positions on the axis
+    :param vel: Array-like of velocities on the axis
+    :param limit: Distance from the origin, in either direction
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    pos = np.asarray(pos, dtype=float)
+    vel = np.asarray(vel, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        time = np.where(vel > 0, (limit - pos) / vel, (-limit - pos) / vel)
+    return np.where(vel == 0, np.inf, np.maximum(time, 0))
+
+
+def ellipticNormal_batch(pos, obsPos, exponent):
+    """
+    Vectorized ellipticNormal, for many objects at once (requires NumPy).
+    :param pos: Array-like of shape (n, 2) of moving object center points
+    :param obsPos: Array-like of shape (n, 2) of obstacle center points, or (2,) for a single obstacle
+    :param exponent: Exponent for the elliptical curve model
+    :type exponent: float
+    :return: Array of shape (n, 2) of unit normals
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    diff = np.atleast_2d(np.asarray(pos, dtype=float) - np.asarray(obsPos, dtype=float))
+    diffX = diff[:, 0]
+    diffY = diff[:, 1]
+
+    angle = np.degrees(np.arctan2(np.abs(diffY), np.abs(diffX)))
+    ellipAngle = (angle/90)**exponent * 90
+
+    ellipAngle = np.where(diffX < 0, 180 - ellipAngle, ellipAngle)
+    ellipAngle = np.where(diffY < 0, -ellipAngle, ellipAngle)
+    ellipAngle = np.radians(ellipAngle)
+    return np.column_stack((np.cos(ellipAngle), np.sin(ellipAngle)))
+
+
+class SpatialHash:
+    """
+    Uniform grid that buckets items by the cells their bounding boxes overlap, so that finding the items near a box
+    only looks at the few cells it overlaps instead of at every item. It is rebuilt with clear() and insert() whenever
+    the items move.
+    """
+
+    def __init__(self, cellSize: float):
+        """
+        :param cellSize: Width and height of the cells, ideally a little larger than the items
+        """
+        self.cellSize = cellSize
+        # (column, row) -> items
+        self.cells = {}
+
+    def clear(self):
+        # the cell lists are kept, since mostly the same cells are filled again
+        for cell in self.cells.values():
+            cell.clear()
+
+    def insert(self, item, x: float, y: float, halfWidth: float, halfHeight: float):
+        """
+        Add an item to every cell its bounding box overlaps.
+        :param x: Center of the box
+        :param y: Center of the box
+        """
+        size = self.cellSize
+        cells = self.cells
+        for column in range(math.floor((x - halfWidth) / size), math.floor((x + halfWidth) / size) + 1):
+            for row in range(math.floor((y - halfHeight) / size), math.floor((y + halfHeight) / size) + 1):
+                cell = cells.get((column, row))
+                if cell is None:
+                    cell = cells[(column, row)] = []
+                cell.append(item)
+
+    def query(self, x: float, y: float, halfWidth: float, halfHeight: float, out: list) -> list:
+        """
+        Find the items in the cells a box overlaps. They are only near the box, and may not overlap it.
+        :param out: List to append the items to, each only once
+        :return: out
+        """
+        size = self.cellSize
+        cells = self.cells
+        for column in range(math.floor((x - halfWidth) / size), math.floor((x + halfWidth) / size) + 1):
+            for row in range(math.floor((y - halfHeight) / size), math.floor((y + halfHeight) / size) + 1):
+                cell = cells.get((column, row))
+                if cell:
+                    for item in cell:
+                        if item not in out:
+                            out.append(item)
+        return out
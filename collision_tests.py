@@ -2,6 +2,8 @@ import unittest
 from unittest import TestCase
 from collision import *
 from pygame.math import Vector2
+import math
+from random import Random
 
 
 class rect_rect_tests(TestCase):
@@ -79,6 +81,70 @@ class rect_rect_tests(TestCase):
         self.assertColliding((40, 25), (2, 1), Vector2(0, 1))
 
 
+class sweep_rect_rect_tests(TestCase):
+    def assertTimeOfImpact(self, center, vel, expected, maxTime=1):
+        r2c = Vector2(30, 20)
+        r2s = (10, 5)
+        result = sweep_rect_rect(Vector2(center), (1, 1), Vector2(vel), r2c, r2s, maxTime)
+        if expected is None:
+            self.assertIsNone(result)
+        else:
+            self.assertAlmostEqual(expected, result)
+
+    def test_movingAway_noImpact(self):
+        self.assertTimeOfImpact((30, 10), (0, -1), None)
+
+    def test_movingDown_hitsTop(self):
+        self.assertTimeOfImpact((30, 10), (0, 8), 0.5)
+
+    def test_movingUp_hitsBottom(self):
+        self.assertTimeOfImpact((30, 30), (0, -8), 0.5)
+
+    def test_movingRight_hitsLeft(self):
+        self.assertTimeOfImpact((10, 20), (18, 0), 0.5)
+
+    def test_movingLeft_hitsRight(self):
+        self.assertTimeOfImpact((50, 20), (-18, 0), 0.5)
+
+    def test_diagonal_hitsCorner(self):
+        self.assertTimeOfImpact((14, 9), (10, 10), 0.5)
+
+    def test_tooSlow_noImpact(self):
+        self.assertTimeOfImpact((10, 20), (8, 0), None)
+
+    def test_beyondMaxTime_noImpact(self):
+        self.assertTimeOfImpact((10, 20), (18, 0), None, maxTime=0.25)
+
+    def test_passesBeside_noImpact(self):
+        self.assertTimeOfImpact((10, 30), (40, 0), None)
+
+    def test_slidesAlongEdge_noImpact(self):
+        self.assertTimeOfImpact((10, 26), (40, 0), None)
+
+    def test_fastTunneling_hitsLeft(self):
+        self.assertTimeOfImpact((10, 20), (1800, 0), 0.005)
+
+    def test_alreadyColliding_noImpact(self):
+        self.assertTimeOfImpact((30, 20), (1, 0), None)
+
+    def test_touching_impactNow(self):
+        self.assertTimeOfImpact((19, 20), (1, 0), 0)
+
+
+class sweep_limit_tests(TestCase):
+    def test_movingTowardPositive(self):
+        self.assertAlmostEqual(0.5, sweep_limit(2, 4, 4))
+
+    def test_movingTowardNegative(self):
+        self.assertAlmostEqual(1.5, sweep_limit(2, -4, 4))
+
+    def test_beyondLimit_impactNow(self):
+        self.assertEqual(0, sweep_limit(5, 1, 4))
+
+    def test_stationary_noImpact(self):
+        self.assertEqual(math.inf, sweep_limit(2, 0, 4))
+
+
 class ellipticNormal_tests(TestCase):
     def assertAngleEqual_45exp2(self, expectedAngle, moverPos):
         normal = ellipticNormal(Vector2(moverPos), Vector2(), 2)
@@ -118,5 +184,95 @@ class ellipticNormal_tests(TestCase):
         self.assertAlmostEqual_60exp4(-17.7777, -60)
 
 
+class batch_tests(TestCase):
+    def setUp(self):
+        rand = Random(3)
+        # values on a coarse grid, so that touching rectangles and equal intrusions are covered as well
+        self.r1c = [(rand.randint(-8, 8) / 4, rand.randint(-8, 8) / 4) for i in range(500)]
+        self.r1s = [(rand.randint(1, 4) / 4, rand.randint(1, 4) / 4) for i in range(500)]
+        self.vel = [(rand.randint(-4, 4), rand.randint(-4, 4)) for i in range(500)]
+        self.r2c = [(rand.uniform(-2, 2), rand.uniform(-2, 2)) for i in range(250)]
+        self.r2c += [(rand.randint(-8, 8) / 4, rand.randint(-8, 8) / 4) for i in range(250)]
+        self.r2s = (0.5, 0.75)
+
+    def test_rect_rect_batch_matchesScalar(self):
+        projections, hits = rect_rect_batch(self.r1c, self.r1s, self.r2c, self.r2s)
+
+        for i, (projection, hit) in enumerate(zip(projections.tolist(), hits.tolist())):
+            expected = rect_rect(Vector2(self.r1c[i]), self.r1s[i], Vector2(self.r2c[i]), self.r2s)
+            if expected:
+                self.assertTrue(hit)
+                self.assertAlmostEqual(projection[0], expected.x)
+                self.assertAlmostEqual(projection[1], expected.y)
+            else:
+                self.assertFalse(hit)
+                self.assertEqual(projection, [0, 0])
+
+    def test_sweep_rect_rect_batch_matchesScalar(self):
+        times = sweep_rect_rect_batch(self.r1c, self.r1s, self.vel, self.r2c, self.r2s, 0.5)
+
+        for i, time in enumerate(times.tolist()):
+            expected = sweep_rect_rect(Vector2(self.r1c[i]), self.r1s[i], Vector2(self.vel[i]), Vector2(self.r2c[i]),
+                                       self.r2s, 0.5)
+            if expected is None:
+                self.assertEqual(time, math.inf)
+            else:
+                self.assertAlmostEqual(time, expected)
+
+    def test_sweep_limit_batch_matchesScalar(self):
+        pos = [center[0] for center in self.r1c]
+        vel = [vel[0] for vel in self.vel]
+
+        times = sweep_limit_batch(pos, vel, 1)
+
+        for i, time in enumerate(times.tolist()):
+            self.assertAlmostEqual(time, sweep_limit(pos[i], vel[i], 1))
+
+    def test_ellipticNormal_batch_matchesScalar(self):
+        for exponent in [1, 2, 4.5]:
+            normals = ellipticNormal_batch(self.r1c, self.r2c, exponent)
+
+            for i, normal in enumerate(normals.tolist()):
+                expected = ellipticNormal(Vector2(self.r1c[i]), Vector2(self.r2c[i]), exponent)
+                self.assertAlmostEqual(normal[0], expected.x)
+                self.assertAlmostEqual(normal[1], expected.y)
+
+    def test_ellipticNormal_batch_singleObstacle(self):
+        normals = ellipticNormal_batch([(1, 1), (-1, -1)], (0, 0), 2)
+
+        for normal, pos in zip(normals.tolist(), [(1, 1), (-1, -1)]):
+            expected = ellipticNormal(Vector2(pos), Vector2(), 2)
+            self.assertAlmostEqual(normal[0], expected.x)
+            self.assertAlmostEqual(normal[1], expected.y)
+
+
+class SpatialHash_tests(TestCase):
+    def setUp(self):
+        self.grid = SpatialHash(0.1)
+
+    def test_query_findsItemInSameCell(self):
+        self.grid.insert('a', 0.05, 0.05, 0.01, 0.01)
+
+        self.assertEqual(self.grid.query(0.06, 0.04, 0.01, 0.01, []), ['a'])
+
+    def test_query_skipsDistantItems(self):
+        self.grid.insert('a', 0.05, 0.05, 0.01, 0.01)
+        self.grid.insert('b', -0.55, 0.35, 0.01, 0.01)
+
+        self.assertEqual(self.grid.query(0.5, -0.3, 0.01, 0.01, []), [])
+
+    def test_query_itemSpanningCells_foundOnce(self):
+        self.grid.insert('a', 0, 0, 0.15, 0.15)
+
+        self.assertEqual(self.grid.query(0, 0, 0.2, 0.2, []), ['a'])
+        self.assertEqual(self.grid.query(-0.12, 0.12, 0.01, 0.01, []), ['a'])
+
+    def test_clear_removesItems(self):
+        self.grid.insert('a', 0.05, 0.05, 0.01, 0.01)
+        self.grid.clear()
+
+        self.assertEqual(self.grid.query(0.05, 0.05, 0.01, 0.01, []), [])
+
+
 if __name__ == '__main__':
     unittest.main()
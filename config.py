@@ -1,8 +1,13 @@
+import ast
 import os
 import re
+import threading
+import time
 
 _reSetting = re.compile(r'(\w+)=(.*)', re.IGNORECASE)
 
+_constants = {'True': True, 'False': False, 'None': None}
+
 
 def load(filePath: str) -> dict:
     settings = {}
@@ -12,24 +17,80 @@ def load(filePath: str) -> dict:
                 match = _reSetting.match(line)
                 if match:
                     name = match.group(1)
-                    value = eval(match.group(2))
-                    settings[name] = value
+                    try:
+                        settings[name] = parseValue(match.group(2))
+                    except (ValueError, SyntaxError):
+                        print('Ignoring invalid setting: ', line.strip())
     return settings
 
 
 def save(filePath: str, settings: dict):
-    with open(filePath, 'w') as file:
+    # written beside the file and renamed over it, so the file is never left partly written
+    tempPath = filePath + '.tmp'
+    with open(tempPath, 'w') as file:
         settings = list(settings.items())
         settings.sort()
         for setting in settings:
             file.write('{}={!r}\n'.format(*setting))
+    os.replace(tempPath, filePath)
+
+
+def parseValue(text: str):
+    """
+    Parse a setting's value, a Python literal as written by save(). Numbers, constants, plain strings and tuples of
+    integers (such as resolutions) are parsed directly, and other literals by ast.literal_eval, so no code in the file
+    is ever run.
+    :raise ValueError: When the value is not a literal
+    :raise SyntaxError: When the value is not valid Python
+    """
+    text = text.strip()
+    if text in _constants:
+        return _constants[text]
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if len(text) >= 2 and text[0] in '\'"' and text[-1] == text[0] and '\\' not in text and text[0] not in text[1:-1]:
+        return text[1:-1]
+    if text.startswith('(') and text.endswith(')'):
+        try:
+            return tuple(int(item) for item in text[1:-1].split(','))
+        except ValueError:
+            pass
+    return ast.literal_eval(text)
 
 
 class Config:
-    def __init__(self, fileName: str):
+    """
+    Settings, with subscriptions to their changes. Changed settings are written to the file on a background thread,
+    once they have stopped changing for WRITE_DELAY seconds, so that a burst of changes (such as resizing the window)
+    is written once. Call flush() before exiting to write any changes that are still waiting.
+    """
+    WRITE_DELAY = 0.5
+
+    def __init__(self, fileName: str, writeDelay: float=WRITE_DELAY):
+        """
+        :param fileName: File to load and save the settings in, or '' to not save them
+        :param writeDelay: Seconds to wait for more changes before writing them
+        """
         self.fileName = fileName
+        self.writeDelay = writeDelay
         self.settings = {}
         self.subscriptions = {}
+        # whether there are changes that have not been written
+        self.dirty = False
+        self.lastChange = 0
+
+        # guards dirty and lastChange, and wakes the writer when they change
+        self._changed = threading.Condition()
+        # held while writing, so that writes happen in the order their settings were copied
+        self._writing = threading.Lock()
+        self._writer = None
+        """:type: threading.Thread"""
 
     def __getitem__(self, key):
         if key in self.settings:
@@ -38,6 +99,7 @@ class Config:
 
     def __setitem__(self, key, value):
         self.settings[key] = value
+        self.save()
         if key in self.subscriptions:
             for setter in self.subscriptions[key]:
                 setter(value)
@@ -52,4 +114,47 @@ class Config:
         self.settings.update(load(self.fileName))
 
     def save(self):
-        save(self.fileName, self.settings)
+        """
+        Mark the settings as changed, to be written in the background after the write delay.
+        """
+        if not self.fileName:
+            return
+
+        with self._changed:
+            self.dirty = True
+            self.lastChange = time.monotonic()
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writeLoop, name='config writer', daemon=True)
+                self._writer.start()
+            self._changed.notify()
+
+    def flush(self):
+        """
+        Write any changes now, without waiting for the write delay.
+        """
+        self._write()
+
+    def _writeLoop(self):
+        while True:
+            with self._changed:
+                while not self.dirty:
+                    self._changed.wait()
+                # restart the delay whenever there is another change
+                wait = self.lastChange + self.writeDelay - time.monotonic()
+                if wait > 0:
+                    self._changed.wait(wait)
+                    continue
+            self._write()
+
+    def _write(self):
+        with self._writing:
+            with self._changed:
+                if not self.dirty:
+                    return
+                settings = dict(self.settings)
+                self.dirty = False
+
+            try:
+                save(self.fileName, settings)
+            except OSError as message:
+                print('Cannot save settings: ', self.fileName, message)
@@ -0,0 +1,94 @@
+import unittest
+from unittest import TestCase
+import os
+import tempfile
+import time
+from config import *
+
+
+class parseValue_tests(TestCase):
+    def test_numbers(self):
+        self.assertEqual(parseValue('42'), 42)
+        self.assertEqual(parseValue('-3'), -3)
+        self.assertEqual(parseValue('0.25'), 0.25)
+
+    def test_constants(self):
+        self.assertIs(parseValue('True'), True)
+        self.assertIs(parseValue('False'), False)
+        self.assertIsNone(parseValue('None'))
+
+    def test_intTuple(self):
+        self.assertEqual(parseValue('(800, 600)'), (800, 600))
+
+    def test_otherLiterals(self):
+        self.assertEqual(parseValue("'replays'"), 'replays')
+        self.assertEqual(parseValue('(1,)'), (1,))
+        self.assertEqual(parseValue('(0.5, 1)'), (0.5, 1))
+        self.assertEqual(parseValue('[1, 2]'), [1, 2])
+
+    def test_code_notRun(self):
+        with self.assertRaises(ValueError):
+            parseValue("__import__('os').getcwd()")
+
+    def test_roundTrip(self):
+        for value in [1, 1.5, True, None, 'text', (1920, 1080), (), -0.0]:
+            self.assertEqual(parseValue(repr(value)), value)
+
+
+class Config_tests(TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.path = os.path.join(self.folder.name, 'settings.config')
+
+    def test_load_skipsInvalidLines(self):
+        with open(self.path, 'w') as file:
+            file.write("a=1\nb=open('x')\nc=(800, 600)\n")
+
+        self.assertEqual(load(self.path), {'a': 1, 'c': (800, 600)})
+
+    def test_save_replacesFile(self):
+        save(self.path, {'b': 'two', 'a': 1})
+
+        with open(self.path) as file:
+            self.assertEqual(file.read(), "a=1\nb='two'\n")
+        self.assertEqual(os.listdir(self.folder.name), ['settings.config'])
+
+    def test_setitem_writtenAfterDelay(self):
+        config = Config(self.path, writeDelay=0.05)
+
+        config['a'] = 1
+        self.assertTrue(config.dirty)
+        self.assertFalse(os.path.exists(self.path))
+
+        deadline = time.monotonic() + 5
+        while config.dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # the file is written after dirty is cleared
+        config.flush()
+
+        self.assertEqual(load(self.path), {'a': 1})
+
+    def test_setitem_burst_coalesced(self):
+        config = Config(self.path, writeDelay=60)
+
+        for width in range(800, 900):
+            config['resolution'] = (width, 600)
+
+        self.assertFalse(os.path.exists(self.path))
+        config.flush()
+        self.assertEqual(load(self.path), {'resolution': (899, 600)})
+        self.assertFalse(config.dirty)
+
+    def test_noFileName_neverWritten(self):
+        config = Config('')
+
+        config['a'] = 1
+        config.flush()
+
+        self.assertFalse(config.dirty)
+        self.assertIsNone(config._writer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,26 @@ from pygame.constants import *
 from pygame.event import EventType
 from sprites import Paddle, Ball
 from config import Config
+from random import Random
+import importlib
+
+
+def loadController(name: str) -> type:
+    """
+    Import a controller class by name.
+    :param name: 'module:Class' (or just 'Class' for a class in this module). The class must be constructed with
+    (paddle, ball) and implement update(delta) like BotController.
+    :rtype: type
+    """
+    moduleName, _, className = name.rpartition(':')
+    return getattr(importlib.import_module(moduleName or __name__), className)
+
+
+def controllerName(controllerType: type) -> str:
+    """
+    Get the name of a controller class that loadController accepts.
+    """
+    return '{}:{}'.format(controllerType.__module__, controllerType.__qualname__)
 
 
 class PlayerController():
@@ -19,13 +39,19 @@ class PlayerController():
         config.subscribe('p{}down'.format(playerNum + 1), setDown)
 
     def handle_event(self, event: EventType) -> bool:
-        if event.type not in [KEYDOWN, KEYUP]:
+        if event.type != KEYDOWN and event.type != KEYUP:
             return False
+        return self.handle_key(event.key, event.type == KEYDOWN)
 
-        if event.key == self.upKey:
-            self.upPressed = event.type == KEYDOWN
-        elif event.key == self.downKey:
-            self.downPressed = event.type == KEYDOWN
+    def handle_key(self, key: int, pressed: bool) -> bool:
+        """
+        :param pressed: Whether the key was pressed or released
+        :return: Whether the key is one of the player's
+        """
+        if key == self.upKey:
+            self.upPressed = pressed
+        elif key == self.downKey:
+            self.downPressed = pressed
         else:
             return False
 
@@ -52,3 +78,93 @@ class BotController:
             self.paddle.down()
         else:
             self.paddle.stop()
+
+
+class PredictiveBotController:
+    """
+    Moves to where the ball will cross the paddle, predicted analytically (including wall bounces) whenever the ball's
+    velocity changes, so each update costs the same regardless of difficulty. Difficulty comes from a reaction delay
+    after each serve or paddle hit, and a random aim error.
+    """
+    REACTION_DELAY = 0.1
+    AIM_ERROR = 0.02
+    THRESHOLD = 0.01
+
+    def __init__(self, paddle: Paddle, ball: Ball, reactionDelay: float=None, aimError: float=None, seed: int=None):
+        """
+        :param reactionDelay: Seconds after the ball changes horizontal direction before the bot reacts
+        :param aimError: Standard deviation of the error added to each predicted intercept, in game units
+        :param seed: Seed for the aim error (derived from the ball's match seed if None)
+        """
+        self.paddle = paddle
+        self.ball = ball
+        self.reactionDelay = self.REACTION_DELAY if reactionDelay is None else reactionDelay
+        self.aimError = self.AIM_ERROR if aimError is None else aimError
+
+        if seed is None:
+            seed = ball.matchSeed*2 + (paddle.side > 0) if ball.matchSeed is not None else Random().getrandbits(32)
+        self.seed = seed
+        # each aim error is drawn from its own seeded RNG, so the bot's whole state is a few numbers (see getState)
+        self.aims = 0
+
+        self.target = 0
+        self.pendingTarget = 0
+        self.reactionTimeout = 0
+        self.error = 0
+        self._cachedVel = (0, 0)
+
+    def getState(self) -> (float, ...):
+        return (self.target, self.pendingTarget, self.reactionTimeout, self.error) + self._cachedVel + (self.aims,)
+
+    def setState(self, state: (float, ...)):
+        self.target, self.pendingTarget, self.reactionTimeout, self.error, velX, velY, aims = state
+        self._cachedVel = (velX, velY)
+        self.aims = int(aims)
+
+    def update(self, delta: float):
+        vel = self.ball.vel
+        if vel.x != self._cachedVel[0]:
+            # served or hit by a paddle
+            self.error = Random(self.seed*1000003 + self.aims).gauss(0, self.aimError)
+            self.aims += 1
+            self.pendingTarget = self._predict() + self.error
+            self.reactionTimeout = self.reactionDelay
+        elif vel.y != self._cachedVel[1]:
+            # bounced off a wall; the prediction already accounts for it, but correct any drift
+            self.pendingTarget = self._predict() + self.error
+        self._cachedVel = (vel.x, vel.y)
+
+        if self.reactionTimeout > 0:
+            self.reactionTimeout -= delta
+        else:
+            self.target = self.pendingTarget
+
+        diff = self.target - self.paddle.pos.y
+        if diff > self.THRESHOLD:
+            self.paddle.up()
+        elif diff < -self.THRESHOLD:
+            self.paddle.down()
+        else:
+            self.paddle.stop()
+
+    def _predict(self) -> float:
+        """
+        Get the height at which the ball will reach the paddle, or the center of the table if it is moving away.
+        """
+        ball = self.ball
+        side = self.paddle.side
+        if ball.vel.x == 0 or (ball.vel.x > 0) != (side > 0):
+            return 0
+
+        contactX = self.paddle.pos.x - side*(self.paddle.halfSize[0] + ball.halfSize[0])
+        time = (contactX - ball.pos.x) / ball.vel.x
+        if time < 0:
+            return ball.pos.y
+        y = ball.pos.y + ball.vel.y*time
+
+        # unfold the bounces between the walls: the path repeats every two table heights
+        limit = ball.table.innerSize.y/2 - ball.radius
+        y = (y + limit) % (limit*4)
+        if y > limit*2:
+            y = limit*4 - y
+        return y - limit
@@ -0,0 +1,117 @@
+import unittest
+from unittest import TestCase
+from controllers import *
+from pong import Game
+
+
+class PredictiveBotController_tests(TestCase):
+    def setUp(self):
+        self.game = Game(Config(''), headless=True)
+        # two players, so no other bots move the paddles
+        self.game.start(2, seed=1)
+        self.ball = self.game.ball
+        self.paddle = self.game.paddles[1]
+        self.bot = PredictiveBotController(self.paddle, self.ball, reactionDelay=0.1, aimError=0)
+
+    def contactX(self) -> float:
+        return self.paddle.pos.x - self.paddle.halfSize[0] - self.ball.halfSize[0]
+
+    def flightHeight(self) -> float:
+        """
+        Fly the ball in small steps until its center crosses the paddle's contact line.
+        :return: Height of the ball at the crossing
+        """
+        ball = self.ball
+        contactX = self.contactX()
+        # keep the paddle out of the way
+        self.paddle.pos.y = -1 if ball.vel.y > 0 else 1
+        step = 0.0005
+        while True:
+            lastX, lastY = ball.pos.x, ball.pos.y
+            ball.update(step)
+            if ball.pos.x >= contactX:
+                return lastY + (ball.pos.y - lastY) * (contactX - lastX) / (ball.pos.x - lastX)
+
+    def test_predict_noBounce(self):
+        self.ball.pos.update(0, 0)
+        self.ball.vel.update(0.5, 0.1)
+
+        expected = 0.1 * self.contactX() / 0.5
+        self.assertAlmostEqual(self.bot._predict(), expected)
+
+    def test_predict_wallBouncesUnfolded(self):
+        for velY in (0.6, -0.8, 1.1, 3.2):
+            with self.subTest(velY=velY):
+                self.ball.pos.update(0, 0.1)
+                self.ball.vel.update(0.5, velY)
+
+                predicted = self.bot._predict()
+
+                self.assertAlmostEqual(predicted, self.flightHeight(), places=4)
+
+    def test_predict_movingAway_center(self):
+        self.ball.pos.update(0.2, 0.3)
+        self.ball.vel.update(-0.5, 0.1)
+
+        self.assertEqual(self.bot._predict(), 0)
+
+    def test_update_afterHit_waitsReactionDelay(self):
+        self.ball.pos.update(0, 0)
+        self.ball.vel.update(0.5, 0.1)
+        step = self.game.step
+
+        self.bot.update(step)
+        target = self.bot.pendingTarget
+        self.assertGreater(target, 0)
+
+        # 12 steps make up the 0.1 s delay
+        for i in range(12):
+            self.assertEqual(self.bot.target, 0)
+            self.bot.update(step)
+        self.bot.update(step)
+
+        self.assertEqual(self.bot.target, target)
+        self.assertEqual(self.paddle.direction, 1)
+
+    def test_update_wallBounce_noReactionDelay(self):
+        self.ball.pos.update(0, 0)
+        self.ball.vel.update(0.5, 0.1)
+        for i in range(20):
+            self.bot.update(self.game.step)
+
+        self.ball.vel.y = -0.1
+        self.bot.update(self.game.step)
+
+        self.assertEqual(self.bot.target, self.bot.pendingTarget)
+        self.assertLess(self.bot.target, 0)
+
+    def test_update_sameVelocity_notRecomputed(self):
+        predictions = []
+        predict = self.bot._predict
+
+        def countingPredict() -> float:
+            predictions.append(self.ball.vel.x)
+            return predict()
+
+        self.bot._predict = countingPredict
+        self.ball.pos.update(0, 0)
+        self.ball.vel.update(0.5, 0.1)
+
+        for i in range(50):
+            self.ball.pos += self.ball.vel * self.game.step
+            self.bot.update(self.game.step)
+        self.assertEqual(len(predictions), 1)
+
+        self.ball.vel.y = -0.1
+        self.bot.update(self.game.step)
+        self.ball.vel.x = -0.5
+        self.bot.update(self.game.step)
+        for i in range(50):
+            self.bot.update(self.game.step)
+
+        self.assertEqual(predictions, [0.5, 0.5, -0.5])
+        self.assertEqual(self.bot.aims, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,252 @@
+import pygame
+from pygame.locals import *
+from pygame import Surface
+from pygame.event import EventType
+from pygame import draw
+from pygame.color import THECOLORS
+from array import array
+from textcache import textCache
+import csv
+import math
+import time
+
+
+class RingBuffer:
+    """
+    Fixed-size ring buffer of floats, in which each value recorded once it is full replaces the oldest one. The values
+    are kept in an array allocated up front, so recording one allocates nothing.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.buffer = array('d', bytes(8 * capacity))
+        # index of the next record
+        self.next = 0
+        self.count = 0
+
+    def append(self, value: float):
+        i = self.next
+        self.buffer[i] = value
+        self.next = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self):
+        self.next = 0
+        self.count = 0
+
+    def values(self) -> [float]:
+        """
+        :return: The recorded values, oldest first
+        """
+        if self.count < self.capacity:
+            return self.buffer[:self.count].tolist()
+        return self.buffer[self.next:].tolist() + self.buffer[:self.next].tolist()
+
+
+class FrameTimings:
+    """
+    Per-frame timings of the latest frames, in seconds. Each frame records its total time (from the previous frame to
+    this one) and the time spent in each phase of the game loop.
+    """
+    PHASES = ('event', 'update', 'draw', 'flip')
+    COLUMNS = ('frame',) + PHASES
+
+    def __init__(self, capacity: int=600):
+        self.columns = [RingBuffer(capacity) for c in self.COLUMNS]
+
+    @property
+    def count(self) -> int:
+        return self.columns[0].count
+
+    def record(self, frame: float, event: float, update: float, draw: float, flip: float):
+        for column, value in zip(self.columns, (frame, event, update, draw, flip)):
+            column.append(value)
+
+    def clear(self):
+        for column in self.columns:
+            column.clear()
+
+    def values(self, column: str='frame') -> [float]:
+        """
+        :return: The recorded values of a column, oldest first
+        """
+        return self.columns[self.COLUMNS.index(column)].values()
+
+    def percentile(self, p: float, column: str='frame') -> float:
+        """
+        :param p: Percentile from 0 to 100, by the nearest rank method
+        """
+        return percentile(self.values(column), p)
+
+    def writeCsv(self, filePath: str):
+        rows = zip(*(self.values(column) for column in self.COLUMNS))
+        with open(filePath, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(self.COLUMNS)
+            for row in rows:
+                writer.writerow(['{:.6f}'.format(value) for value in row])
+
+
+class InputLatency:
+    """
+    Input latencies of the latest inputs, in seconds: the time from reading a key that changes a paddle's direction to
+    the display update of the first frame drawn after a physics step has moved the paddle that way. The time the key
+    spent in the event queue before it was read is not included, as pygame does not timestamp events.
+    """
+    def __init__(self, capacity: int=120):
+        self.samples = RingBuffer(capacity)
+        # when the earliest input not yet shown was read, and the physics step it was read at
+        self.pendingSince = None
+        """:type: float"""
+        self.pendingTick = 0
+
+    @property
+    def count(self) -> int:
+        return self.samples.count
+
+    def input(self, now: float, tick: int):
+        """
+        Called when an input changes a paddle's direction.
+        :param tick: Physics steps run so far
+        """
+        if self.pendingSince is None:
+            self.pendingSince = now
+            self.pendingTick = tick
+
+    def shown(self, now: float, tick: int):
+        """
+        Called once a frame has been sent to the display.
+        :param tick: Physics steps run before the frame was drawn
+        """
+        if self.pendingSince is not None and tick > self.pendingTick:
+            self.samples.append(now - self.pendingSince)
+            self.pendingSince = None
+
+    def cancel(self):
+        """
+        Forget an input that will not be shown, such as when the game is paused.
+        """
+        self.pendingSince = None
+
+    def clear(self):
+        self.samples.clear()
+        self.pendingSince = None
+
+    def values(self) -> [float]:
+        """
+        :return: The recorded latencies, oldest first
+        """
+        return self.samples.values()
+
+    def percentile(self, p: float) -> float:
+        return percentile(self.values(), p)
+
+
+def percentile(values: [float], p: float) -> float:
+    """
+    :param p: Percentile from 0 to 100, by the nearest rank method
+    :return: The percentile of the values, or 0 if there are none
+    """
+    values = sorted(values)
+    if not values:
+        return 0
+    rank = max(math.ceil(p / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class TimingHud:
+    """
+    Overlay showing where the time of each frame goes, and the latency of paddle inputs. The game loop only measures
+    its phases while the overlay is enabled, and the overlay image is only re-rendered a few times per second.
+    """
+    REFRESH_SECONDS = 0.25
+    SPARKLINE_SIZE = (240, 40)
+    # frame time at the top of the sparkline, unless a frame was slower
+    SPARKLINE_SCALE = 1/30
+    TARGET_FRAME_TIME = 1/60
+    MARGIN = 4
+
+    def __init__(self, capacity: int=600):
+        self.timings = FrameTimings(capacity)
+        self.latency = InputLatency()
+        self.enabled = False
+        self.image = None
+        """:type: Surface"""
+        self.rect = Rect(0, 0, 0, 0)
+        self.font = None
+        self.sinceRefresh = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.image = None
+        if self.enabled:
+            self.timings.clear()
+            self.latency.clear()
+
+    def handle_event(self, event: EventType) -> bool:
+        """
+        F3 toggles the overlay, and Ctrl+F3 dumps the recorded timings to a CSV file in the working directory.
+        """
+        if event.type != KEYDOWN or event.key != K_F3:
+            return False
+
+        if event.mod & KMOD_CTRL:
+            self.timings.writeCsv('frame-timings-{}.csv'.format(time.strftime('%Y%m%d-%H%M%S')))
+        else:
+            self.toggle()
+        return True
+
+    def record(self, frame: float, event: float, update: float, draw: float, flip: float):
+        self.timings.record(frame, event, update, draw, flip)
+        self.sinceRefresh += frame
+
+    def draw(self, surface: Surface) -> Rect:
+        """
+        Draw the overlay in the top left corner of the surface.
+        :return: The area drawn
+        """
+        if self.image is None or self.sinceRefresh >= self.REFRESH_SECONDS:
+            self._render()
+            self.sinceRefresh = 0
+        return surface.blit(self.image, self.rect)
+
+    def _render(self):
+        if self.font is None:
+            self.font = textCache.font(18)
+
+        timings = self.timings
+        ms = 1000
+        lines = [
+            'frame  p50 {:5.1f}  p99 {:5.1f}  max {:5.1f} ms'.format(
+                timings.percentile(50) * ms, timings.percentile(99) * ms, timings.percentile(100) * ms),
+            '  '.join('{} {:.2f}'.format(phase, timings.percentile(50, phase) * ms) for phase in timings.PHASES)
+            + ' ms p50',
+            'input  p50 {:5.1f}  p99 {:5.1f}  max {:5.1f} ms  ({} inputs)'.format(
+                self.latency.percentile(50) * ms, self.latency.percentile(99) * ms,
+                self.latency.percentile(100) * ms, self.latency.count),
+        ]
+        textImages = [self.font.render(line, True, THECOLORS['white']) for line in lines]
+
+        margin = self.MARGIN
+        lineHeight = self.font.get_linesize()
+        sparkWidth, sparkHeight = self.SPARKLINE_SIZE
+        width = max([sparkWidth] + [image.get_width() for image in textImages]) + margin*2
+        height = lineHeight*len(lines) + sparkHeight + margin*3
+
+        # opaque, so the dirty rect path can draw it over itself every frame
+        if self.image is None or self.image.get_size() != (width, height):
+            self.image = Surface((width, height)).convert()
+            self.rect = Rect((0, 0), (width, height))
+        self.image.fill((24, 24, 24))
+        for i, image in enumerate(textImages):
+            self.image.blit(image, (margin, margin + lineHeight*i))
+
+        sparkTop = margin*2 + lineHeight*len(lines)
+        sparkBottom = sparkTop + sparkHeight - 1
+        frames = timings.values()[-sparkWidth:]
+        scale = max([self.SPARKLINE_SCALE] + frames)
+        target = sparkBottom - round(self.TARGET_FRAME_TIME / scale * (sparkHeight - 1))
+        draw.line(self.image, (80, 80, 80), (margin, target), (margin + sparkWidth - 1, target))
+        for x, frame in enumerate(frames, margin + sparkWidth - len(frames)):
+            top = sparkBottom - round(frame / scale * (sparkHeight - 1))
+            color = THECOLORS['green'] if frame <= self.TARGET_FRAME_TIME * 1.5 else THECOLORS['red']
+            draw.line(self.image, color, (x, sparkBottom), (x, top))
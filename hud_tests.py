@@ -0,0 +1,128 @@
+import unittest
+from unittest import TestCase
+import os
+import tempfile
+from hud import *
+
+
+class RingBuffer_tests(TestCase):
+    def test_values_notFull_oldestFirst(self):
+        buffer = RingBuffer(4)
+        for value in [1, 2, 3]:
+            buffer.append(value)
+
+        self.assertEqual(buffer.values(), [1, 2, 3])
+        self.assertEqual(buffer.count, 3)
+
+    def test_append_full_oldestReplaced(self):
+        buffer = RingBuffer(3)
+        for value in range(1, 9):
+            buffer.append(value)
+
+        self.assertEqual(buffer.values(), [6, 7, 8])
+        self.assertEqual(buffer.count, 3)
+
+    def test_clear(self):
+        buffer = RingBuffer(3)
+        for value in range(1, 5):
+            buffer.append(value)
+
+        buffer.clear()
+        buffer.append(9)
+
+        self.assertEqual(buffer.values(), [9])
+
+
+class FrameTimings_tests(TestCase):
+    @staticmethod
+    def recordFrames(timings: FrameTimings, frames: [float]):
+        for frame in frames:
+            timings.record(frame, frame/10, frame/5, frame/2, frame/10)
+
+    def test_values_before_full(self):
+        timings = FrameTimings(5)
+        self.recordFrames(timings, [1, 2, 3])
+        self.assertEqual(timings.values(), [1, 2, 3])
+        self.assertEqual(timings.values('draw'), [0.5, 1, 1.5])
+
+    def test_values_wraps_oldest_first(self):
+        timings = FrameTimings(4)
+        self.recordFrames(timings, [1, 2, 3, 4, 5, 6])
+        self.assertEqual(timings.values(), [3, 4, 5, 6])
+
+    def test_percentile(self):
+        timings = FrameTimings(200)
+        self.recordFrames(timings, range(1, 101))
+        self.assertEqual(timings.percentile(50), 50)
+        self.assertEqual(timings.percentile(99), 99)
+        self.assertEqual(timings.percentile(100), 100)
+        self.assertEqual(timings.percentile(0), 1)
+
+    def test_percentile_empty(self):
+        self.assertEqual(FrameTimings(10).percentile(50), 0)
+
+    def test_clear(self):
+        timings = FrameTimings(4)
+        self.recordFrames(timings, [1, 2, 3, 4, 5])
+        timings.clear()
+        self.recordFrames(timings, [7])
+        self.assertEqual(timings.values(), [7])
+
+    def test_writeCsv(self):
+        timings = FrameTimings(2)
+        self.recordFrames(timings, [1, 2, 3])
+        fd, filePath = tempfile.mkstemp('.csv')
+        os.close(fd)
+        try:
+            timings.writeCsv(filePath)
+            with open(filePath, 'r') as file:
+                lines = file.read().splitlines()
+        finally:
+            os.remove(filePath)
+        self.assertEqual(lines[0], 'frame,event,update,draw,flip')
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[1].split(',')[0], '2.000000')
+
+
+class InputLatency_tests(TestCase):
+    def test_shown_afterStep_recorded(self):
+        latency = InputLatency()
+        latency.input(1.0, 10)
+
+        latency.shown(1.01, 10)
+        self.assertEqual(latency.values(), [])
+
+        latency.shown(1.03, 11)
+        self.assertEqual(latency.values(), [1.03 - 1.0])
+        self.assertIsNone(latency.pendingSince)
+
+    def test_input_beforeShown_measuredFromFirst(self):
+        latency = InputLatency()
+        latency.input(1.0, 10)
+        latency.input(1.02, 10)
+
+        latency.shown(1.05, 11)
+
+        self.assertEqual(latency.values(), [1.05 - 1.0])
+
+    def test_cancel_notRecorded(self):
+        latency = InputLatency()
+        latency.input(1.0, 10)
+
+        latency.cancel()
+        latency.shown(5.0, 20)
+
+        self.assertEqual(latency.values(), [])
+
+    def test_values_wraps_oldest_first(self):
+        latency = InputLatency(2)
+        for i in range(3):
+            latency.input(i, i)
+            latency.shown(i + 0.5, i + 1)
+
+        self.assertEqual(latency.values(), [0.5, 0.5])
+        self.assertEqual(latency.count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
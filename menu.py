@@ -6,6 +6,9 @@ from pygame.font import Font
 import pygame
 import pygame.gfxdraw
 from config import Config
+from scheduler import Scheduler, Timer
+from surfacecache import surfaceCache
+from textcache import textCache
 
 
 # forward declarations for type annotations
@@ -37,22 +40,41 @@ class MenuNode:
         self.visibleIndex = 0
 
     def init(self, menu: Menu):
+        """
+        Attach the node and its children to a menu. Images are only rendered when the node is first drawn.
+        """
         self.menu = menu
-        self.image = menu.font.render(self.text, True, menu.foreColor)
-        self.rect = self.image.get_rect()
-
-        self.imageDisabled = self.image.copy()
-        self.imageDisabled.fill((255, 255, 255, 90), None, BLEND_RGBA_MULT)
+        self.image = None
+        self.imageDisabled = None
+        self.rect = Rect((0, 0), menu.font.size(self.text))
 
         for node in self.nodes:
             node.init(menu)
 
+    def render(self):
+        """
+        Render the node's images, if they have not been rendered since init.
+        """
+        if self.image is None:
+            self.image = textCache.render(self.menu.font, self.text, self.menu.foreColor)
+
+            self.imageDisabled = self.image.copy()
+            self.imageDisabled.fill((255, 255, 255, 90), None, BLEND_RGBA_MULT)
+
     def add(self, node: MenuNode):
         self.nodes.append(node)
         node.parent = self
         if self.menu is not None:
             node.init(self.menu)
 
+    def adopt(self, node: MenuNode):
+        """
+        Make this node the parent of a child that is shared with another menu, as it is entered from here.
+        """
+        node.parent = self
+        if node.menu is not self.menu:
+            node.init(self.menu)
+
     def getSize(self) -> (int, int):
         if len(self.nodes) > 0:
             width = max([self.rect.width] + list(n.rect.width for n in self.nodes)) + self.menu.itemHeight*2
@@ -93,6 +115,7 @@ class MenuNode:
             self.visibleIndex = min(self.selected, len(self.nodes) - self.menu.visibleItems)
             return True
         elif event.key == K_RETURN:
+            self.adopt(self.nodes[self.selected])
             self.nodes[self.selected].invoke()
             return True
         elif event.key == K_ESCAPE:
@@ -103,6 +126,7 @@ class MenuNode:
 
         for node in self.nodes:
             if event.key == node.key:
+                self.adopt(node)
                 node.invoke()
                 return True
 
@@ -117,6 +141,7 @@ class MenuNode:
                 self.callback()
 
     def draw(self, screen: Surface, pos: (int, int)):
+        self.render()
         if self.disabled:
             screen.blit(self.imageDisabled, pos)
         else:
@@ -130,6 +155,7 @@ class MenuNode:
             pos[1] += int(self.menu.itemHeight*positions)
 
         advance()
+        self.render()
         screen.blit(self.image, pos)
         advance()
 
@@ -155,22 +181,28 @@ class CheckMenuNode(MenuNode):
     def __init__(self, text: str, callback=None, key: int=None):
         MenuNode.__init__(self, text, callback, key)
         self.checked = False
+        self.box = None
         self.checkRect = None
 
     def init(self, menu: Menu):
         MenuNode.init(self, menu)
 
         self.rect.width += self.menu.fontHeight - self.menu.fontPadding
-        image = Surface(self.rect.size).convert_alpha()
-        image.fill([0]*4)
-        image.blit(self.image, (self.menu.fontHeight - self.menu.fontPadding, 0))
-        self.image = image
 
-        box = Rect((0, 0), [self.menu.fontHeight]*2)
-        box.inflate_ip([-self.menu.fontPadding*2]*2)
-        box.x = 0
-        image.fill(self.menu.foreColor, box)
-        self.checkRect = box.inflate([-self.menu.fontPadding]*2)
+        self.box = Rect((0, 0), [self.menu.fontHeight]*2)
+        self.box.inflate_ip([-self.menu.fontPadding*2]*2)
+        self.box.x = 0
+        self.checkRect = self.box.inflate([-self.menu.fontPadding]*2)
+
+    def render(self):
+        if self.image is None:
+            MenuNode.render(self)
+
+            image = Surface(self.rect.size).convert_alpha()
+            image.fill([0]*4)
+            image.blit(self.image, (self.menu.fontHeight - self.menu.fontPadding, 0))
+            image.fill(self.menu.foreColor, self.box)
+            self.image = image
 
     def invoke(self):
         if not self.disabled:
@@ -204,32 +236,40 @@ class KeyBindMenuNode(MenuNode):
         self.configName = configName
         self.config = config
 
+        self.listening = False
+        self.displayText = None
         self.displayImage = None
         self.listenImage = None
 
-    def init(self, menu: Menu):
-        MenuNode.init(self, menu)
-        self.listenImage = self.image
-
         def bind(key):
-            text = '{}: {}'.format(self.bindingName, pygame.key.name(key))
-            self.displayImage = self.menu.font.render(text, True, self.menu.foreColor)
-            self.image = self.displayImage
+            self.displayText = '{}: {}'.format(self.bindingName, pygame.key.name(key))
+            self.displayImage = None
 
         self.config.subscribe(self.configName, bind)
 
+    def init(self, menu: Menu):
+        MenuNode.init(self, menu)
+        self.displayImage = None
+        self.listenImage = None
+
+    def render(self):
+        if self.listenImage is None:
+            MenuNode.render(self)
+            self.listenImage = self.image
+        if self.displayImage is None:
+            self.displayImage = textCache.render(self.menu.font, self.displayText, self.menu.foreColor)
+        self.image = self.listenImage if self.listening else self.displayImage
+
     def invoke(self):
-        self.image = self.listenImage
+        self.listening = True
         self.parent.handle_event = self.listen
 
     def listen(self, event: EventType) -> bool:
         if event.key != K_ESCAPE:
             self.config[self.configName] = event.key
-            self.config.save()
             if self.callback:
                 self.callback(event.key)
-        else:
-            self.image = self.displayImage
+        self.listening = False
 
         del self.parent.handle_event
         return True
@@ -262,10 +302,12 @@ class Menu:
         self._usingMidtop = False
         self.imageInited = False
 
+        # repeats the last key pressed while it is held
+        self.timers = Scheduler()
         self.repeatEvent = None
         """:type: EventType"""
-        self.repeatTimeout = None
-        """:type: float"""
+        self.repeatTimer = None
+        """:type: Timer"""
 
         # render scroll arrows
         arrowSize = int(self.itemHeight/3)
@@ -326,7 +368,9 @@ class Menu:
             size = maxSize(self.root)
 
             import drawutil
-            self.image = drawutil.rect(size, self.backgroundColor, self.fontPadding, self.borderColor)
+            self.image = surfaceCache.get(
+                ('menu', self.fontPadding), size, (self.backgroundColor, self.borderColor), 0,
+                lambda: drawutil.rect(size, self.backgroundColor, self.fontPadding, self.borderColor))
             if self._usingMidtop:
                 oldMidtop = self._rect.midtop
             self._rect.size = self.image.get_size()
@@ -334,14 +378,18 @@ class Menu:
                 self._rect.midtop = oldMidtop
 
         if self.fadeColor:
-            self.imageFade = Surface(screenSize)
+            def renderFade() -> Surface:
+                image = Surface(screenSize)
 
-            if len(self.fadeColor) > 3:
-                self.imageFade = self.imageFade.convert_alpha()
-            else:
-                self.imageFade = self.imageFade.convert()
+                if len(self.fadeColor) > 3:
+                    image = image.convert_alpha()
+                else:
+                    image = image.convert()
+
+                image.fill(self.fadeColor)
+                return image
 
-            self.imageFade.fill(self.fadeColor)
+            self.imageFade = surfaceCache.get('fade', screenSize, self.fadeColor, 0, renderFade)
 
     def reset(self):
         self.current = self.root
@@ -349,21 +397,26 @@ class Menu:
 
     def handle_event(self, event: EventType) -> bool:
         if event.type == KEYDOWN:
+            self.stopRepeat()
             self.repeatEvent = event
-            self.repeatTimeout = self.KEY_REPEAT_START
+            self.repeatTimer = self.timers.schedule(self.KEY_REPEAT_START, self._repeat, self.KEY_REPEAT_INTERVAL)
             return self.current.handle_event(event)
         elif event.type == KEYUP:
-            self.repeatEvent = None
-            self.repeatTimeout = None
+            self.stopRepeat()
 
         return False
 
+    def stopRepeat(self):
+        if self.repeatTimer:
+            self.repeatTimer.cancel()
+        self.repeatEvent = None
+        self.repeatTimer = None
+
     def update(self, delta: float):
-        if self.repeatTimeout is not None:
-            self.repeatTimeout -= delta
-            if self.repeatTimeout <= 0:
-                self.repeatTimeout = self.KEY_REPEAT_INTERVAL
-                self.current.handle_event(self.repeatEvent)
+        self.timers.update(delta)
+
+    def _repeat(self):
+        self.current.handle_event(self.repeatEvent)
 
     def draw(self, screen: Surface):
         if not self.imageInited:
@@ -0,0 +1,86 @@
+import unittest
+from unittest import TestCase
+import os
+from menu import *
+
+
+class Menu_tests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+        pygame.font.init()
+        pygame.display.set_mode((320, 240))
+
+    def createMenu(self, root: MenuNode) -> Menu:
+        return Menu(root, pygame.font.Font(None, 36), (255, 255, 255), (0, 0, 128))
+
+    def keyDown(self, menu: Menu, key: int):
+        menu.handle_event(pygame.event.Event(KEYDOWN, key=key, mod=0))
+
+    def test_init_defersRendering(self):
+        root = MenuNode("Root")
+        root.add(MenuNode("Child", key=K_c))
+        root.add(CheckMenuNode("Check"))
+        menu = self.createMenu(root)
+
+        for node in [root] + root.nodes:
+            self.assertIsNone(node.image)
+        self.assertEqual(root.nodes[0].rect.size, menu.font.size("Child"))
+
+    def test_draw_rendersNodes(self):
+        root = MenuNode("Root")
+        root.add(MenuNode("Child"))
+        menu = self.createMenu(root)
+
+        menu.draw(pygame.display.get_surface())
+
+        self.assertIsNotNone(root.image)
+        self.assertEqual(root.nodes[0].image.get_size(), root.nodes[0].rect.size)
+
+    def test_sharedNode_adoptedByMenuEnteringIt(self):
+        shared = MenuNode("Shared", key=K_s)
+        shared.add(MenuNode("Leaf"))
+        root1 = MenuNode("Root 1")
+        root1.add(shared)
+        root2 = MenuNode("Root 2")
+        root2.add(shared)
+        menu1 = self.createMenu(root1)
+        menu2 = self.createMenu(root2)
+
+        self.keyDown(menu1, K_s)
+        self.assertIs(menu1.current, shared)
+        self.assertIs(shared.menu, menu1)
+        self.assertIs(shared.nodes[0].menu, menu1)
+        self.assertIs(menu1.root, root1)
+
+        self.keyDown(menu1, K_ESCAPE)
+        self.assertIs(menu1.current, root1)
+
+        self.keyDown(menu2, K_s)
+        self.assertIs(menu2.current, shared)
+        self.assertIs(shared.menu, menu2)
+        self.assertIs(menu2.root, root2)
+
+        self.keyDown(menu2, K_ESCAPE)
+        self.assertIs(menu2.current, root2)
+        self.assertIs(menu1.current, root1)
+
+    def test_update_heldKeyRepeats(self):
+        root = MenuNode("Root")
+        for name in ["A", "B", "C", "D"]:
+            root.add(MenuNode(name))
+        menu = self.createMenu(root)
+
+        self.keyDown(menu, K_DOWN)
+        menu.update(menu.KEY_REPEAT_START)
+        menu.update(menu.KEY_REPEAT_INTERVAL)
+        self.assertEqual(root.selected, 3)
+
+        menu.handle_event(pygame.event.Event(KEYUP, key=K_DOWN, mod=0))
+        menu.update(menu.KEY_REPEAT_START)
+        self.assertEqual(root.selected, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
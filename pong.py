@@ -1,6 +1,22 @@
+import time
+# taken before the other imports, for the startup profile
+_importStart = time.perf_counter()
+
 from menu import *
 from sprites import *
 from controllers import PlayerController, BotController
+from replay import ReplayRecorder
+from scheduler import Scheduler, Timer
+from hud import TimingHud, InputLatency
+from audio import Audio
+from surfacecache import SurfaceCache, surfaceCache
+from textcache import textCache
+from random import Random
+import assets
+import collision
+import argparse
+import math
+import os
 
 
 class GameState:
@@ -10,14 +26,72 @@ class GameState:
     quit = 4
 
 
+class StartupProfile:
+    """
+    Time spent in each phase of starting the game.
+    """
+    def __init__(self, start: float):
+        """
+        :param start: perf_counter time the startup began
+        """
+        self.start = start
+        self.last = start
+        self.phases = []
+
+    def mark(self, phase: str):
+        """
+        End a phase, which began at the end of the previous one.
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self) -> str:
+        rows = self.phases + [('total', self.last - self.start)]
+        return '\n'.join('{:<12}{:8.1f} ms'.format(phase, seconds * 1000) for phase, seconds in rows)
+
+
 class Game:
-    def __init__(self, config: Config):
+    PHYSICS_RATE = 120
+    MAX_FRAME_TIME = 0.25
+    SERVE_DELAY = 3
+    # seconds without another resize before the video is rebuilt for the new window size
+    RESIZE_SETTLE = 0.1
+    # balls in a chaos match; at the start, they are served one at a time, within a few seconds however many there are
+    CHAOS_BALLS = 12
+    MULTIBALL_SERVE_INTERVAL = 0.25
+    MULTIBALL_SERVE_TIME = 3
+    # cell size of the multiball broadphase grid, a few ball diameters
+    BROADPHASE_CELL_SIZE = 0.1
+    # sound file and priority of each kind of ball contact
+    SOUNDS = {Ball.WALL_CONTACT: ('wall.wav', 1), Ball.PADDLE_CONTACT: ('paddle.wav', 2),
+              Ball.SCORE_CONTACT: ('score.wav', 3)}
+    # the only events let into the queue; the window events keep resizes coming, as pygame makes VIDEORESIZE from them,
+    # and the expose events tell when an uncovered window must be redrawn in full
+    EVENT_TYPES = (QUIT, KEYDOWN, KEYUP, VIDEORESIZE, WINDOWRESIZED, WINDOWSIZECHANGED, VIDEOEXPOSE, WINDOWEXPOSED)
+
+    def __init__(self, config: Config, headless: bool=False, startup: StartupProfile=None):
+        """
+        :param headless: Whether to skip display and menu setup
+        :param startup: Profile to record the setup phases in
+        """
         self.config = config
+        self.headless = headless
         self.screen = None
         """:type: Surface"""
         self.image = None
         """:type: Surface"""
         self.letterBoxes = []
+        self.screenArea = None
+        """:type: Rect"""
+        # whether the next draw must redraw and update the whole screen, rather than only what changed
+        self.fullRedraw = True
+        self.drawnState = None
+        # window size to rebuild the video for once resizing settles, and the frame drawn at the old size meanwhile
+        self.pendingSize = None
+        self.resizeSettle = 0
+        self.frame = None
+        """:type: Surface"""
 
         self.state = GameState.mainMenu
 
@@ -25,19 +99,82 @@ class Game:
         self.scoreBoard = ScoreBoard()
         self.paddles = [Paddle(self.table, -1), Paddle(self.table, 1)]
         self.ball = Ball(self.table, self.paddles, self)
-        self.sprites = pygame.sprite.RenderPlain(self.scoreBoard, self.ball, self.paddles[0], self.paddles[1])
+        self.sprites = DirtyRectGroup(self.scoreBoard, self.ball, self.paddles[0], self.paddles[1])
+        # every ball in play; a multiball match has more balls after the first
+        self.balls = [self.ball]
+        self.broadphase = collision.SpatialHash(self.BROADPHASE_CELL_SIZE)
+        self._nearBalls = []
 
         self.players = []
         self.bots = []
-        self.timers = []
+        # the player controller of each key bound to a paddle, rebuilt when the players or key bindings change
+        self.keyControllers = None
+        """:type: {int: PlayerController}"""
+        # records the latency of paddle inputs, if set
+        self.inputLatency = None
+        """:type: InputLatency"""
+        # counts physics steps, so that a serve restored from a replay keyframe comes on the same step
+        self.timers = Scheduler()
+        self.seed = None
+        """:type: int"""
+        # physics steps since the start of the match
+        self.ticks = 0
+        self.serveTimer = None
+        """:type: Timer"""
+        self.serveScorer = None
+        """:type: int"""
+        self.recorder = None
+        """:type: ReplayRecorder"""
+
+        self.step = 1 / self.PHYSICS_RATE
+        self.accumulator = 0
+
+        def setPhysicsRate(rate):
+            self.step = 1 / (rate or self.PHYSICS_RATE)
+
+        config.subscribe('physicsRate', setPhysicsRate)
+
+        def clearKeyControllers(key):
+            self.keyControllers = None
+
+        for binding in ['p1up', 'p1down', 'p2up', 'p2down']:
+            config.subscribe(binding, clearKeyControllers)
+
+        def setSurfaceCacheSize(megabytes):
+            surfaceCache.setBudget(int((megabytes or SurfaceCache.BUDGET >> 20) * 2**20))
+
+        config.subscribe('surfaceCacheMB', setSurfaceCacheSize)
 
         self.mainMenu = None
         self.pauseMenu = None
+        self.audio = None
+        """:type: Audio"""
+
+        # a headless game has no display or menus, and is only driven through start() and update()
+        if headless:
+            return
 
         self.initVideo()
+        if startup:
+            startup.mark('asset load')
 
-        self.mainMenu = getMainMenu(self, config)
-        self.pauseMenu = getPauseMenu(self, config)
+        # show the table while the menus are built
+        self.screen.blit(self.image, (0, 0))
+        pygame.display.flip()
+        if startup:
+            startup.mark('first frame')
+
+        self.audio = Audio(self.SOUNDS)
+        self.ball.audio = self.audio
+        if startup:
+            startup.mark('audio load')
+
+        # both menus show the same options, which are entered from whichever menu is open
+        options = getOptions(self, config)
+        self.mainMenu = getMainMenu(self, config, options)
+        self.pauseMenu = getPauseMenu(self, config, options)
+        if startup:
+            startup.mark('menu build')
 
     def initVideo(self):
         flags = DOUBLEBUF | HWSURFACE
@@ -46,6 +183,8 @@ class Game:
         else:
             flags |= RESIZABLE
         self.screen = pygame.display.set_mode(self.config['resolution'], flags)
+        self.pendingSize = None
+        self.frame = None
 
         size = self.screen.get_size()
         for menu in [self.mainMenu, self.pauseMenu]:
@@ -55,6 +194,10 @@ class Game:
 
         gameArea = self.table.size
         screenArea = Rect(0, 0, 3, 2).fit(self.screen.get_rect())
+        # only sprites whose pixel size changed are rendered again; if the table only moved, they are only moved
+        rebuild = self.screenArea is None or screenArea.size != self.screenArea.size
+        moved = screenArea != self.screenArea
+        self.screenArea = screenArea
         PongSprite.viewport = Viewport(screenArea, gameArea)
 
         if screenArea.x > 0:
@@ -70,42 +213,156 @@ class Game:
         else:
             self.letterBoxes = []
 
-        self.image = pygame.Surface(size).convert()
-        self.image.fill(THECOLORS['black'])
-
-        self.table.initImage()
-        self.image.blit(self.table.image, self.table.rect)
+        if rebuild:
+            self.table.initImage()
+        elif moved:
+            self.table.updateRect()
+
+        def renderBackground() -> Surface:
+            image = pygame.Surface(size).convert()
+            image.fill(THECOLORS['black'])
+            image.blit(self.table.image, self.table.rect)
+            return image
+
+        self.image = surfaceCache.get(('background', tuple(screenArea)), size, THECOLORS['black'], 0, renderBackground)
+
+        if rebuild:
+            for s in self.sprites:
+                s.initImage()
+        elif moved:
+            # the score board moves its messages along with it
+            for s in [self.scoreBoard] + self.balls + self.paddles:
+                s.updateRect()
+
+        self.fullRedraw = True
+
+    def resize(self, size: (int, int)):
+        """
+        Rebuild the video for a new window size, once the size has not changed for RESIZE_SETTLE seconds. Until then,
+        frames are drawn at the old size and scaled to the window, so dragging the window edge stays smooth.
+        """
+        if self.frame is None:
+            self.frame = Surface(self.image.get_size()).convert()
+            self.screen = self.frame
+        self.pendingSize = size
+        self.resizeSettle = self.RESIZE_SETTLE
+        self.fullRedraw = True
+
+    def start(self, players: int, botTypes: (type, type)=(BotController, BotController), seed: int=None,
+              balls: int=None):
+        """
+        :param balls: Number of balls in play (the 'balls' setting if None)
+        """
+        self.stopRecording()
+        self.state = GameState.inGame
 
-        for s in self.sprites:
-            s.initImage()
+        # a match is reproducible from its seed and inputs
+        self.seed = seed if seed is not None else Random().getrandbits(32)
+        self.ball.seed(self.seed)
+        self.ticks = 0
 
-    def start(self, players: int):
-        self.state = GameState.inGame
+        self._setBallCount(balls or self.config['balls'] or 1)
 
-        for sprite in self.paddles + [self.ball, self.scoreBoard]:
+        for sprite in self.paddles + self.balls + [self.scoreBoard]:
             sprite.reset()
 
-        self.players = [PlayerController(self.paddles[0], self.config, 0)]
+        self.players = []
         self.bots = []
+        self.keyControllers = None
+        self.cancelTimers()
 
-        if players == 1:
-            self.bots.append(BotController(self.paddles[1], self.ball))
+        if players == 0:
+            self.bots.append(botTypes[0](self.paddles[0], self.ball))
+        else:
+            self.players.append(PlayerController(self.paddles[0], self.config, 0))
+
+        if players <= 1:
+            self.bots.append(botTypes[1](self.paddles[1], self.ball))
         elif players == 2:
             self.players.append(PlayerController(self.paddles[1], self.config, 1))
 
-        self.timers.append(Timer(3, self._serveBall))
+        self.scheduleServe()
+        interval = min(self.MULTIBALL_SERVE_INTERVAL, self.MULTIBALL_SERVE_TIME / len(self.balls))
+        for i, ball in enumerate(self.balls[1:], 1):
+            self.after(self.SERVE_DELAY + i*interval, ball.serve)
+
+        # replays only record a single ball
+        if self.config['replayFolder'] and len(self.balls) == 1:
+            fileName = '{}-{}.replay'.format(time.strftime('%Y%m%d-%H%M%S'), self.seed)
+            os.makedirs(self.config['replayFolder'], exist_ok=True)
+            self.recorder = ReplayRecorder(os.path.join(self.config['replayFolder'], fileName), self)
+
+    def stopRecording(self):
+        if self.recorder:
+            self.recorder.close(self)
+            self.recorder = None
+
+    def score(self, player: int, ball: Ball=None):
+        """
+        :param ball: Ball that scored, if not the first one
+        """
+        # in a multiball match, the balls still in play can reach a goal after the match is won
+        if self.scoreBoard.winner is not None:
+            return
 
-    def score(self, player: int):
         self.scoreBoard.score(player)
 
-        if self.scoreBoard.winner is None:
-            self.timers.append(Timer(3, lambda: self._serveBall(player)))
+        if self.scoreBoard.winner is not None:
+            # balls waiting to be served stay out of play
+            self.cancelTimers()
+        elif ball is None or ball is self.ball:
+            self.scheduleServe(player)
+        else:
+            direction = 1 if player == 0 else -1
+            self.after(self.SERVE_DELAY, lambda: ball.serve(direction))
+
+    def after(self, seconds: float, action) -> Timer:
+        """
+        Run an action once the match has been played for some more seconds, rounded up to whole physics steps.
+        """
+        # the tolerance keeps whole numbers of steps, such as remaining serve times from keyframes, from rounding up
+        steps = max(0, math.ceil(seconds / self.step - 1e-6))
+        return self.timers.schedule(steps, action)
+
+    def cancelTimers(self):
+        self.timers.clear()
+        self.serveTimer = None
+
+    def _setBallCount(self, count: int):
+        extraBalls = self.balls[1:]
+        if len(extraBalls) != count - 1:
+            self.sprites.remove(*extraBalls)
+            extraBalls = [Ball(self.table, [], self) for i in range(count - 1)]
+            for ball in extraBalls:
+                ball.audio = self.audio
+                if not self.headless:
+                    ball.initImage()
+            self.sprites.add(*extraBalls)
+        self.balls = [self.ball] + extraBalls
+
+        for i, ball in enumerate(extraBalls, 1):
+            ball.seed((self.seed + i) & 0xffffffff)
+
+        # a single ball tests both paddles, while multiple balls are given the paddles near them by the broadphase
+        self.ball.paddles = self.paddles if count == 1 else []
+
+    def scheduleServe(self, scoringPlayer: int=None, delay: float=SERVE_DELAY):
+        """
+        Serve the ball after a delay, toward the player who did not score (or a random player if None).
+        """
+        if self.serveTimer:
+            self.serveTimer.cancel()
+        self.serveTimer = self.after(delay, lambda: self._serveBall(scoringPlayer))
+        self.serveScorer = scoringPlayer
 
     def handle_event(self, event: EventType) -> bool:
         if event.type == VIDEORESIZE:
-            self.config['resolution'] = event.size
-            self.initVideo()
-            self.config.save()
+            self.resize(event.size)
+            return True
+
+        if event.type == VIDEOEXPOSE or event.type == WINDOWEXPOSED:
+            # the dirty rects only cover what changed since the last frame, not what the window system threw away
+            self.fullRedraw = True
             return True
 
         if self.state == GameState.inGame:
@@ -113,9 +370,8 @@ class Game:
                 self.state = GameState.pauseMenu
                 return True
 
-            for player in self.players:
-                if player.handle_event(event):
-                    return True
+            if event.type == KEYDOWN or event.type == KEYUP:
+                return self._handleKey(event.key, event.type == KEYDOWN)
 
         elif self.state == GameState.mainMenu:
             return self.mainMenu.handle_event(event)
@@ -124,23 +380,151 @@ class Game:
 
         return False
 
+    def savePositions(self):
+        """
+        Start the next physics step from the current positions of the paddles and balls.
+        """
+        for paddle in self.paddles:
+            paddle.savePos()
+        for ball in self.balls:
+            ball.savePos()
+
+    def _handleKey(self, key: int, pressed: bool) -> bool:
+        if self.keyControllers is None:
+            # in reverse, so that a key bound for both players goes to the first, as it would polling them in turn
+            self.keyControllers = {}
+            for player in reversed(self.players):
+                self.keyControllers[player.downKey] = player
+                self.keyControllers[player.upKey] = player
+
+        player = self.keyControllers.get(key)
+        if player is None:
+            return False
+
+        direction = player.paddle.direction
+        player.handle_key(key, pressed)
+        if self.inputLatency and player.paddle.direction != direction:
+            self.inputLatency.input(time.perf_counter(), self.ticks)
+        return True
+
+    def shown(self):
+        """
+        Called once the frame drawn last has been sent to the display.
+        """
+        if self.inputLatency:
+            if self.state == GameState.inGame:
+                self.inputLatency.shown(time.perf_counter(), self.ticks)
+            else:
+                self.inputLatency.cancel()
+
+    def advance(self, frameDelta: float):
+        """
+        Run the physics steps that fit in the time since the last frame, carrying over the remainder, and position the
+        sprites between the last two steps for drawing.
+        :param frameDelta: Seconds since the last frame
+        """
+        # clamp spikes (e.g. from dragging the window) so the game does not try to catch up all at once
+        self.accumulator += min(frameDelta, self.MAX_FRAME_TIME)
+        if self.audio:
+            self.audio.update(frameDelta)
+
+        if self.pendingSize is not None:
+            self.resizeSettle -= frameDelta
+            if self.resizeSettle <= 0:
+                self.config['resolution'] = self.pendingSize
+                self.initVideo()
+        while self.accumulator >= self.step:
+            self.update(self.step)
+            self.accumulator -= self.step
+
+        # only the paddles and balls move; the score board and its messages stay where they were placed
+        alpha = self.accumulator / self.step
+        for paddle in self.paddles:
+            paddle.interpolate(alpha)
+        for ball in self.balls:
+            ball.interpolate(alpha)
+
     def update(self, delta: float):
+        self.savePositions()
+
         if self.state == GameState.inGame:
-            for timer in self.timers:
-                timer.tick(delta)
-                if timer.isElapsed:
-                    self.timers.remove(timer)
+            if self.recorder:
+                self.recorder.beginStep(self)
+
+            self.timers.update(1)
 
             for bot in self.bots:
                 bot.update(delta)
 
+            if self.recorder:
+                self.recorder.recordInputs(self)
+
+            multiball = len(self.balls) > 1
+            if multiball:
+                self._findNearPaddles(delta)
             self.sprites.update(delta)
+            if multiball:
+                self._collideBalls()
+            self.ticks += 1
+
+            if self.recorder and self.scoreBoard.winner is not None:
+                self.stopRecording()
         elif self.state == GameState.mainMenu:
             self.mainMenu.update(delta)
         elif self.state == GameState.pauseMenu:
             self.pauseMenu.update(delta)
 
-    def draw(self):
+    def _findNearPaddles(self, delta: float):
+        """
+        Give each ball the paddles it could reach during a physics step.
+        """
+        grid = self.broadphase
+        grid.clear()
+        for paddle in self.paddles:
+            grid.insert(paddle, paddle.pos.x, paddle.pos.y, paddle.halfSize[0], paddle.halfSize[1])
+
+        for ball in self.balls:
+            # as far as the ball and a paddle moving toward each other can close in a step
+            reach = ball.radius + (abs(ball.vel.x) + abs(ball.vel.y) + Paddle.SPEED)*delta
+            ball.paddles.clear()
+            grid.query(ball.pos.x, ball.pos.y, reach, reach, ball.paddles)
+
+    def _collideBalls(self):
+        """
+        Bounce the balls in play off each other, testing each only against the balls in its broadphase cells.
+        """
+        grid = self.broadphase
+        grid.clear()
+        for ball in self.balls:
+            if ball.vel.x or ball.vel.y:
+                grid.insert(ball, ball.pos.x, ball.pos.y, ball.radius, ball.radius)
+
+        near = self._nearBalls
+        for ball in self.balls:
+            if ball.vel.x or ball.vel.y:
+                near.clear()
+                grid.query(ball.pos.x, ball.pos.y, ball.radius, ball.radius, near)
+                for other in near:
+                    # each pair once
+                    if id(other) > id(ball):
+                        ball.collideBall(other)
+
+    def draw(self) -> [Rect]:
+        """
+        Draw the current frame to the screen.
+        :return: Areas of the screen that changed, or None if the whole screen must be updated
+        """
+        # the dirty rect path is only used in game; menus, state transitions and resizing redraw everything
+        if self.config['dirtyRects'] and self.state == GameState.inGame and self.drawnState == self.state \
+                and not self.fullRedraw and self.frame is None:
+            self.screen.set_clip(self.screenArea)
+            dirty = self.sprites.drawChanged(self.screen, self.image)
+            self.screen.set_clip(None)
+            return dirty
+
+        self.drawnState = self.state
+        self.fullRedraw = False
+
         if self.state == GameState.quit:
             self.screen.fill(THECOLORS['black'])
         else:
@@ -156,7 +540,13 @@ class Game:
             for box in self.letterBoxes:
                 self.screen.fill(THECOLORS['black'], box)
 
+        if self.frame is not None:
+            display = pygame.display.get_surface()
+            pygame.transform.scale(self.frame, display.get_size(), display)
+        return None
+
     def _serveBall(self, scoringPlayer: int=None):
+        self.serveTimer = None
         self.scoreBoard.hideMessages()
 
         if scoringPlayer == 0:
@@ -168,25 +558,6 @@ class Game:
         self.ball.serve(direction)
 
 
-class Timer:
-    def __init__(self, timeoutSeconds: float, action):
-        self.timeoutSeconds = timeoutSeconds
-        self.remaining = timeoutSeconds
-        self.action = action
-
-    @property
-    def isElapsed(self):
-        return self.remaining <= 0
-
-    def tick(self, elapsedSeconds: float):
-        self.remaining -= elapsedSeconds
-        if self.isElapsed:
-            self.action()
-
-    def reset(self):
-        self.remaining = self.timeoutSeconds
-
-
 def createMenu(rootNode: MenuNode, screenSize: (int, int)) -> Menu:
     foreColor = THECOLORS['white']
     selectColor = (0, 0, 128)
@@ -194,12 +565,25 @@ def createMenu(rootNode: MenuNode, screenSize: (int, int)) -> Menu:
     borderColor = (255, 255, 255, 192)
     fadeColor = (128, 128, 128, 32)
 
-    menu = Menu(rootNode, pygame.font.Font(None, 36), foreColor, selectColor, backgroundColor, borderColor, fadeColor)
+    menu = Menu(rootNode, textCache.font(36), foreColor, selectColor, backgroundColor, borderColor, fadeColor)
     menu.midtop = (int(screenSize[0] / 2), int(screenSize[1] / 8))
 
     return menu
 
 
+_displayModes = None
+
+
+def displayModes() -> [(int, int)]:
+    """
+    Full screen display modes, largest first. They are enumerated once, since the driver is slow to list them.
+    """
+    global _displayModes
+    if _displayModes is None:
+        _displayModes = pygame.display.list_modes()
+    return _displayModes
+
+
 def getOptions(game: Game, conf: Config) -> MenuNode:
     options = MenuNode("Options", key=K_o)
 
@@ -228,7 +612,7 @@ def getOptions(game: Game, conf: Config) -> MenuNode:
         resolutionToSet = r
         apply.disabled = False
 
-    for res in pygame.display.list_modes():
+    for res in displayModes():
         node = RadioMenuNode("{}x{}".format(*res), lambda r=res: setRes(r))
         if fullscreen.checked:
             if res == conf['resolution']:
@@ -245,11 +629,10 @@ def getOptions(game: Game, conf: Config) -> MenuNode:
         nonlocal resolutionToSet
         # if switching to fullscreen without setting a resolution, automatically use best mode
         if fullscreenToSet and not conf['fullscreen'] and resolutionToSet == conf['resolution']:
-            resolutionToSet = pygame.display.list_modes()[0]
+            resolutionToSet = displayModes()[0]
         conf['fullscreen'] = fullscreenToSet
         conf['resolution'] = resolutionToSet
         game.initVideo()
-        conf.save()
         apply.disabled = True
 
     apply = MenuNode('Apply Changes', applyChanges, K_a)
@@ -272,21 +655,22 @@ def getOptions(game: Game, conf: Config) -> MenuNode:
     return options
 
 
-def getMainMenu(game: Game, conf: Config) -> Menu:
+def getMainMenu(game: Game, conf: Config, options: MenuNode) -> Menu:
     root = MenuNode("Super Pong 2015")
 
     newGame = MenuNode("New Game", key=K_n)
 
-    def play(players: int):
-        game.start(players)
+    def play(players: int, balls: int=None):
+        game.start(players, balls=balls)
         root.menu.reset()
 
     newGame.add(MenuNode("1 Player", lambda: play(1), K_1))
     newGame.add(MenuNode("2 Players", lambda: play(2), K_2))
+    newGame.add(MenuNode("Chaos", lambda: play(1, Game.CHAOS_BALLS), K_c))
 
     root.add(newGame)
 
-    root.add(getOptions(game, conf))
+    root.add(options)
 
     def exitGame():
         game.state = GameState.quit
@@ -296,7 +680,7 @@ def getMainMenu(game: Game, conf: Config) -> Menu:
     return createMenu(root, conf['resolution'])
 
 
-def getPauseMenu(game: Game, conf: Config) -> Menu:
+def getPauseMenu(game: Game, conf: Config, options: MenuNode) -> Menu:
     root = MenuNode("Game Paused")
 
     def resume():
@@ -304,9 +688,11 @@ def getPauseMenu(game: Game, conf: Config) -> Menu:
 
     root.add(MenuNode("Resume", resume, K_r))
 
-    root.add(getOptions(game, conf))
+    root.add(options)
 
     def endGame():
+        game.stopRecording()
+        game.cancelTimers()
         game.state = GameState.mainMenu
         root.menu.reset()
 
@@ -320,35 +706,100 @@ def getPauseMenu(game: Game, conf: Config) -> Menu:
     return createMenu(root, conf['resolution'])
 
 
+def defaultSettings() -> dict:
+    return {'p1up': K_w, 'p1down': K_s, 'p2up': K_UP, 'p2down': K_DOWN, 'resolution': (800, 600),
+            'physicsRate': Game.PHYSICS_RATE, 'maxFrameRate': 60,
+            'dirtyRects': False, 'replayFolder': 'replays', 'surfaceCacheMB': SurfaceCache.BUDGET >> 20, 'balls': 1}
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Play Super Pong.')
+    parser.add_argument('--startup-profile', action='store_true',
+                        help='print the time spent in each phase of startup')
+    args = parser.parse_args()
+
+    startup = StartupProfile(_importStart)
+    startup.mark('import')
+
     conf = Config('settings.config')
-    # default settings
-    conf.settings = {'p1up': K_w, 'p1down': K_s, 'p2up': K_UP, 'p2down': K_DOWN, 'resolution': (800, 600)}
+    conf.settings = defaultSettings()
     conf.load()
 
-    pygame.init()
-    game = Game(conf)
-
+    # only video is needed for the first frame; fonts and sound are initialized when they are first used
+    pygame.display.init()
     pygame.display.set_caption('Super Pong 2015')
+    # mouse motion, text input and the like are never used, so SDL drops them rather than queueing them for Python
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(Game.EVENT_TYPES)
+    startup.mark('init')
+
+    # decoded in the background while the game starts and the menus are shown
+    preloader = assets.preload(assets.read_manifest())
+
+    game = Game(conf, startup=startup)
+    if args.startup_profile:
+        print(startup.report())
+
     pygame.mouse.set_visible(False)
 
     clock = pygame.time.Clock()
+    hud = TimingHud()
+    game.inputLatency = hud.latency
 
     # game loop
     while game.state != GameState.quit:
-        delta = clock.tick(60) / 1000
+        delta = clock.tick(conf['maxFrameRate']) / 1000
+
+        if preloader:
+            preloader.update()
+
+        # phases are only timed while the timing overlay is shown
+        timing = hud.enabled
+        if timing:
+            start = time.perf_counter()
 
         for event in pygame.event.get():
             if event.type == QUIT or event.type == KEYDOWN and event.mod & KMOD_ALT and event.key == K_F4:
                 game.state = GameState.quit
                 break
 
+            if hud.handle_event(event):
+                game.fullRedraw = True
+                continue
+
             game.handle_event(event)
 
-        game.update(delta)
-        game.draw()
+        if timing:
+            evented = time.perf_counter()
 
-        pygame.display.flip()
+        game.advance(delta)
+
+        if timing:
+            updated = time.perf_counter()
+
+        dirty = game.draw()
+        if hud.enabled and game.state != GameState.quit:
+            # drawn on the display, as the game draws to a frame that is scaled to it while the window is resized
+            hudRect = hud.draw(pygame.display.get_surface())
+            if dirty is not None:
+                dirty.append(hudRect)
+
+        if timing:
+            drawn = time.perf_counter()
+
+        if dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        game.shown()
+
+        if timing:
+            flipped = time.perf_counter()
+            hud.record(delta, evented - start, updated - evented, drawn - updated, flipped - drawn)
+
+    game.stopRecording()
+    preloader.shutdown()
+    conf.flush()
 
 
 if __name__ == '__main__':
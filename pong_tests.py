@@ -0,0 +1,320 @@
+import unittest
+from unittest import TestCase
+import os
+from pong import *
+
+
+class GameTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+
+    def createGame(self, resolution: (int, int)=(800, 600), **settings) -> Game:
+        config = Config('')
+        config.settings = defaultSettings()
+        config.settings['replayFolder'] = None
+        config.settings['resolution'] = resolution
+        config.settings.update(settings)
+        return Game(config)
+
+
+class Game_draw_tests(GameTestCase):
+    def test_advance_messagesStayInPlace(self):
+        game = self.createGame()
+        game.start(0, seed=1)
+        game.score(0)
+        message = game.scoreBoard.scoreMessages[0]
+        rect = Rect(message.rect)
+
+        game.advance(1/60)
+
+        self.assertTrue(message.alive())
+        self.assertEqual(message.rect, rect)
+
+    def assertDirtyMatchesFull(self, game: Game, frames: int, actions: {int: callable}=None) -> int:
+        """
+        Advance and draw the game with dirty rects, checking every few frames that the screen is the same as after a
+        full redraw.
+        :param actions: Function to call before each of some frames
+        :return: Number of frames drawn with dirty rects
+        """
+        partial = 0
+        for i in range(frames):
+            if actions and i in actions:
+                actions[i]()
+            game.advance(1/60)
+            if game.draw() is not None:
+                partial += 1
+
+            if i % 10 == 9:
+                dirty = pygame.image.tobytes(game.screen, 'RGB')
+                game.fullRedraw = True
+                self.assertIsNone(game.draw())
+                self.assertEqual(pygame.image.tobytes(game.screen, 'RGB'), dirty, 'frame {}'.format(i))
+        return partial
+
+    def test_dirtyRects_movingSprites_matchFullRedraw(self):
+        game = self.createGame(dirtyRects=True)
+        game.draw()
+        game.start(0, seed=3)
+
+        partial = self.assertDirtyMatchesFull(game, 600)
+
+        self.assertGreater(partial, 500)
+
+    def test_dirtyRects_messagesShownAndHidden_matchFullRedraw(self):
+        game = self.createGame(dirtyRects=True)
+        game.draw()
+        game.start(0, seed=3)
+        messages = game.scoreBoard.scoreMessages
+
+        # the first message is hidden by the serve after SERVE_DELAY, and the second by the one after it
+        self.assertDirtyMatchesFull(game, 500, {5: lambda: game.score(0), 250: lambda: game.score(1)})
+
+        self.assertFalse(messages[0].alive())
+        self.assertFalse(messages[1].alive())
+        self.assertEqual(game.scoreBoard.scores, [1, 1])
+
+    def test_dirtyRects_resize_matchFullRedraw(self):
+        game = self.createGame(dirtyRects=True)
+        game.draw()
+        game.start(0, seed=3)
+
+        self.assertDirtyMatchesFull(game, 300, {20: lambda: game.resize((1000, 560))})
+
+        self.assertEqual(game.screen.get_size(), (1000, 560))
+
+    def test_dirtyRects_windowExposed_fullRedraw(self):
+        game = self.createGame(dirtyRects=True)
+        game.start(0, seed=3)
+        game.draw()
+        game.advance(1/60)
+        self.assertIsNotNone(game.draw())
+
+        self.assertTrue(game.handle_event(pygame.event.Event(WINDOWEXPOSED)))
+        game.advance(1/60)
+
+        self.assertIsNone(game.draw())
+        self.assertIn(WINDOWEXPOSED, Game.EVENT_TYPES)
+
+
+class Game_resize_tests(GameTestCase):
+    def setUp(self):
+        self.game = self.createGame()
+        self.game.start(0, seed=1)
+        # places the sprites, such as the ball waiting off the table to be served
+        self.game.advance(1/60)
+        self.rebuilds = 0
+        initVideo = self.game.initVideo
+
+        def countingInitVideo():
+            self.rebuilds += 1
+            initVideo()
+
+        self.game.initVideo = countingInitVideo
+
+    def resizeEvent(self, size: (int, int)):
+        self.game.handle_event(pygame.event.Event(VIDEORESIZE, size=size, w=size[0], h=size[1]))
+
+    def test_resizeBurst_rebuiltOnceSettled(self):
+        for width in range(800, 1000, 10):
+            self.resizeEvent((width, 700))
+            self.game.advance(Game.RESIZE_SETTLE / 4)
+        self.assertEqual(self.rebuilds, 0)
+        self.assertEqual(self.game.screen.get_size(), (800, 600))
+
+        self.game.advance(Game.RESIZE_SETTLE)
+
+        self.assertEqual(self.rebuilds, 1)
+        self.assertEqual(self.game.screen.get_size(), (990, 700))
+        self.assertEqual(self.game.config['resolution'], (990, 700))
+        self.assertIsNone(self.game.frame)
+
+        self.game.advance(Game.RESIZE_SETTLE * 2)
+        self.assertEqual(self.rebuilds, 1)
+
+    def test_sameSize_nothingRendered(self):
+        sprites = [self.game.table, self.game.scoreBoard, self.game.ball] + self.game.paddles
+        images = [sprite.image for sprite in sprites]
+        rects = [Rect(sprite.rect) for sprite in sprites]
+
+        self.resizeEvent((800, 600))
+        self.game.advance(Game.RESIZE_SETTLE * 2)
+
+        self.assertEqual(self.rebuilds, 1)
+        self.assertEqual([sprite.image for sprite in sprites], images)
+        self.assertEqual([sprite.rect for sprite in sprites], rects)
+
+    def assertMessagesPlaced(self):
+        viewport = PongSprite.viewport
+        scoreBoard = self.game.scoreBoard
+        self.assertEqual(scoreBoard.scoreMessages[0].rect.topleft, viewport.getScreenPos((-0.55, 0.4)))
+        self.assertEqual(scoreBoard.winnerMessages[1].rect.topright, viewport.getScreenPos((0.55, 0.4)))
+        self.assertEqual(scoreBoard.prepareMessage.rect.center, viewport.getScreenPos((0, 0)))
+
+    def test_tableMoved_messagesMoved(self):
+        self.game.score(0)
+        message = self.game.scoreBoard.scoreMessages[0]
+        image = message.image
+        oldRect = Rect(message.rect)
+
+        # the same table size, further down
+        self.resizeEvent((800, 700))
+        self.game.advance(Game.RESIZE_SETTLE * 2)
+
+        self.assertIs(message.image, image)
+        self.assertEqual(message.rect.topleft, (oldRect.x, oldRect.y + 50))
+        self.assertTrue(message.alive())
+        self.assertMessagesPlaced()
+
+    def test_tableResized_messagesPlaced(self):
+        self.game.score(0)
+
+        self.resizeEvent((1200, 900))
+        self.game.advance(Game.RESIZE_SETTLE * 2)
+
+        self.assertTrue(self.game.scoreBoard.scoreMessages[0].alive())
+        self.assertMessagesPlaced()
+
+
+class Game_advance_tests(TestCase):
+    def createGame(self, seed: int) -> Game:
+        game = Game(Config(''), headless=True)
+        game.start(1, seed=seed)
+        return game
+
+    @staticmethod
+    def play(game: Game, frames: [float]):
+        for i, frame in enumerate(frames):
+            # stand in for a player changing direction now and then
+            game.paddles[0].direction = [1, 0, -1][i // 40 % 3]
+            game.advance(frame)
+
+    @staticmethod
+    def state(game: Game):
+        return (tuple(game.ball.pos), tuple(game.ball.vel), tuple(p.pos.y for p in game.paddles),
+                tuple(game.scoreBoard.scores), game.ticks)
+
+    def test_sameSeedAndInputs_identical(self):
+        # uneven frame times, which are split into fixed steps the same way
+        frames = [(1/60, 1/144, 1/30, 0.021)[i % 4] for i in range(2000)]
+        games = [self.createGame(42), self.createGame(42)]
+        for game in games:
+            self.play(game, frames)
+
+        self.assertGreater(games[0].ball.rallyHits + sum(games[0].scoreBoard.scores), 0)
+        self.assertEqual(self.state(games[0]), self.state(games[1]))
+
+    def test_otherSeed_differs(self):
+        frames = [1/60] * 600
+        games = [self.createGame(42), self.createGame(43)]
+        for game in games:
+            self.play(game, frames)
+
+        self.assertNotEqual(self.state(games[0]), self.state(games[1]))
+
+    def test_longFrame_clamped(self):
+        game = self.createGame(1)
+
+        game.advance(5)
+
+        self.assertEqual(game.ticks, round(Game.MAX_FRAME_TIME / game.step))
+
+    def test_fractionalFrame_carriedOver(self):
+        game = self.createGame(1)
+
+        game.advance(game.step * 1.5)
+        self.assertEqual(game.ticks, 1)
+        self.assertAlmostEqual(game.accumulator, game.step * 0.5)
+
+        game.advance(game.step * 0.75)
+        self.assertEqual(game.ticks, 2)
+        self.assertAlmostEqual(game.accumulator, game.step * 0.25)
+
+
+class Game_multiball_tests(TestCase):
+    def test_start_servesEveryBall(self):
+        game = Game(Config(''), headless=True)
+        game.start(0, seed=3, balls=12)
+        for i in range(int((game.SERVE_DELAY + game.MULTIBALL_SERVE_TIME) / game.step) + 2):
+            game.update(game.step)
+
+        self.assertEqual(len(game.balls), 12)
+        self.assertEqual(len(set(ball.matchSeed for ball in game.balls)), 12)
+        self.assertTrue(all(ball.serves == 1 for ball in game.balls))
+
+    def test_update_ballsStayOnTable(self):
+        game = Game(Config(''), headless=True)
+        game.start(0, seed=5, balls=30)
+        for i in range(int(20 / game.step)):
+            game.update(game.step)
+            for ball in game.balls:
+                self.assertLessEqual(abs(ball.pos.y), game.table.innerSize.y/2)
+
+    def test_win_cancelsPendingServes(self):
+        game = Game(Config(''), headless=True)
+        game.start(0, seed=3, balls=4)
+        self.assertEqual(len(game.timers), 4)
+
+        for i in range(ScoreBoard.SCORE_LIMIT):
+            game.score(0)
+
+        self.assertEqual(game.scoreBoard.winner, 0)
+        self.assertEqual(len(game.timers), 0)
+        self.assertIsNone(game.serveTimer)
+
+    def test_start_singleBallAfterMultiball_testsAllPaddles(self):
+        game = Game(Config(''), headless=True)
+        game.start(0, seed=3, balls=4)
+        game.start(0, seed=3)
+
+        self.assertEqual(game.balls, [game.ball])
+        self.assertIs(game.ball.paddles, game.paddles)
+
+
+class Game_input_tests(TestCase):
+    def setUp(self):
+        self.config = Config('')
+        self.config.settings = {'p1up': K_w, 'p1down': K_s, 'p2up': K_UP, 'p2down': K_DOWN}
+        self.game = Game(self.config, headless=True)
+        self.game.start(2, seed=1)
+
+    def key(self, type: int, key: int) -> bool:
+        return self.game.handle_event(pygame.event.Event(type, key=key, mod=0))
+
+    def test_keys_routedToPlayers(self):
+        self.assertTrue(self.key(KEYDOWN, K_w))
+        self.assertTrue(self.key(KEYDOWN, K_DOWN))
+        self.assertFalse(self.key(KEYDOWN, K_a))
+
+        self.assertEqual(self.game.paddles[0].direction, 1)
+        self.assertEqual(self.game.paddles[1].direction, -1)
+
+        self.key(KEYUP, K_w)
+        self.assertEqual(self.game.paddles[0].direction, 0)
+
+    def test_rebound_routesNewKey(self):
+        self.key(KEYDOWN, K_w)
+        self.key(KEYUP, K_w)
+
+        self.config['p1up'] = K_e
+
+        self.assertFalse(self.key(KEYDOWN, K_w))
+        self.assertTrue(self.key(KEYDOWN, K_e))
+        self.assertEqual(self.game.paddles[0].direction, 1)
+
+    def test_inputLatency_recordedOnceStepped(self):
+        self.game.inputLatency = InputLatency()
+
+        self.key(KEYDOWN, K_w)
+        self.game.shown()
+        self.assertEqual(self.game.inputLatency.count, 0)
+
+        self.game.update(self.game.step)
+        self.game.shown()
+        self.assertEqual(self.game.inputLatency.count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,421 @@
+import math
+import mmap
+import struct
+from controllers import BotController, loadController, controllerName
+
+# File layout (little-endian):
+#   header, then for each paddle the length and name of its bot's class (empty for a player)
+#   records, each starting with a tag byte and a varint count of ticks since the previous record:
+#     input:    tag = paddle << 2 | (direction + 1), recorded for players only (bots are simulated again in playback)
+#     keyframe: tag = KEYFRAME_TAG, followed by the full game state at the start of that tick, then for each paddle
+#               the count and values of its bot's state
+#     end:      tag = END_TAG
+#   keyframe index: count, then (tick, offset) for each keyframe
+#   footer
+_HEADER = struct.Struct('<4sBHq')
+_KEYFRAME = struct.Struct('<I4dBHdH2d2b2Bdb')
+_BOT_STATE_COUNT = struct.Struct('<B')
+_INDEX_COUNT = struct.Struct('<I')
+_INDEX_ENTRY = struct.Struct('<IQ')
+_FOOTER = struct.Struct('<QI4s')
+
+_MAGIC = b'SPRP'
+_END_MAGIC = b'SPRE'
+# 2: serves come after a whole number of physics steps
+_VERSION = 2
+KEYFRAME_TAG = 0x80
+END_TAG = 0xFF
+
+
+class Keyframe:
+    """
+    Full state of a match at the start of a physics step.
+    """
+    def __init__(self, tick: int, ballPos: (float, float), ballVel: (float, float), speedupHits: int, rallyHits: int,
+                 collisionTimeout: float, serves: int, paddleYs: (float, float), directions: (int, int),
+                 scores: (int, int), serveRemaining: float, serveScorer: int, botStates: [(float, ...)]):
+        self.tick = tick
+        self.ballPos = ballPos
+        self.ballVel = ballVel
+        self.speedupHits = speedupHits
+        self.rallyHits = rallyHits
+        self.collisionTimeout = collisionTimeout
+        self.serves = serves
+        self.paddleYs = paddleYs
+        self.directions = directions
+        self.scores = scores
+        # NaN when no serve is pending
+        self.serveRemaining = serveRemaining
+        # None for the first serve of the match
+        self.serveScorer = serveScorer
+        # state of each paddle's bot, from its getState method (empty for players and stateless bots)
+        self.botStates = botStates
+
+    @staticmethod
+    def capture(game):
+        """
+        :type game: pong.Game
+        :rtype: Keyframe
+        """
+        ball = game.ball
+        # the game's timers count physics steps
+        serveRemaining = game.serveTimer.remaining * game.step if game.serveTimer else math.nan
+        serveScorer = game.serveScorer if game.serveTimer else None
+        botStates = []
+        for bot in _paddleBots(game):
+            botStates.append(tuple(bot.getState()) if hasattr(bot, 'getState') else ())
+        return Keyframe(game.ticks, tuple(ball.pos), tuple(ball.vel), ball.speedupHits, ball.rallyHits,
+                        ball.collisionTimeout, ball.serves, tuple(p.pos.y for p in game.paddles),
+                        tuple(p.direction for p in game.paddles), tuple(game.scoreBoard.scores), serveRemaining,
+                        serveScorer, botStates)
+
+    def restore(self, game):
+        """
+        :type game: pong.Game
+        """
+        game.ticks = self.tick
+
+        ball = game.ball
+        ball.pos.update(self.ballPos)
+        ball.vel.update(self.ballVel)
+        ball.speedupHits = self.speedupHits
+        ball.rallyHits = self.rallyHits
+        ball.collisionTimeout = self.collisionTimeout
+
+        # bring the serve RNG to the same point: the first serve of a match goes to a random side, later ones to the
+        # side that lost the point, which only draws the angle
+        ball.seed(game.seed)
+        for i in range(self.serves):
+            ball.serveAngle(0 if i == 0 else 1)
+        ball.serves = self.serves
+
+        for paddle, y, direction in zip(game.paddles, self.paddleYs, self.directions):
+            paddle.pos.y = y
+            paddle.direction = direction
+
+        game.scoreBoard.restore(self.scores)
+
+        game.cancelTimers()
+        if not math.isnan(self.serveRemaining):
+            game.scheduleServe(self.serveScorer, self.serveRemaining)
+
+        for bot, state in zip(_paddleBots(game), self.botStates):
+            if state:
+                bot.setState(state)
+
+        game.savePositions()
+
+    def pack(self) -> bytes:
+        data = _KEYFRAME.pack(self.tick, *self.ballPos, *self.ballVel, self.speedupHits, self.rallyHits,
+                              self.collisionTimeout, self.serves, *self.paddleYs, *self.directions, *self.scores,
+                              self.serveRemaining, -1 if self.serveScorer is None else self.serveScorer)
+        for state in self.botStates:
+            data += _BOT_STATE_COUNT.pack(len(state)) + struct.pack('<{}d'.format(len(state)), *state)
+        return data
+
+    @staticmethod
+    def unpack_from(buffer, offset: int):
+        """
+        :return: Tuple (keyframe, offset after the keyframe)
+        :rtype: (Keyframe, int)
+        """
+        (tick, posX, posY, velX, velY, speedupHits, rallyHits, collisionTimeout, serves, y0, y1, d0, d1, s0, s1,
+         serveRemaining, serveScorer) = _KEYFRAME.unpack_from(buffer, offset)
+        offset += _KEYFRAME.size
+
+        botStates = []
+        for i in range(2):
+            count, = _BOT_STATE_COUNT.unpack_from(buffer, offset)
+            offset += _BOT_STATE_COUNT.size
+            botStates.append(struct.unpack_from('<{}d'.format(count), buffer, offset))
+            offset += count*8
+
+        keyframe = Keyframe(tick, (posX, posY), (velX, velY), speedupHits, rallyHits, collisionTimeout, serves,
+                            (y0, y1), (d0, d1), (s0, s1), serveRemaining, None if serveScorer < 0 else serveScorer,
+                            botStates)
+        return keyframe, offset
+
+
+class ReplayRecorder:
+    """
+    Records a match as its seed, its bot classes and every change of direction of player-controlled paddles, with a
+    keyframe of the full state every KEYFRAME_SECONDS so playback can seek without simulating from the start. Bots are
+    deterministic, so playback simulates them again rather than recording their moves; bots with state must provide
+    getState and setState methods for keyframes.
+    """
+    KEYFRAME_SECONDS = 10
+
+    def __init__(self, filePath: str, game):
+        """
+        :param game: Game that has just been started
+        :type game: pong.Game
+        """
+        physicsRate = round(1 / game.step)
+        self.file = open(filePath, 'wb')
+        self.file.write(_HEADER.pack(_MAGIC, _VERSION, physicsRate, game.seed))
+        for bot in _paddleBots(game):
+            name = controllerName(type(bot)).encode() if bot else b''
+            self.file.write(bytes((len(name),)) + name)
+
+        self.keyframeInterval = self.KEYFRAME_SECONDS * physicsRate
+        self.keyframes = []
+        self.lastTick = 0
+        self.recorded = [bot is None for bot in _paddleBots(game)]
+        self.directions = [0, 0]
+
+    def beginStep(self, game):
+        """
+        Called by the game at the start of each physics step.
+        :type game: pong.Game
+        """
+        if game.ticks % self.keyframeInterval == 0:
+            self.keyframes.append((game.ticks, self.file.tell()))
+            self._writeRecord(KEYFRAME_TAG, game.ticks)
+            self.file.write(Keyframe.capture(game).pack())
+
+    def recordInputs(self, game):
+        """
+        Called by the game once players and bots have set the paddle directions for the step.
+        :type game: pong.Game
+        """
+        for i, paddle in enumerate(game.paddles):
+            if self.recorded[i] and paddle.direction != self.directions[i]:
+                self.directions[i] = paddle.direction
+                self._writeRecord(i << 2 | (paddle.direction + 1), game.ticks)
+
+    def close(self, game):
+        """
+        :type game: pong.Game
+        """
+        self._writeRecord(END_TAG, game.ticks)
+
+        indexOffset = self.file.tell()
+        self.file.write(_INDEX_COUNT.pack(len(self.keyframes)))
+        for entry in self.keyframes:
+            self.file.write(_INDEX_ENTRY.pack(*entry))
+        self.file.write(_FOOTER.pack(indexOffset, game.ticks, _END_MAGIC))
+        self.file.close()
+
+    def _writeRecord(self, tag: int, tick: int):
+        self.file.write(bytes((tag,)) + _encodeVarint(tick - self.lastTick))
+        self.lastTick = tick
+
+
+class ReplayReader:
+    """
+    Reads a replay file through a memory map, decoding only the parts that are accessed.
+    """
+    def __init__(self, filePath: str):
+        self.file = open(filePath, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.physicsRate, self.seed = _HEADER.unpack_from(self.data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('Not a supported replay file: ' + filePath)
+
+        # bot class name for each paddle, or None for players
+        self.bots = []
+        offset = _HEADER.size
+        for i in range(2):
+            length = self.data[offset]
+            name = self.data[offset + 1:offset + 1 + length].decode()
+            self.bots.append(name or None)
+            offset += 1 + length
+
+        indexOffset, self.endTick, endMagic = _FOOTER.unpack_from(self.data, len(self.data) - _FOOTER.size)
+        if endMagic != _END_MAGIC:
+            raise ValueError('Incomplete replay file: ' + filePath)
+        self.keyframeCount, = _INDEX_COUNT.unpack_from(self.data, indexOffset)
+        self._indexStart = indexOffset + _INDEX_COUNT.size
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def keyframeEntry(self, i: int) -> (int, int):
+        """
+        :return: Tuple (tick, offset) of the i-th keyframe record
+        """
+        return _INDEX_ENTRY.unpack_from(self.data, self._indexStart + i*_INDEX_ENTRY.size)
+
+    def findKeyframe(self, tick: int) -> (int, int):
+        """
+        Get the last keyframe at or before a tick.
+        :return: Tuple (tick, offset) of the keyframe record
+        """
+        low, high = 0, self.keyframeCount - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.keyframeEntry(mid)[0] <= tick:
+                low = mid
+            else:
+                high = mid - 1
+        return self.keyframeEntry(low)
+
+    def records(self, offset: int, tick: int):
+        """
+        Decode records starting at a keyframe record.
+        :param offset: File offset of a keyframe record
+        :param tick: Tick of that keyframe
+        :return: Generator of (tick, tag, keyframe) tuples, where keyframe is None except for keyframe records
+        """
+        data = self.data
+        # the keyframe's own tick delta is relative to the record before it
+        offset = _skipVarint(data, offset + 1)
+        tag = KEYFRAME_TAG
+        while True:
+            if tag == KEYFRAME_TAG:
+                keyframe, offset = Keyframe.unpack_from(data, offset)
+                yield tick, tag, keyframe
+            else:
+                yield tick, tag, None
+            if tag == END_TAG:
+                return
+
+            tag = data[offset]
+            delta, offset = _decodeVarint(data, offset + 1)
+            tick += delta
+
+
+class ReplayPlayer:
+    """
+    Drives a game from a replay: restores keyframes to seek, applies the recorded player inputs, and runs the recorded
+    bot classes.
+    """
+    def __init__(self, game, reader: ReplayReader):
+        """
+        :type game: pong.Game
+        """
+        self.game = game
+        self.reader = reader
+        self._records = None
+        self._next = None
+
+        game.config['physicsRate'] = reader.physicsRate
+        botTypes = [loadController(name) if name else BotController for name in reader.bots]
+        game.start(0, botTypes, reader.seed)
+        # players' paddles are driven by this instead of a bot
+        game.players = []
+        game.bots = [self] + [bot for bot, name in zip(game.bots, reader.bots) if name]
+        self.seek(0)
+
+    @property
+    def finished(self) -> bool:
+        return self.game.ticks >= self.reader.endTick
+
+    def seek(self, tick: int):
+        """
+        Restore the nearest keyframe at or before a tick, then simulate forward to it.
+        """
+        tick = max(0, min(tick, self.reader.endTick))
+        keyframeTick, offset = self.reader.findKeyframe(tick)
+        self._records = self.reader.records(offset, keyframeTick)
+        keyframe = next(self._records)[2]
+        keyframe.restore(self.game)
+        self._next = next(self._records, None)
+
+        while self.game.ticks < tick:
+            self.game.update(self.game.step)
+
+    def update(self, delta: float):
+        ticks = self.game.ticks
+        while self._next is not None and self._next[0] <= ticks:
+            tick, tag, keyframe = self._next
+            if tag < KEYFRAME_TAG:
+                self.game.paddles[tag >> 2].direction = (tag & 3) - 1
+            self._next = next(self._records, None)
+
+
+def _paddleBots(game) -> list:
+    """
+    Get the bot controlling each paddle of a game, or None for paddles without one.
+    :type game: pong.Game
+    """
+    bots = {bot.paddle: bot for bot in game.bots if hasattr(bot, 'paddle')}
+    return [bots.get(paddle) for paddle in game.paddles]
+
+
+def _encodeVarint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _decodeVarint(data, offset: int) -> (int, int):
+    """
+    :return: Tuple (value, offset after the varint)
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _skipVarint(data, offset: int) -> int:
+    while data[offset] >= 0x80:
+        offset += 1
+    return offset + 1
+
+
+def main():
+    import argparse
+    import pygame
+    from pygame.locals import QUIT, KEYDOWN, K_ESCAPE, K_LEFT, K_RIGHT, K_SPACE
+    from pong import Game, defaultSettings
+    from config import Config, load
+
+    parser = argparse.ArgumentParser(description='Play back a recorded match.')
+    parser.add_argument('file')
+    parser.add_argument('--seconds', type=float, default=0, help='time to start playback at')
+    args = parser.parse_args()
+
+    reader = ReplayReader(args.file)
+
+    # the game's settings, which the viewer does not save its changes to
+    conf = Config('')
+    conf.settings = defaultSettings()
+    conf.settings.update(load('settings.config'))
+    conf['replayFolder'] = None
+
+    pygame.init()
+    game = Game(conf)
+    pygame.display.set_caption('Super Pong 2015 Replay')
+    player = ReplayPlayer(game, reader)
+    player.seek(int(args.seconds * reader.physicsRate))
+
+    clock = pygame.time.Clock()
+    paused = False
+    seekTicks = 5 * reader.physicsRate
+    running = True
+    while running:
+        delta = clock.tick(conf['maxFrameRate']) / 1000
+
+        for event in pygame.event.get():
+            if event.type == QUIT or event.type == KEYDOWN and event.key == K_ESCAPE:
+                running = False
+            elif event.type == KEYDOWN and event.key == K_SPACE:
+                paused = not paused
+            elif event.type == KEYDOWN and event.key == K_LEFT:
+                player.seek(game.ticks - seekTicks)
+            elif event.type == KEYDOWN and event.key == K_RIGHT:
+                player.seek(game.ticks + seekTicks)
+
+        if not paused and not player.finished:
+            game.advance(delta)
+        game.fullRedraw = True
+        game.draw()
+        pygame.display.flip()
+
+    reader.close()
+
+
+if __name__ == '__main__':
+    main()
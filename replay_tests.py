@@ -0,0 +1,73 @@
+import unittest
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+from replay import *
+from pong import Game
+from config import Config
+from controllers import PredictiveBotController
+
+
+class replay_tests(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def recordMatch(self, players: int, maxTicks: int, snapshotTicks: [int]) -> (str, dict):
+        config = Config('')
+        config['replayFolder'] = self.folder
+        game = Game(config, headless=True)
+        game.start(players, (PredictiveBotController, PredictiveBotController), seed=1234)
+        filePath = game.recorder.file.name
+
+        snapshots = {}
+        while game.recorder and game.ticks < maxTicks:
+            # stand in for a player pressing keys
+            if players and game.ticks % 50 == 0:
+                game.paddles[0].direction = [1, 0, -1, 0][game.ticks // 50 % 4]
+            if game.ticks in snapshotTicks:
+                snapshots[game.ticks] = self.state(game)
+            game.update(game.step)
+        snapshots['end'] = self.state(game)
+        game.stopRecording()
+        return filePath, snapshots
+
+    @staticmethod
+    def state(game: Game):
+        keyframe = Keyframe.capture(game)
+        keyframe.serveRemaining = repr(keyframe.serveRemaining)
+        keyframe.botStates = [tuple(map(float, s)) for s in keyframe.botStates]
+        return vars(keyframe)
+
+    def test_playback_matchesRecording(self):
+        filePath, snapshots = self.recordMatch(1, 6000, [])
+        reader = ReplayReader(filePath)
+        game = Game(Config(''), headless=True)
+        player = ReplayPlayer(game, reader)
+        while not player.finished:
+            game.update(game.step)
+        self.assertEqual(snapshots['end'], self.state(game))
+        reader.close()
+
+    def test_seek_matchesRecording(self):
+        ticks = [1, 1199, 1200, 1201, 3333, 4999]
+        filePath, snapshots = self.recordMatch(1, 6000, ticks)
+        reader = ReplayReader(filePath)
+        game = Game(Config(''), headless=True)
+        player = ReplayPlayer(game, reader)
+        for tick in reversed(ticks):
+            player.seek(tick)
+            self.assertEqual(snapshots[tick], self.state(game))
+        reader.close()
+
+    def test_botMatch_noInputsRecorded(self):
+        filePath, snapshots = self.recordMatch(0, 1200, [])
+        # header, one keyframe, the end record, index and footer
+        self.assertLess(os.path.getsize(filePath), 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import heapq
+import itertools
+
+
+class Timer:
+    """
+    Handle of an action scheduled on a Scheduler, through which it can be cancelled.
+    """
+    __slots__ = ('scheduler', 'deadline', 'interval', 'action', 'active')
+
+    def __init__(self, scheduler, deadline: float, action, interval: float=None):
+        """
+        :type scheduler: Scheduler
+        """
+        self.scheduler = scheduler
+        self.deadline = deadline
+        self.interval = interval
+        self.action = action
+        # until a single action has run or the timer is cancelled
+        self.active = True
+
+    @property
+    def remaining(self) -> float:
+        """
+        Time until the action is next due, on the scheduler's clock.
+        """
+        return self.deadline - self.scheduler.time
+
+    def cancel(self):
+        if self.active:
+            self.active = False
+            self.scheduler._cancelled()
+
+
+class Scheduler:
+    """
+    Runs actions when a clock reaches their deadlines. The clock only moves when update is called, so it can count
+    seconds or physics steps, and a scheduler updated from the game's physics step pauses with the game.
+
+    Deadlines are kept in a min-heap, so an update that runs nothing only compares the clock with the earliest deadline.
+    Cancelled timers stay in the heap and are skipped when they come due, until they make up most of it.
+    """
+    def __init__(self):
+        self.time = 0
+        # entries of (deadline, order scheduled, timer); the order runs actions that are due together in the order they
+        # were scheduled, and keeps timers themselves from being compared
+        self._heap = []
+        self._order = itertools.count()
+        self._cancelledCount = 0
+
+    def __len__(self):
+        return len(self._heap) - self._cancelledCount
+
+    def schedule(self, delay: float, action, interval: float=None) -> Timer:
+        """
+        :param delay: Time from now until the action is due
+        :param action: Function to call without arguments
+        :param interval: Time between repeats of the action, or None to run it once
+        """
+        timer = Timer(self, self.time + delay, action, interval)
+        heapq.heappush(self._heap, (timer.deadline, next(self._order), timer))
+        return timer
+
+    def update(self, delta: float):
+        """
+        Advance the clock and run the actions that have come due, in order of their deadlines.
+        """
+        self.time += delta
+        heap = self._heap
+        while heap and heap[0][0] <= self.time:
+            timer = heapq.heappop(heap)[2]
+            if not timer.active:
+                self._cancelledCount -= 1
+                continue
+
+            if timer.interval is None:
+                timer.active = False
+            else:
+                # repeats missed by a long update are skipped rather than run in a burst
+                timer.deadline += timer.interval
+                if timer.deadline <= self.time:
+                    timer.deadline = self.time + timer.interval
+                heapq.heappush(heap, (timer.deadline, next(self._order), timer))
+            timer.action()
+
+    def clear(self):
+        """
+        Cancel every timer.
+        """
+        for entry in self._heap:
+            entry[2].active = False
+        self._heap.clear()
+        self._cancelledCount = 0
+
+    def _cancelled(self):
+        self._cancelledCount += 1
+        heap = self._heap
+        if self._cancelledCount > len(heap) // 2:
+            heap[:] = [entry for entry in heap if entry[2].active]
+            heapq.heapify(heap)
+            self._cancelledCount = 0
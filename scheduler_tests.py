@@ -0,0 +1,111 @@
+import unittest
+from unittest import TestCase
+from testutil import traceAllocations
+from scheduler import *
+
+
+class Scheduler_tests(TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.ran = []
+
+    def schedule(self, delay: float, name: str, interval: float=None) -> Timer:
+        return self.scheduler.schedule(delay, lambda: self.ran.append(name), interval)
+
+    def test_update_runsDueActionsInDeadlineOrder(self):
+        self.schedule(3, 'c')
+        self.schedule(1, 'a')
+        self.schedule(2, 'b')
+
+        self.scheduler.update(1.5)
+        self.assertEqual(self.ran, ['a'])
+
+        self.scheduler.update(2)
+        self.assertEqual(self.ran, ['a', 'b', 'c'])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_update_sameDeadline_runsInScheduledOrder(self):
+        for name in 'abcde':
+            self.schedule(1, name)
+
+        self.scheduler.update(1)
+
+        self.assertEqual(self.ran, list('abcde'))
+
+    def test_cancel_notRun(self):
+        self.schedule(1, 'a')
+        timer = self.schedule(1, 'b')
+
+        timer.cancel()
+        self.scheduler.update(1)
+
+        self.assertEqual(self.ran, ['a'])
+        self.assertFalse(timer.active)
+
+    def test_cancel_fromAction(self):
+        later = self.schedule(2, 'later')
+        self.scheduler.schedule(1, later.cancel)
+
+        self.scheduler.update(3)
+
+        self.assertEqual(self.ran, [])
+
+    def test_cancel_most_heapCompacted(self):
+        timers = [self.schedule(i, str(i)) for i in range(10)]
+
+        for timer in timers[:6]:
+            timer.cancel()
+
+        self.assertEqual(len(self.scheduler), 4)
+        self.assertLessEqual(len(self.scheduler._heap), 5)
+        self.scheduler.update(10)
+        self.assertEqual(self.ran, ['6', '7', '8', '9'])
+
+    def test_interval_repeats(self):
+        timer = self.schedule(1, 'a', 0.5)
+
+        self.scheduler.update(1)
+        self.scheduler.update(0.25)
+        self.scheduler.update(0.25)
+
+        self.assertEqual(self.ran, ['a', 'a'])
+        self.assertEqual(timer.remaining, 0.5)
+        self.assertTrue(timer.active)
+
+    def test_interval_longUpdate_missedRepeatsSkipped(self):
+        timer = self.schedule(1, 'a', 0.5)
+
+        self.scheduler.update(3)
+
+        self.assertEqual(self.ran, ['a'])
+        self.assertEqual(timer.remaining, 0.5)
+
+    def test_remaining(self):
+        timer = self.schedule(3, 'a')
+
+        self.scheduler.update(1)
+
+        self.assertEqual(timer.remaining, 2)
+
+    def test_clear_cancelsAll(self):
+        timers = [self.schedule(1, 'a'), self.schedule(2, 'b', 1)]
+
+        self.scheduler.clear()
+        self.scheduler.update(5)
+
+        self.assertEqual(self.ran, [])
+        self.assertFalse(any(timer.active for timer in timers))
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_update_nothingDue_noAllocations(self):
+        for i in range(100):
+            self.schedule(2000 + i, 'a')
+        # past the integers Python caches, so each update replaces an integer like a long match does
+        self.scheduler.update(500)
+
+        net, peak = traceAllocations(lambda: self.scheduler.update(1), 500)
+        self.assertEqual(net, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
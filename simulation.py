@@ -0,0 +1,77 @@
+from pong import Game
+from controllers import BotController
+from config import Config
+
+
+class MatchResult:
+    def __init__(self, seed: int, scores: [int], winner: int, gameTime: float, steps: int, rallies: [int]):
+        self.seed = seed
+        self.scores = scores
+        self.winner = winner
+        """:type: int"""
+        self.gameTime = gameTime
+        self.steps = steps
+        # number of paddle hits before each point
+        self.rallies = rallies
+
+    def __repr__(self):
+        return 'MatchResult(seed={}, scores={}, winner={}, gameTime={:.2f}, steps={})'.format(
+            self.seed, self.scores, self.winner, self.gameTime, self.steps)
+
+
+class Simulation:
+    """
+    Runs matches between bot controllers on a headless Game, with no display, rendering or frame rate limit.
+    """
+    MAX_GAME_TIME = 60*60
+
+    def __init__(self, physicsRate: int=Game.PHYSICS_RATE):
+        config = Config('')
+        config['physicsRate'] = physicsRate
+        self.game = Game(config, headless=True)
+
+    def runMatch(self, leftBot: type=BotController, rightBot: type=BotController, seed: int=None,
+                 maxGameTime: float=MAX_GAME_TIME) -> MatchResult:
+        """
+        Play a match to ScoreBoard.SCORE_LIMIT.
+        :param leftBot: Controller class for the left paddle, constructed with (paddle, ball)
+        :param rightBot: Controller class for the right paddle, constructed with (paddle, ball)
+        :param seed: Seed for the match's random serves (random if None); the same seed gives the same match
+        :param maxGameTime: Game seconds after which an unfinished match is abandoned (winner is None)
+        :return: Final scores and timing of the match
+        """
+        game = self.game
+        game.start(0, (leftBot, rightBot), seed)
+
+        scores = game.scoreBoard.scores
+        rallies = []
+        points = 0
+        steps = 0
+        maxSteps = int(maxGameTime / game.step)
+        while game.scoreBoard.winner is None and steps < maxSteps:
+            game.update(game.step)
+            steps += 1
+            if scores[0] + scores[1] != points:
+                points += 1
+                rallies.append(game.ball.rallyHits)
+
+        return MatchResult(game.seed, list(scores), game.scoreBoard.winner, steps*game.step, steps, rallies)
+
+
+def main():
+    import sys
+    import time
+
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    sim = Simulation()
+
+    start = time.perf_counter()
+    for i in range(matches):
+        print(sim.runMatch())
+    elapsed = time.perf_counter() - start
+
+    print('{} matches in {:.2f}s ({:.1f} matches/s)'.format(matches, elapsed, matches / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import TestCase
+from simulation import *
+from sprites import ScoreBoard
+
+
+class IdleController:
+    """
+    Leaves its paddle in the middle, so the other bot wins quickly.
+    """
+    def __init__(self, paddle, ball):
+        pass
+
+    def update(self, delta: float):
+        pass
+
+
+class Simulation_tests(TestCase):
+    def setUp(self):
+        self.sim = Simulation()
+
+    def test_runMatch_finishesWithWinner(self):
+        result = self.sim.runMatch(IdleController, BotController, seed=7)
+
+        self.assertEqual(result.winner, 1)
+        self.assertEqual(result.scores[1], ScoreBoard.SCORE_LIMIT)
+        self.assertLess(result.scores[0], ScoreBoard.SCORE_LIMIT)
+        self.assertEqual(len(result.rallies), sum(result.scores))
+        self.assertAlmostEqual(result.gameTime, result.steps * self.sim.game.step)
+        self.assertLess(result.gameTime, Simulation.MAX_GAME_TIME)
+
+    def test_runMatch_sameSeed_sameResult(self):
+        results = [self.sim.runMatch(IdleController, BotController, seed=7) for i in range(2)]
+
+        self.assertEqual(repr(results[0]), repr(results[1]))
+        self.assertEqual(results[0].rallies, results[1].rallies)
+
+    def test_runMatch_maxGameTime_abandoned(self):
+        result = self.sim.runMatch(seed=1, maxGameTime=5)
+
+        self.assertIsNone(result.winner)
+        self.assertEqual(result.steps, round(5 / self.sim.game.step))
+        self.assertLess(max(result.scores), ScoreBoard.SCORE_LIMIT)
+
+
+if __name__ == '__main__':
+    unittest.main()
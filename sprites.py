@@ -6,10 +6,17 @@ from pygame import draw
 from pygame.color import THECOLORS
 from pygame.math import Vector2
 from random import Random
+from surfacecache import surfaceCache
+from textcache import textCache
 import collision
+import math
 
 
 class Viewport:
+    """
+    Affine transform between game coordinates and screen pixels, reduced at construction to a scale and offset per
+    axis: screenPos = (gamePos + offset) * scale, and screenSize = gameSize * |scale|.
+    """
     def __init__(self, screenArea: Rect, cameraSize: (float, float), cameraCenter: (float, float)=(0, 0),
                  invertYAxis: bool=True):
         screenSize = Vector2(screenArea.size)
@@ -17,32 +24,58 @@ class Viewport:
         cameraSize = Vector2(cameraSize)
         cameraCenter = Vector2(cameraCenter)
 
-        self.sizeFactor = screenSize.elementwise()/cameraSize
-        self.posFactor = Vector2(self.sizeFactor)
-        self.posTranslate = cameraSize/2 - cameraCenter
+        sizeFactor = screenSize.elementwise()/cameraSize
+        posFactor = Vector2(sizeFactor)
+        posTranslate = cameraSize/2 - cameraCenter
         screenTranslate = (screenPos.elementwise()*cameraSize).elementwise()/screenSize
         if invertYAxis:
-            self.posFactor.y *= -1
+            posFactor.y *= -1
             screenTranslate.y *= -1
-            self.posTranslate.y -= cameraSize.y
-        self.posTranslate = self.posTranslate + screenTranslate
+            posTranslate.y -= cameraSize.y
+        posTranslate = posTranslate + screenTranslate
 
-    def getScreenSize(self, gameSize: (float, float)) -> Vector2:
-        screenSize = Vector2(gameSize).elementwise() * self.sizeFactor
-        return Vector2(tuple(round(z) for z in screenSize))
+        # plain floats, so the scalar conversions do no vector arithmetic
+        self.sizeX, self.sizeY = sizeFactor
+        self.scaleX, self.scaleY = posFactor
+        self.offsetX, self.offsetY = posTranslate
 
-    def getScreenPos(self, gamePos: (float, float)) -> Vector2:
-        screenPos = (Vector2(gamePos) + self.posTranslate).elementwise() * self.posFactor
-        return Vector2(tuple(round(z) for z in screenPos))
+    def getScreenSize(self, gameSize: (float, float)) -> (int, int):
+        return round(gameSize[0] * self.sizeX), round(gameSize[1] * self.sizeY)
+
+    def getScreenPos(self, gamePos: (float, float)) -> (int, int):
+        return round((gamePos[0] + self.offsetX) * self.scaleX), round((gamePos[1] + self.offsetY) * self.scaleY)
 
     def getGameSize(self, screenSize: (int, int)) -> Vector2:
-        return Vector2(screenSize).elementwise() / self.sizeFactor
+        return Vector2(screenSize[0] / self.sizeX, screenSize[1] / self.sizeY)
 
     def getGamePos(self, screenPos: (int, int)) -> Vector2:
-        return (Vector2(screenPos).elementwise() / self.posFactor) - self.posTranslate
+        return Vector2(screenPos[0] / self.scaleX - self.offsetX, screenPos[1] / self.scaleY - self.offsetY)
+
+    def getScreenSizes(self, gameSizes):
+        """
+        Convert many sizes at once (requires NumPy).
+        :param gameSizes: Array-like of shape (n, 2)
+        :return: Integer array of shape (n, 2), rounded as getScreenSize does
+        :rtype: numpy.ndarray
+        """
+        import numpy as np
+        sizes = np.asarray(gameSizes, dtype=float) * (self.sizeX, self.sizeY)
+        return np.rint(sizes).astype(int)
+
+    def getScreenPositions(self, gamePositions):
+        """
+        Convert many positions at once (requires NumPy).
+        :param gamePositions: Array-like of shape (n, 2)
+        :return: Integer array of shape (n, 2), rounded as getScreenPos does
+        :rtype: numpy.ndarray
+        """
+        import numpy as np
+        positions = (np.asarray(gamePositions, dtype=float) + (self.offsetX, self.offsetY)) * (self.scaleX, self.scaleY)
+        return np.rint(positions).astype(int)
 
 
 class PongSprite(Sprite):
+    # pos and vel are updated in place, so that a physics step allocates nothing
     viewport = None
     """:type: Viewport"""
 
@@ -52,10 +85,13 @@ class PongSprite(Sprite):
         self.size = Rect(0, 0, 0, 0)
         self._halfSize = None
         self.pos = Vector2()
+        self.prevPos = Vector2()
         self.vel = Vector2()
 
         self.image = None
         """:type: Surface"""
+        # set when the image changes in place, so a DirtyRectGroup knows to redraw it
+        self.dirty = True
 
     @property
     def halfSize(self):
@@ -67,16 +103,86 @@ class PongSprite(Sprite):
         pass
 
     def updateRect(self):
+        if self.viewport is None:
+            return
         self.rect.size = self.viewport.getScreenSize(self.size)
         self.updateRectPos()
 
     def updateRectPos(self):
+        # headless simulations run without a viewport, and have no need for screen positions
+        if self.viewport is None:
+            return
         self.rect.center = self.viewport.getScreenPos(self.pos)
 
+    def savePos(self):
+        """
+        Remember the current position as the start of the next physics step, for interpolation.
+        """
+        self.prevPos.update(self.pos)
+
+    def interpolate(self, alpha: float):
+        """
+        Position the rect between the previous and current positions.
+        :param alpha: Fraction of a physics step elapsed since the current position (0 to 1)
+        """
+        if self.viewport is None:
+            return
+        self.rect.center = self.viewport.getScreenPos(self.prevPos.lerp(self.pos, alpha))
+
     def collide(self, other):
         return collision.rect_rect(self.pos, self.halfSize, other.pos, other.halfSize)
 
 
+class DirtyRectGroup(pygame.sprite.RenderUpdates):
+    """
+    A sprite group that can draw only what changed since its last draw: sprites that moved, were added or removed, or
+    were marked dirty, along with any sprites overlapping those areas.
+    """
+    def drawChanged(self, surface: Surface, background: Surface) -> [Rect]:
+        """
+        Restore the background under changed sprites and draw them.
+        :param surface: Surface the group was last drawn to
+        :param background: Surface to restore cleared areas from
+        :return: Areas of the surface that changed
+        """
+        spritedict = self.spritedict
+        sprites = self.sprites()
+        dirty = self.lostsprites
+        self.lostsprites = []
+        changed = set()
+
+        def change(sprite):
+            changed.add(sprite)
+            oldRect = spritedict[sprite]
+            if oldRect:
+                dirty.append(oldRect)
+            dirty.append(sprite.rect.copy())
+
+        for sprite in sprites:
+            oldRect = spritedict[sprite]
+            if sprite.dirty or not oldRect or oldRect != sprite.rect:
+                change(sprite)
+
+        # sprites overlapping a changed area must be redrawn whole, which may in turn overlap other sprites
+        overlapFound = True
+        while overlapFound:
+            overlapFound = False
+            for sprite in sprites:
+                if sprite not in changed and sprite.rect.collidelist(dirty) != -1:
+                    change(sprite)
+                    overlapFound = True
+
+        for rect in dirty:
+            surface.blit(background, rect, rect)
+
+        for sprite in sprites:
+            if sprite in changed:
+                spritedict[sprite] = surface.blit(sprite.image, sprite.rect)
+                sprite.dirty = False
+
+        return dirty
+
+
 class Table(PongSprite):
     WALL_SIZE = 0.045
 
@@ -93,21 +199,26 @@ class Table(PongSprite):
 
         PongSprite.updateRect(self)
 
-        pixelWallSize = viewport.getScreenSize((self.WALL_SIZE, self.WALL_SIZE))
-        self.image = Surface(self.rect.size).convert_alpha()
-        self.image.fill((0, 0, 0, 0))
+        def render() -> Surface:
+            pixelWallSize = viewport.getScreenSize((self.WALL_SIZE, self.WALL_SIZE))
+            image = Surface(self.rect.size).convert_alpha()
+            image.fill((0, 0, 0, 0))
+
+            # draw center line
+            lineDivisions = 15
+            lineRect = Rect((0, 0), viewport.getScreenSize((0.005, 1/lineDivisions)))
+            lineRect.centerx = self.rect.width/2
+            for i in range(1, lineDivisions, 2):
+                lineRect.y = lineRect.height*i
+                image.fill(centerLineColor, lineRect)
 
-        # draw center line
-        lineDivisions = 15
-        lineRect = Rect((0, 0), viewport.getScreenSize((0.005, 1/lineDivisions)))
-        lineRect.centerx = self.rect.width/2
-        for i in range(1, lineDivisions, 2):
-            lineRect.y = lineRect.height*i
-            self.image.fill(centerLineColor, lineRect)
+            # draw walls
+            image.fill(wallColor, Rect(0, 0, self.rect.width, pixelWallSize[1]))
+            image.fill(wallColor, Rect(0, self.rect.height - pixelWallSize[1], self.rect.width, pixelWallSize[1]))
+            return image
 
-        # draw walls
-        self.image.fill(wallColor, Rect(0, 0, self.rect.width, pixelWallSize.y))
-        self.image.fill(wallColor, Rect(0, self.rect.height - pixelWallSize.y, self.rect.width, pixelWallSize.y))
+        # the table fills the viewport, so its pixel size determines the size of everything on it
+        self.image = surfaceCache.get('table', self.rect.size, (wallColor, centerLineColor), SRCALPHA, render)
 
 
 class ScoreBoard(PongSprite):
@@ -122,7 +233,8 @@ class ScoreBoard(PongSprite):
         self.size = Vector2(1, Table.WALL_SIZE)
         self.pos = Vector2(0, 0.5-(Table.WALL_SIZE/2))
 
-        self.font = None
+        self.digits = None
+        """:type: GlyphAtlas"""
         self.messages = []
         self.scoreMessages = []
         self.winnerMessages = []
@@ -132,41 +244,25 @@ class ScoreBoard(PongSprite):
         self.updateRect()
 
         heightPx = self.viewport.getScreenSize(self.size)[1]
-        self.font = pygame.font.Font(None, int(heightPx))
+        self.digits = textCache.glyphs(textCache.font(int(heightPx)), THECOLORS['black'])
 
         self.image = Surface(self.rect.size).convert_alpha()
         self._renderScores()
 
         # setup message sprites
-        messageFont = pygame.font.Font(None, int(heightPx*3))
+        messageFont = textCache.font(int(heightPx*3))
 
-        def positionMsg(msg, side):
-            msg.rect = msg.image.get_rect()
-            pos = self.viewport.getScreenPos((0.55 * side, 0.4))
-            if i == 0:
-                msg.rect.topleft = pos
-            else:
-                msg.rect.topright = pos
-
-        self.scoreMessages = []
-        for (i, name) in enumerate(["Blue", "Red"]):
-            msg = PongSprite()
-            msg.image = messageFont.render("{} point!".format(name), True, Paddle.COLORS[i])
-            positionMsg(msg, [-1, 1][i])
-            self.scoreMessages.append(msg)
-
-        self.winnerMessages = []
-        for i in range(2):
+        def createMsg(text, color):
             msg = PongSprite()
-            msg.image = messageFont.render("Winner!", True, Paddle.COLORS[i])
-            positionMsg(msg, [-1, 1][i])
-            self.winnerMessages.append(msg)
+            msg.image = textCache.render(messageFont, text, color)
+            msg.rect = msg.image.get_rect()
+            return msg
 
-        msg = PongSprite()
-        msg.image = messageFont.render("Get Ready!", True, THECOLORS['white'])
-        msg.rect = msg.image.get_rect()
-        msg.rect.center = self.viewport.getScreenPos((0, 0))
-        self.prepareMessage = msg
+        self.scoreMessages = [createMsg("{} point!".format(name), Paddle.COLORS[i])
+                              for (i, name) in enumerate(["Blue", "Red"])]
+        self.winnerMessages = [createMsg("Winner!", Paddle.COLORS[i]) for i in range(2)]
+        self.prepareMessage = createMsg("Get Ready!", THECOLORS['white'])
+        self._positionMessages()
 
         oldMessages = self.messages
         self.messages = self.scoreMessages + self.winnerMessages + [self.prepareMessage]
@@ -175,38 +271,75 @@ class ScoreBoard(PongSprite):
             msg.add(oldMsg.groups())
             oldMsg.kill()
 
+    def updateRect(self):
+        PongSprite.updateRect(self)
+        # the messages do not exist until the first initImage
+        if self.prepareMessage:
+            self._positionMessages()
+
     def reset(self):
         self.scores = [0, 0]
         self.winner = None
 
-        self._show(self.prepareMessage)
+        if self.prepareMessage:
+            self._show(self.prepareMessage)
 
     def score(self, player: int):
         self.scores[player] += 1
-        self._renderScores()
-
-        if self.scores[player] < self.SCORE_LIMIT:
-            self._show(self.scoreMessages[player])
-        else:
+        if self.scores[player] >= self.SCORE_LIMIT:
             self.winner = player
-            self._show(self.winnerMessages[player])
+
+        # a headless game never creates the score image or message sprites
+        if self.image:
+            self._renderScores()
+            if self.winner is None:
+                self._show(self.scoreMessages[player])
+            else:
+                self._show(self.winnerMessages[player])
+
+    def restore(self, scores: [int]):
+        """
+        Jump to the given scores, hiding any messages.
+        """
+        self.scores = list(scores)
+        self.winner = None
+        for player in range(2):
+            if self.scores[player] >= self.SCORE_LIMIT:
+                self.winner = player
+
+        if self.image:
+            self._renderScores()
+            self.hideMessages()
 
     def hideMessages(self):
         for msg in self.messages:
             msg.kill()
 
+    def _positionMessages(self):
+        for messages in [self.scoreMessages, self.winnerMessages]:
+            for i, msg in enumerate(messages):
+                pos = self.viewport.getScreenPos((0.55 * [-1, 1][i], 0.4))
+                if i == 0:
+                    msg.rect.topleft = pos
+                else:
+                    msg.rect.topright = pos
+
+        self.prepareMessage.rect.center = self.viewport.getScreenPos((0, 0))
+
     def _show(self, sprite):
         sprite.add(self.groups()[0])
 
     def _renderScores(self):
         self.image.fill((0, 0, 0, 0))
+        self.dirty = True
 
+        # scores are drawn from prerendered digits, rather than rasterized on every point
         for i in range(2):
-            img = self.font.render(str(self.scores[i]), True, THECOLORS['black'])
-            imgRect = img.get_rect()
-            x = 0 if i == 0 else self.rect.width - imgRect.width
-            y = (self.rect.height - imgRect.height)/2
-            self.image.blit(img, (x, y))
+            text = str(self.scores[i])
+            width, height = self.digits.size(text)
+            x = 0 if i == 0 else self.rect.width - width
+            y = (self.rect.height - height)/2
+            self.digits.draw(self.image, text, (x, y))
 
 
 class Paddle(PongSprite):
@@ -219,7 +352,6 @@ class Paddle(PongSprite):
         self.side = side
 
         self.size = Vector2(0.024, 0.145)
-        self.pos = Vector2()
         self.direction = 0
         self.reset()
 
@@ -228,19 +360,24 @@ class Paddle(PongSprite):
 
         self.updateRect()
 
-        self.image = Surface(self.rect.size).convert_alpha()
-        self.image.fill((0, 0, 0, 0))
-        endSize = (self.rect.width, self.rect.width)
-        draw.ellipse(self.image, paddleColor, Rect((0, 0), endSize))
-        draw.ellipse(self.image, paddleColor, Rect((0, self.rect.height-self.rect.width), endSize))
-        middle = Rect(0, self.rect.width/2, self.rect.width, self.rect.height - self.rect.width)
-        self.image.fill(paddleColor, middle)
+        def render() -> Surface:
+            image = Surface(self.rect.size).convert_alpha()
+            image.fill((0, 0, 0, 0))
+            endSize = (self.rect.width, self.rect.width)
+            draw.ellipse(image, paddleColor, Rect((0, 0), endSize))
+            draw.ellipse(image, paddleColor, Rect((0, self.rect.height-self.rect.width), endSize))
+            middle = Rect(0, self.rect.width/2, self.rect.width, self.rect.height - self.rect.width)
+            image.fill(paddleColor, middle)
+
+            if self.side < 0:
+                image = pygame.transform.flip(image, True, False)
+            return image
 
-        if self.side < 0:
-            self.image = pygame.transform.flip(self.image, True, False)
+        self.image = surfaceCache.get(('paddle', self.side), self.rect.size, paddleColor, SRCALPHA, render)
 
     def reset(self):
-        self.pos = Vector2(0.6 * self.side, 0)
+        self.pos.update(0.6 * self.side, 0)
+        self.savePos()
         self.stop()
 
     def update(self, delta: float):
@@ -253,8 +390,6 @@ class Paddle(PongSprite):
         elif self.pos.y < -maxYDist:
             self.pos.y = -maxYDist
 
-        self.updateRectPos()
-
     def up(self):
         self.direction = 1
 
@@ -272,103 +407,216 @@ class Ball(PongSprite):
     MAX_ANGLE = 86
     COLLISION_TIMEOUT = 0.1
     COLLISION_CURVE_EXPONENT = 5
+    # balls bounce off each other as circles
+    BALL_CURVE_EXPONENT = 1
+    MAX_CONTACTS = 8
+    # kinds of contact found by _nextContact
+    NO_CONTACT = 0
+    WALL_CONTACT = 1
+    SCORE_CONTACT = 2
+    PADDLE_CONTACT = 3
 
     def __init__(self, table: Table, paddles: [], game):
         PongSprite.__init__(self)
         self.table = table
         self.paddles = paddles
         self.game = game
+        # plays the sound of each contact, posted by contact kind
+        self.audio = None
+        """:type: audio.Audio"""
         self.rand = Random()
+        self.matchSeed = None
+        """:type: int"""
 
         self.radius = 0.01
         self.size = Vector2(self.radius*2, self.radius*2)
-        self.pos = Vector2()
-        self.vel = Vector2()
         self.speedupHits = 0
+        self.rallyHits = 0
+        self.serves = 0
         self.collisionTimeout = 0
 
+        # results of _nextContact, and scratch vectors for the collision functions
+        self._contact = self.NO_CONTACT
+        self._contactPaddle = None
+        """:type: Paddle"""
+        self._projection = Vector2()
+        self._normal = Vector2()
+
     def initImage(self):
         self.updateRect()
 
-        self.image = Surface(self.rect.size).convert_alpha()
-        self.image.fill((0, 0, 0, 0))
-        draw.ellipse(self.image, THECOLORS['white'], Rect((0, 0), self.rect.size))
+        def render() -> Surface:
+            image = Surface(self.rect.size).convert_alpha()
+            image.fill((0, 0, 0, 0))
+            draw.ellipse(image, THECOLORS['white'], Rect((0, 0), self.rect.size))
+            return image
+
+        self.image = surfaceCache.get('ball', self.rect.size, THECOLORS['white'], SRCALPHA, render)
 
     def reset(self):
-        self.pos = Vector2(-2, 0)
-        self.vel = Vector2()
+        self.pos.update(-2, 0)
+        self.savePos()
+        self.vel.update(0, 0)
         self.speedupHits = 0
+        self.serves = 0
+
+    def seed(self, seed: int):
+        self.matchSeed = seed
+        self.rand.seed(seed)
 
     def serve(self, direction: int=0):
-        self.pos = Vector2()
+        self.pos.update(0, 0)
+        self.savePos()
+        self.rallyHits = 0
+        self.vel.from_polar((self.START_SPEED, self.serveAngle(direction)))
+        self.serves += 1
+
+    def serveAngle(self, direction: int=0) -> float:
+        """
+        Draw a random serve angle from the match's RNG.
+        :param direction: Side to serve toward (-1 or 1), or 0 for a random side
+        """
         if direction == 0:
             direction = -1 if self.rand.random() < 0.5 else 1
         angle = 180 if direction < 0 else 0
-        angle += self.rand.uniform(-80, 80)
-        self.vel.from_polar((self.START_SPEED, angle))
+        return angle + self.rand.uniform(-80, 80)
 
     def update(self, delta: float):
         if self.collisionTimeout > 0:
             self.collisionTimeout -= delta
 
-        move = self.vel*delta
-
-        # move in small increments so that the ball cannot pass through objects when traveling quickly
-        while move:
-            incr = Vector2(move)
-            if incr.length_squared() > self.radius**2:
-                incr.scale_to_length(self.radius)
-                move.scale_to_length(move.length() - self.radius)
+        # a paddle may have moved into the ball since the last update
+        self._paddleOverlap()
+
+        # advance straight to each contact and respond to it, so that the ball cannot pass through objects and the
+        # cost does not depend on its speed
+        pos = self.pos
+        vel = self.vel
+        remaining = delta
+        contacts = 0
+        while contacts < self.MAX_CONTACTS:
+            contacts += 1
+            time = self._nextContact(remaining)
+            pos.x += vel.x*time
+            pos.y += vel.y*time
+            remaining -= time
+
+            contact = self._contact
+            if contact == self.WALL_CONTACT:
+                self._hitWall()
+            elif contact == self.PADDLE_CONTACT:
+                self._bounce(self._contactPaddle)
             else:
-                move = None
-            self.pos = self.pos + incr
-            if self._collision():
+                # stopped by a score, or no more contacts
+                if contact == self.SCORE_CONTACT:
+                    self._score()
                 break
 
-        self.updateRectPos()
-
-    def _collision(self) -> bool:
+    def _nextContact(self, maxTime: float) -> float:
+        """
+        Find the first contact of the ball within the given time, and set _contact (and _contactPaddle) to its kind.
+        :return: Time until the contact, or maxTime if there is none
+        """
+        # earlier checks take priority when contacts happen at the same time
         # wall collision
         maxYDist = self.table.innerSize.y/2 - self.radius
-        if self.pos.y >= maxYDist:
-            self.pos.y = maxYDist
-            self.vel.y *= -1
-            self.collisionTimeout = 0
-            return True
-        elif self.pos.y <= -maxYDist:
-            self.pos.y = -maxYDist
-            self.vel.y *= -1
-            self.collisionTimeout = 0
-            return True
+        time = collision.sweep_limit(self.pos.y, self.vel.y, maxYDist)
+        contact = self.WALL_CONTACT
 
         # score
         maxXDist = self.table.size.x/2 + self.radius
-        if self.pos.x >= maxXDist:
-            self.vel = Vector2()
-            self.game.score(0)
-            return True
-        elif self.pos.x <= -maxXDist:
-            self.vel = Vector2()
-            self.game.score(1)
-            return True
-
-        # paddle collision
-        if self.collisionTimeout <= 0:
-            for paddle in self.paddles:
-                projection = self.collide(paddle)
-                if projection:
-                    self.pos = self.pos + projection
-                    normal = collision.ellipticNormal(self.pos, paddle.pos, self.COLLISION_CURVE_EXPONENT)
-                    self.vel.reflect_ip(normal)
-                    self._hitPaddle()
-                    return True
+        scoreTime = collision.sweep_limit(self.pos.x, self.vel.x, maxXDist)
+        if scoreTime < time:
+            time, contact = scoreTime, self.SCORE_CONTACT
 
-        return False
+        self._contact = contact
+
+        # paddle collision (indexed rather than iterated, as an iterator is an allocation)
+        if self.collisionTimeout <= 0:
+            paddles = self.paddles
+            i = 0
+            while i < len(paddles):
+                paddle = paddles[i]
+                paddleTime = collision.sweep_rect_rect(self.pos, self.halfSize, self.vel, paddle.pos, paddle.halfSize,
+                                                       maxTime if maxTime < time else time)
+                if paddleTime is not None and paddleTime < time:
+                    time = paddleTime
+                    self._contact = self.PADDLE_CONTACT
+                    self._contactPaddle = paddle
+                i += 1
+
+        if time > maxTime:
+            self._contact = self.NO_CONTACT
+            return maxTime
+        return time
+
+    def _paddleOverlap(self):
+        if self.collisionTimeout <= 0:
+            paddles = self.paddles
+            i = 0
+            while i < len(paddles):
+                paddle = paddles[i]
+                if collision.rect_rect_ip(self.pos, self.halfSize, paddle.pos, paddle.halfSize, self._projection):
+                    self.pos += self._projection
+                    self._bounce(paddle)
+                    return
+                i += 1
+
+    def _hitWall(self):
+        maxYDist = self.table.innerSize.y/2 - self.radius
+        self.pos.y = math.copysign(maxYDist, self.pos.y)
+        self.vel.y *= -1
+        self.collisionTimeout = 0
+        self._sound(self.WALL_CONTACT)
+
+    def _score(self):
+        player = 0 if self.pos.x > 0 else 1
+        self.vel.update(0, 0)
+        self._sound(self.SCORE_CONTACT)
+        self.game.score(player, self)
+
+    def _bounce(self, paddle):
+        collision.ellipticNormal_ip(self.pos, paddle.pos, self.COLLISION_CURVE_EXPONENT, self._normal)
+        self.vel.reflect_ip(self._normal)
+        self._hitPaddle()
+        self._sound(self.PADDLE_CONTACT)
+
+    def _sound(self, contact: int):
+        if self.audio is not None:
+            self.audio.post(contact)
+
+    def collideBall(self, other):
+        """
+        Bounce this ball and another off each other if they overlap, as equal masses, and move them apart.
+        """
+        if not collision.rect_rect_ip(self.pos, self.halfSize, other.pos, other.halfSize, self._projection):
+            return
+        overlap = self.radius + other.radius - self.pos.distance_to(other.pos)
+        if overlap <= 0:
+            return
+
+        # from the other ball toward this one
+        normal = collision.ellipticNormal_ip(self.pos, other.pos, self.BALL_CURVE_EXPONENT, self._normal)
+        self.pos.x += normal.x*overlap/2
+        self.pos.y += normal.y*overlap/2
+        other.pos.x -= normal.x*overlap/2
+        other.pos.y -= normal.y*overlap/2
+
+        # exchange the parts of their velocities along the normal, if they are moving toward each other
+        approach = (self.vel.x - other.vel.x)*normal.x + (self.vel.y - other.vel.y)*normal.y
+        if approach < 0:
+            self.vel.x -= normal.x*approach
+            self.vel.y -= normal.y*approach
+            other.vel.x += normal.x*approach
+            other.vel.y += normal.y*approach
+            self._preventVerticalVel()
+            other._preventVerticalVel()
 
     def _hitPaddle(self):
         self._preventVerticalVel()
         self.collisionTimeout = self.COLLISION_TIMEOUT
 
+        self.rallyHits += 1
         self.speedupHits += 1
         if self.speedupHits == self.SPEEDUP_HITS:
             polar = self.vel.as_polar()
@@ -377,15 +625,15 @@ class Ball(PongSprite):
 
     def _preventVerticalVel(self):
         # because waiting 5 minutes for the ball to cross the table is not fun
-        def setAngle(a):
-            self.vel.from_polar((self.vel.length(), a))
-
-        angle = Vector2().angle_to(self.vel)
+        angle = self.vel.as_polar()[1]
         if self.MAX_ANGLE < angle <= 90:
-            setAngle(self.MAX_ANGLE)
+            self._setAngle(self.MAX_ANGLE)
         elif 90 < angle < 180 - self.MAX_ANGLE:
-            setAngle(180 - self.MAX_ANGLE)
+            self._setAngle(180 - self.MAX_ANGLE)
         elif -self.MAX_ANGLE > angle > -90:
-            setAngle(-self.MAX_ANGLE)
+            self._setAngle(-self.MAX_ANGLE)
         elif -90 >= angle > -180 + self.MAX_ANGLE:
-            setAngle(-180 + self.MAX_ANGLE)
+            self._setAngle(-180 + self.MAX_ANGLE)
+
+    def _setAngle(self, angle: float):
+        self.vel.from_polar((self.vel.length(), angle))
@@ -0,0 +1,101 @@
+import unittest
+from unittest import TestCase
+from random import Random
+from sprites import *
+from pong import Game
+from config import Config
+from testutil import traceAllocations
+
+
+class Viewport_tests(TestCase):
+    def setUp(self):
+        self.viewport = Viewport(Rect(10, 20, 300, 200), (1.5, 1))
+
+    def test_getScreenPos_center(self):
+        self.assertEqual(self.viewport.getScreenPos((0, 0)), (160, 120))
+
+    def test_getScreenPos_corners_yInverted(self):
+        self.assertEqual(self.viewport.getScreenPos((-0.75, 0.5)), (10, 20))
+        self.assertEqual(self.viewport.getScreenPos((0.75, -0.5)), (310, 220))
+
+    def test_getScreenSize(self):
+        self.assertEqual(self.viewport.getScreenSize((0.3, 0.25)), (60, 50))
+
+    def test_getGamePos_inverse(self):
+        self.assertEqual(self.viewport.getGamePos((160, 120)), Vector2(0, 0))
+        self.assertEqual(self.viewport.getGamePos((10, 20)), Vector2(-0.75, 0.5))
+
+    def test_getGameSize_inverse(self):
+        self.assertEqual(self.viewport.getGameSize((60, 50)), Vector2(0.3, 0.25))
+
+    def test_batch_matchesScalar(self):
+        rand = Random(1)
+        points = [(rand.uniform(-1, 1), rand.uniform(-1, 1)) for i in range(500)]
+        # exact halves exercise rounding
+        points += [(0.0025, 0.0025), (-0.0025, -0.0075), (0.0125, 0.0175)]
+
+        positions = self.viewport.getScreenPositions(points)
+        sizes = self.viewport.getScreenSizes(points)
+        for point, position, size in zip(points, positions.tolist(), sizes.tolist()):
+            self.assertEqual(tuple(position), self.viewport.getScreenPos(point))
+            self.assertEqual(tuple(size), self.viewport.getScreenSize(point))
+
+
+class Ball_tests(TestCase):
+    def setUp(self):
+        self.game = Game(Config(''), headless=True)
+        self.game.start(0, seed=3)
+        self.ball = self.game.ball
+        self.paddles = self.game.paddles
+
+    def step(self):
+        paddles = self.paddles
+        # the paddles follow the ball, so the rally never ends
+        paddles[0].pos.y = self.ball.pos.y
+        paddles[1].pos.y = self.ball.pos.y
+        self.ball.update(self.game.step)
+        paddles[0].update(self.game.step)
+        paddles[1].update(self.game.step)
+
+    def test_update_rally_noNetAllocations(self):
+        self.ball.serve(1)
+        net, peak = traceAllocations(self.step, 2000)
+        self.assertGreater(self.ball.rallyHits, 10)
+        self.assertEqual(self.game.scoreBoard.scores, [0, 0])
+        self.assertEqual(net, 0)
+
+    def test_update_freeFlight_noAllocations(self):
+        ball = self.ball
+        ball.pos.update(-0.3, -0.2)
+        ball.vel.update(0.05, 0.02)
+        net, peak = traceAllocations(lambda: ball.update(self.game.step), 100)
+        self.assertEqual(net, 0)
+        self.assertEqual(peak, 0)
+
+    def test_collideBall_headOn_exchangesVelocities(self):
+        other = Ball(self.game.table, [], self.game)
+        self.ball.pos.update(-0.009, 0)
+        self.ball.vel.update(0.5, 0)
+        other.pos.update(0.009, 0)
+        other.vel.update(-0.2, 0)
+
+        self.ball.collideBall(other)
+
+        self.assertEqual(self.ball.vel, Vector2(-0.2, 0))
+        self.assertEqual(other.vel, Vector2(0.5, 0))
+        self.assertAlmostEqual(self.ball.pos.distance_to(other.pos), self.ball.radius + other.radius)
+
+    def test_collideBall_apart_unchanged(self):
+        other = Ball(self.game.table, [], self.game)
+        self.ball.pos.update(-0.1, 0)
+        self.ball.vel.update(0.5, 0)
+        other.pos.update(0.1, 0)
+
+        self.ball.collideBall(other)
+
+        self.assertEqual(self.ball.vel, Vector2(0.5, 0))
+        self.assertEqual(self.ball.pos, Vector2(-0.1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
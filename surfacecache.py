@@ -0,0 +1,76 @@
+from pygame import Surface, Color
+from collections import OrderedDict
+
+
+class SurfaceCache:
+    """
+    Least recently used cache of prerendered surfaces, keyed by (kind, pixel size, color, flags) and limited to a
+    memory budget. Cached surfaces are shared by everything that asks for the same key, so they must not be drawn on
+    after they are rendered.
+    """
+    BUDGET = 128 * 2**20
+
+    def __init__(self, budget: int=BUDGET):
+        """
+        :param budget: Maximum bytes of pixel data to keep (the most recent surface is kept even if it is larger)
+        """
+        self.budget = budget
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def get(self, kind, size: (int, int), color, flags: int, render) -> Surface:
+        """
+        Get a cached surface, rendering and caching it if it is not cached.
+        :param kind: Hashable name of what the surface shows
+        :param size: Pixel size of the surface
+        :param color: Color, or sequence of colors, the surface is drawn with
+        :param flags: Surface flags (e.g. SRCALPHA) or other variations of the kind
+        :param render: Function with no arguments that renders the surface on a miss
+        """
+        key = (kind, tuple(size), _hashableColor(color), flags)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = render()
+        self._surfaces[key] = surface
+        self.used += surfaceBytes(surface)
+        self._evict()
+        return surface
+
+    def setBudget(self, budget: int):
+        self.budget = budget
+        self._evict()
+
+    def clear(self):
+        self._surfaces.clear()
+        self.used = 0
+
+    def _evict(self):
+        while self.used > self.budget and len(self._surfaces) > 1:
+            key, surface = self._surfaces.popitem(last=False)
+            self.used -= surfaceBytes(surface)
+
+
+def surfaceBytes(surface: Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+def _hashableColor(color):
+    if color is None or isinstance(color, (int, str)):
+        return color
+    if isinstance(color, Color) or all(isinstance(c, int) for c in color):
+        return tuple(color)
+    return tuple(_hashableColor(c) for c in color)
+
+
+# shared by the sprites and menus
+surfaceCache = SurfaceCache()
@@ -0,0 +1,70 @@
+import unittest
+from unittest import TestCase
+from pygame import Surface, Color
+from surfacecache import *
+
+
+class SurfaceCache_tests(TestCase):
+    def setUp(self):
+        # room for four 10x10 32-bit surfaces
+        self.cache = SurfaceCache(4 * 400)
+        self.renders = 0
+
+    def get(self, kind, size=(10, 10), color=(255, 0, 0), flags=0) -> Surface:
+        def render():
+            self.renders += 1
+            return Surface(size, 0, 32)
+        return self.cache.get(kind, size, color, flags, render)
+
+    def test_get_sameKey_rendersOnce(self):
+        first = self.get('ball')
+        second = self.get('ball')
+        self.assertIs(first, second)
+        self.assertEqual(self.renders, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_get_differentKeyParts_renderSeparately(self):
+        self.get('ball')
+        self.get('paddle')
+        self.get('ball', size=(12, 12))
+        self.get('ball', color=(0, 0, 255))
+        self.get('ball', flags=1)
+        self.assertEqual(self.renders, 5)
+
+    def test_get_colorObject_matchesTuple(self):
+        self.get('ball', color=Color(255, 0, 0, 255))
+        self.get('ball', color=(255, 0, 0, 255))
+        self.get('table', color=[Color('white'), Color('red')])
+        self.get('table', color=((255, 255, 255, 255), (255, 0, 0, 255)))
+        self.assertEqual(self.renders, 2)
+
+    def test_overBudget_evictsLeastRecentlyUsed(self):
+        for kind in 'abcd':
+            self.get(kind)
+        self.get('a')
+        self.get('e')
+        self.assertEqual(len(self.cache), 4)
+        self.assertEqual(self.cache.used, 1600)
+
+        renders = self.renders
+        self.get('a')
+        self.assertEqual(self.renders, renders)
+        self.get('b')
+        self.assertEqual(self.renders, renders + 1)
+
+    def test_largerThanBudget_keepsMostRecent(self):
+        self.get('a')
+        big = self.get('big', size=(100, 100))
+        self.assertEqual(len(self.cache), 1)
+        self.assertIs(self.get('big', size=(100, 100)), big)
+
+    def test_setBudget_evicts(self):
+        for kind in 'abcd':
+            self.get(kind)
+        self.cache.setBudget(800)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.used, 800)
+
+
+if __name__ == '__main__':
+    unittest.main()
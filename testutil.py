@@ -0,0 +1,29 @@
+import tracemalloc
+
+
+def traceAllocations(func, calls: int) -> (int, int):
+    """
+    :return: Tuple (net, peak) of bytes allocated by calling func, beyond what calling a no-op allocates
+    """
+    def noop():
+        pass
+
+    def measure(f):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for i in range(calls):
+            f()
+        current, peak = tracemalloc.get_traced_memory()
+        return current - before, peak - before
+
+    tracemalloc.start()
+    try:
+        # objects allocated before tracing started cycle through the interpreter's free lists for a while, and
+        # skew the first measurements
+        measure(noop)
+        measure(func)
+        baseNet, basePeak = measure(noop)
+        net, peak = measure(func)
+    finally:
+        tracemalloc.stop()
+    return net - baseNet, peak - basePeak
@@ -0,0 +1,93 @@
+import pygame
+from pygame.locals import *
+from pygame import Surface
+from pygame.font import Font
+from collections import OrderedDict
+
+
+class GlyphAtlas:
+    """
+    Glyphs for a small set of characters, rendered once side by side on one surface, so that text made of them (such
+    as a score) is drawn with a blit per character instead of being rasterized.
+    """
+    DIGITS = '0123456789'
+
+    def __init__(self, font: Font, color: Color, characters: str=DIGITS):
+        glyphs = [font.render(c, True, color) for c in characters]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        self.height = max(glyph.get_height() for glyph in glyphs)
+
+        self.image = Surface((width, self.height), SRCALPHA, 32)
+        self.rects = {}
+        x = 0
+        for c, glyph in zip(characters, glyphs):
+            # copy the glyph's pixels as they are, rather than blending them onto the transparent atlas
+            self.rects[c] = self.image.blit(glyph, (x, 0), None, BLEND_RGBA_MAX)
+            x += glyph.get_width()
+
+    def size(self, text: str) -> (int, int):
+        return sum(self.rects[c].width for c in text), self.height
+
+    def draw(self, surface: Surface, text: str, pos: (int, int)):
+        x, y = pos
+        for c in text:
+            rect = self.rects[c]
+            surface.blit(self.image, (x, y), rect)
+            x += rect.width
+
+
+class TextCache:
+    """
+    Shared text rendering: fonts by size, and the most recently rendered strings and glyph atlases. Rendered surfaces
+    are shared by everything that renders the same text, so they must not be drawn on.
+    """
+    CAPACITY = 256
+    FONT_CAPACITY = 16
+
+    def __init__(self, capacity: int=CAPACITY, fontCapacity: int=FONT_CAPACITY):
+        self.capacity = capacity
+        self.fontCapacity = fontCapacity
+        self.hits = 0
+        self.misses = 0
+        self._fonts = OrderedDict()
+        self._renders = OrderedDict()
+        self._atlases = OrderedDict()
+
+    def font(self, size: int) -> Font:
+        """
+        Get the default font at a pixel size. The font module is initialized on first use.
+        """
+        if not pygame.font.get_init():
+            pygame.font.init()
+        return self._get(self._fonts, self.fontCapacity, size, lambda: pygame.font.Font(None, size))
+
+    def render(self, font: Font, text: str, color: Color, antialias: bool=True) -> Surface:
+        key = (font, text, tuple(Color(color)), antialias)
+        return self._get(self._renders, self.capacity, key, lambda: font.render(text, antialias, color))
+
+    def glyphs(self, font: Font, color: Color, characters: str=GlyphAtlas.DIGITS) -> GlyphAtlas:
+        key = (font, tuple(Color(color)), characters)
+        return self._get(self._atlases, self.fontCapacity, key, lambda: GlyphAtlas(font, color, characters))
+
+    def clear(self):
+        self._fonts.clear()
+        self._renders.clear()
+        self._atlases.clear()
+
+    def _get(self, cache: OrderedDict, capacity: int, key, create):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = create()
+        cache[key] = value
+        if len(cache) > capacity:
+            cache.popitem(last=False)
+        return value
+
+
+# shared by the sprites, menus and overlays
+textCache = TextCache()
@@ -0,0 +1,74 @@
+import unittest
+from unittest import TestCase
+import pygame
+from textcache import *
+
+
+class TextCache_tests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def setUp(self):
+        self.cache = TextCache(capacity=3, fontCapacity=2)
+
+    def test_font_sameSize_sameFont(self):
+        self.assertIs(self.cache.font(20), self.cache.font(20))
+        self.assertIsNot(self.cache.font(20), self.cache.font(21))
+
+    def test_font_overCapacity_evictsLeastRecentlyUsed(self):
+        font20 = self.cache.font(20)
+        self.cache.font(21)
+        self.cache.font(20)
+        self.cache.font(22)
+        self.assertIs(self.cache.font(20), font20)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_render_sameText_rendersOnce(self):
+        font = self.cache.font(20)
+        first = self.cache.render(font, 'Hello', (255, 0, 0))
+        self.assertIs(self.cache.render(font, 'Hello', pygame.Color(255, 0, 0)), first)
+        self.assertIsNot(self.cache.render(font, 'Hello', (0, 255, 0)), first)
+
+    def test_render_overCapacity_evictsLeastRecentlyUsed(self):
+        font = self.cache.font(20)
+        images = [self.cache.render(font, text, (255, 255, 255)) for text in 'abcd']
+        self.assertIs(self.cache.render(font, 'd', (255, 255, 255)), images[3])
+        self.assertIsNot(self.cache.render(font, 'a', (255, 255, 255)), images[0])
+
+
+class GlyphAtlas_tests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def assertSamePixels(self, expected: Surface, actual: Surface):
+        self.assertEqual(expected.get_size(), actual.get_size())
+        self.assertEqual(pygame.image.tostring(expected, 'RGBA'), pygame.image.tostring(actual, 'RGBA'))
+
+    def drawText(self, draw, size: (int, int)) -> Surface:
+        image = Surface(size, SRCALPHA, 32)
+        image.fill((0, 0, 0, 0))
+        draw(image)
+        return image
+
+    def test_draw_digit_matchesFontRender(self):
+        font = pygame.font.Font(None, 30)
+        color = (192, 32, 32)
+        atlas = GlyphAtlas(font, color)
+        for digit in GlyphAtlas.DIGITS:
+            rendered = font.render(digit, True, color)
+            self.assertEqual(atlas.size(digit), rendered.get_size())
+            expected = self.drawText(lambda image: image.blit(rendered, (2, 1)), (40, 40))
+            actual = self.drawText(lambda image: atlas.draw(image, digit, (2, 1)), (40, 40))
+            self.assertSamePixels(expected, actual)
+
+    def test_size_sumsGlyphWidths(self):
+        font = pygame.font.Font(None, 30)
+        atlas = GlyphAtlas(font, (0, 0, 0))
+        width = font.size('1')[0] + font.size('0')[0]
+        self.assertEqual(atlas.size('10'), (width, atlas.height))
+
+
+if __name__ == '__main__':
+    unittest.main()
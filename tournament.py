@@ -0,0 +1,215 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import time
+from random import Random
+from controllers import loadController
+
+
+class MatchSpec:
+    def __init__(self, left: int, right: int, seed: int):
+        self.left = left
+        self.right = right
+        self.seed = seed
+
+
+class MatchRecord:
+    def __init__(self, spec: MatchSpec, scores: [int], winner: int, gameTime: float, rallies: [int], wallTime: float):
+        self.spec = spec
+        self.scores = scores
+        self.winner = winner
+        """:type: int"""
+        self.gameTime = gameTime
+        self.rallies = rallies
+        self.wallTime = wallTime
+
+
+def loadSeeds(filePath: str) -> [int]:
+    """
+    Read a seed manifest: one integer seed per line, with blank lines and '#' comments ignored.
+    """
+    seeds = []
+    with open(filePath, 'r') as file:
+        for line in file:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                seeds.append(int(line))
+    return seeds
+
+
+# per-process state, set up once by _initWorker
+_simulation = None
+_controllers = None
+
+
+def _initWorker(controllerNames: [str], physicsRate: int):
+    global _simulation, _controllers
+    from simulation import Simulation
+    _simulation = Simulation(physicsRate)
+    _controllers = [loadController(name) for name in controllerNames]
+
+
+def _runMatch(spec: MatchSpec) -> MatchRecord:
+    start = time.perf_counter()
+    result = _simulation.runMatch(_controllers[spec.left], _controllers[spec.right], spec.seed)
+    wallTime = time.perf_counter() - start
+    return MatchRecord(spec, result.scores, result.winner, result.gameTime, result.rallies, wallTime)
+
+
+class Tournament:
+    """
+    Plays a round robin of headless matches between controller classes, spread across a process pool. Every ordered
+    pair of controllers plays one match per seed, so each pairing is played from both sides of the table.
+    """
+    def __init__(self, controllerNames: [str], seeds: [int], workers: int=None, physicsRate: int=None):
+        from pong import Game
+        self.controllerNames = controllerNames
+        self.seeds = seeds
+        self.workers = workers or os.cpu_count()
+        self.physicsRate = physicsRate or Game.PHYSICS_RATE
+
+        self.records = []
+        """:type: [MatchRecord]"""
+        self.wallTime = 0
+
+    def matches(self) -> [MatchSpec]:
+        pairs = itertools.permutations(range(len(self.controllerNames)), 2)
+        return [MatchSpec(left, right, seed) for (left, right), seed in itertools.product(pairs, self.seeds)]
+
+    def run(self, progress=None):
+        """
+        Play every match, collecting the results in self.records.
+        :param progress: Optional function called with each MatchRecord as it finishes
+        """
+        specs = self.matches()
+        start = time.perf_counter()
+        with multiprocessing.Pool(self.workers, _initWorker, (self.controllerNames, self.physicsRate)) as pool:
+            for record in pool.imap_unordered(_runMatch, specs):
+                self.records.append(record)
+                if progress:
+                    progress(record)
+            # leaving the pool's context terminates the workers, which hangs joining them once the process has opened a
+            # pygame display, so they are left to exit on their own
+            pool.close()
+            pool.join()
+        self.wallTime = time.perf_counter() - start
+
+    @property
+    def throughput(self) -> float:
+        """
+        Matches played per second of wall-clock time.
+        """
+        return len(self.records) / self.wallTime if self.wallTime else 0
+
+    def table(self) -> [dict]:
+        """
+        Summarize the results for each controller, from its point of view across all of its matches.
+        """
+        rows = []
+        for i, name in enumerate(self.controllerNames):
+            played = wins = unfinished = pointsFor = pointsAgainst = 0
+            rallies = []
+            wallTime = 0
+            for record in self.records:
+                if i not in (record.spec.left, record.spec.right):
+                    continue
+                side = 0 if record.spec.left == i else 1
+                played += 1
+                if record.winner is None:
+                    unfinished += 1
+                elif record.winner == side:
+                    wins += 1
+                pointsFor += record.scores[side]
+                pointsAgainst += record.scores[1 - side]
+                rallies.extend(record.rallies)
+                wallTime += record.wallTime
+
+            rows.append({
+                'controller': name,
+                'played': played,
+                'wins': wins,
+                'losses': played - wins - unfinished,
+                'unfinished': unfinished,
+                'pointsFor': pointsFor,
+                'pointsAgainst': pointsAgainst,
+                'meanRally': sum(rallies) / len(rallies) if rallies else 0,
+                'maxRally': max(rallies, default=0),
+                'meanWallTime': wallTime / played if played else 0,
+            })
+        return rows
+
+    def writeCsv(self, filePath: str):
+        """
+        Write one row per match.
+        """
+        import csv
+        with open(filePath, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['left', 'right', 'seed', 'leftScore', 'rightScore', 'winner', 'gameTime', 'points',
+                             'meanRally', 'maxRally', 'wallTime'])
+            for r in sorted(self.records, key=lambda r: (r.spec.left, r.spec.right, r.spec.seed)):
+                winner = '' if r.winner is None else self.controllerNames[[r.spec.left, r.spec.right][r.winner]]
+                writer.writerow([self.controllerNames[r.spec.left], self.controllerNames[r.spec.right], r.spec.seed,
+                                 r.scores[0], r.scores[1], winner, '{:.3f}'.format(r.gameTime), len(r.rallies),
+                                 '{:.2f}'.format(sum(r.rallies) / len(r.rallies)) if r.rallies else 0,
+                                 max(r.rallies, default=0), '{:.4f}'.format(r.wallTime)])
+
+
+def printTable(rows: [dict]):
+    columns = [('controller', '{}'), ('played', '{}'), ('wins', '{}'), ('losses', '{}'), ('unfinished', '{}'),
+               ('pointsFor', '{}'), ('pointsAgainst', '{}'), ('meanRally', '{:.1f}'), ('maxRally', '{}'),
+               ('meanWallTime', '{:.3f}')]
+    cells = [[name for name, fmt in columns]]
+    cells += [[fmt.format(row[name]) for name, fmt in columns] for row in rows]
+    widths = [max(len(r[c]) for r in cells) for c in range(len(columns))]
+    for r in cells:
+        print('  '.join(cell.ljust(width) for cell, width in zip(r, widths)).rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play a round robin tournament of headless bot matches.')
+    parser.add_argument('controllers', nargs='+',
+                        help="controller classes as 'module:Class' (or 'Class' from controllers.py)")
+    parser.add_argument('--seeds', help='seed manifest file, one seed per line')
+    parser.add_argument('--matches', type=int, default=10,
+                        help='number of generated seeds when no manifest is given (default: %(default)s)')
+    parser.add_argument('--workers', type=int, help='number of worker processes (default: all cores)')
+    parser.add_argument('--physics-rate', type=int, help='physics steps per second')
+    parser.add_argument('--output', help='CSV file to write per-match results to')
+    args = parser.parse_args()
+
+    if len(args.controllers) < 2:
+        parser.error('at least two controllers are required')
+
+    if args.seeds:
+        seeds = loadSeeds(args.seeds)
+    else:
+        rand = Random(0)
+        seeds = [rand.getrandbits(32) for i in range(args.matches)]
+
+    # validate names before starting the pool
+    for name in args.controllers:
+        loadController(name)
+
+    tournament = Tournament(args.controllers, seeds, args.workers, args.physics_rate)
+    total = len(tournament.matches())
+    print('Playing {} matches on {} workers'.format(total, tournament.workers))
+
+    def progress(record: MatchRecord):
+        count = len(tournament.records)
+        if count % max(total // 20, 1) == 0 or count == total:
+            print('  {}/{}'.format(count, total))
+
+    tournament.run(progress)
+
+    printTable(tournament.table())
+    print('{} matches in {:.2f}s ({:.2f} matches/s)'.format(len(tournament.records), tournament.wallTime,
+                                                            tournament.throughput))
+
+    if args.output:
+        tournament.writeCsv(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+import unittest
+from unittest import TestCase
+import os
+import subprocess
+import sys
+import tempfile
+from tournament import *
+
+
+class IdleController:
+    """
+    Leaves its paddle in the middle, so that its matches are short.
+    """
+    def __init__(self, paddle, ball):
+        pass
+
+    def update(self, delta: float):
+        pass
+
+
+class loadSeeds_tests(TestCase):
+    def test_loadSeeds_commentsAndBlankLinesIgnored(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filePath = os.path.join(folder, 'seeds.txt')
+            with open(filePath, 'w') as file:
+                file.write('# seeds from the last release\n12\n\n  345  \n6 # a close match\n#7\n')
+
+            self.assertEqual(loadSeeds(filePath), [12, 345, 6])
+
+    def test_loadSeeds_notInteger_raises(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filePath = os.path.join(folder, 'seeds.txt')
+            with open(filePath, 'w') as file:
+                file.write('12\nabc\n')
+
+            with self.assertRaises(ValueError):
+                loadSeeds(filePath)
+
+
+class Tournament_tests(TestCase):
+    def createRecord(self, left: int, right: int, scores: [int], winner: int=None, rallies: [int]=()) -> MatchRecord:
+        return MatchRecord(MatchSpec(left, right, 1), scores, winner, 60, list(rallies), 0.5)
+
+    def test_matches_everyOrderedPairPerSeed(self):
+        tournament = Tournament(['a', 'b', 'c'], [1, 2])
+
+        pairs = [(spec.left, spec.right, spec.seed) for spec in tournament.matches()]
+
+        self.assertEqual(len(pairs), 12)
+        self.assertEqual(set(pairs), {(left, right, seed) for left in range(3) for right in range(3) for seed in [1, 2]
+                                      if left != right})
+
+    def test_table_fromEachSide(self):
+        tournament = Tournament(['a', 'b', 'c'], [1])
+        tournament.records = [
+            self.createRecord(0, 1, [9, 3], 0, [2, 5, 1]),
+            self.createRecord(1, 0, [9, 7], 0, [4]),
+            self.createRecord(2, 0, [4, 2], None),
+        ]
+
+        a, b, c = tournament.table()
+
+        self.assertEqual((a['played'], a['wins'], a['losses'], a['unfinished']), (3, 1, 1, 1))
+        self.assertEqual((a['pointsFor'], a['pointsAgainst']), (9 + 7 + 2, 3 + 9 + 4))
+        self.assertEqual((b['played'], b['wins'], b['losses'], b['unfinished']), (2, 1, 1, 0))
+        self.assertEqual((b['pointsFor'], b['pointsAgainst']), (3 + 9, 9 + 7))
+        self.assertEqual((c['played'], c['wins'], c['losses'], c['unfinished']), (1, 0, 0, 1))
+        self.assertEqual(a['meanRally'], 3)
+        self.assertEqual(a['maxRally'], 5)
+        self.assertEqual(c['meanRally'], 0)
+        self.assertEqual(a['meanWallTime'], 0.5)
+
+    def test_table_notPlayed(self):
+        tournament = Tournament(['a', 'b'], [1])
+
+        row = tournament.table()[0]
+
+        self.assertEqual((row['played'], row['meanRally'], row['maxRally'], row['meanWallTime']), (0, 0, 0, 0))
+
+    def test_run_workerResultsCollected(self):
+        names = [__name__ + ':IdleController', 'BotController']
+        tournament = Tournament(names, [7, 8], workers=2)
+        finished = []
+
+        tournament.run(finished.append)
+
+        self.assertEqual(finished, tournament.records)
+        self.assertEqual(sorted((r.spec.left, r.spec.right, r.spec.seed) for r in tournament.records),
+                         [(0, 1, 7), (0, 1, 8), (1, 0, 7), (1, 0, 8)])
+        for record in tournament.records:
+            # the bot wins every match, from either side
+            self.assertEqual(record.winner, 1 if record.spec.left == 0 else 0)
+            self.assertEqual(len(record.rallies), sum(record.scores))
+            self.assertGreater(record.wallTime, 0)
+
+        idle, bot = tournament.table()
+        self.assertEqual((idle['played'], idle['losses'], bot['wins']), (4, 4, 4))
+        self.assertEqual(bot['pointsFor'], idle['pointsAgainst'])
+        self.assertGreater(tournament.throughput, 0)
+
+    def test_run_afterDisplayOpened_finishes(self):
+        # in a process of its own, which has opened a display before forking the workers; shutting the workers down
+        # did not always hang, so the tournament is run a few times
+        script = '\n'.join([
+            'import pygame',
+            'from tournament import Tournament',
+            'pygame.display.init()',
+            'pygame.display.set_mode((64, 48))',
+            'for i in range(8):',
+            "    tournament = Tournament(['{}:IdleController', 'BotController'], [7], workers=2)".format(__name__),
+            '    tournament.run()',
+            '    assert len(tournament.records) == 2',
+        ])
+        folder = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, SDL_VIDEODRIVER='dummy')
+
+        process = subprocess.run([sys.executable, '-c', script], cwd=folder, env=env, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, timeout=60)
+
+        self.assertEqual(process.returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()